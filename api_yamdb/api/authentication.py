@@ -0,0 +1,123 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from users.models import CustomUser
+
+from .cache import get_cache
+
+# Поля пользователя, которых достаточно классам из api.permissions.
+USER_CLAIMS = ('username', 'role', 'is_staff', 'is_superuser')
+ISSUED_CLAIM = 'iat'
+REVOKED_KEY = 'api:auth:revoked:{}'
+
+
+def get_access_token(user):
+    token = RefreshToken.for_user(user).access_token
+    for claim in USER_CLAIMS:
+        token[claim] = getattr(user, claim)
+    token[ISSUED_CLAIM] = int(time.time())
+    return token
+
+
+class UserCache:
+    """Ограниченный кэш пользователей в памяти процесса с коротким TTL."""
+
+    def __init__(self, size, ttl):
+        self.size = size
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.users = OrderedDict()
+
+    def get(self, user_id):
+        with self.lock:
+            entry = self.users.get(user_id)
+            if entry is None or entry[0] < time.monotonic():
+                self.users.pop(user_id, None)
+                return None
+            self.users.move_to_end(user_id)
+            return entry[1]
+
+    def set(self, user_id, user):
+        with self.lock:
+            self.users[user_id] = (time.monotonic() + self.ttl, user)
+            self.users.move_to_end(user_id)
+            while len(self.users) > self.size:
+                self.users.popitem(last=False)
+
+    def delete(self, user_id):
+        with self.lock:
+            self.users.pop(user_id, None)
+
+    def clear(self):
+        with self.lock:
+            self.users.clear()
+
+
+user_cache = UserCache(settings.API_AUTH_CACHE_SIZE,
+                       settings.API_AUTH_CACHE_TTL)
+
+
+def forget_user(user_id):
+    """Сбрасывает пользователя в кэше процесса и роли в выданных токенах.
+
+    Отметка об отзыве хранится в общем кэше API столько, сколько живёт
+    access-токен: токены, выданные до неё, снова проверяются по базе.
+    """
+    user_cache.delete(user_id)
+    get_cache().set(
+        REVOKED_KEY.format(user_id),
+        int(time.time()),
+        timeout=int(api_settings.ACCESS_TOKEN_LIFETIME.total_seconds())
+    )
+
+
+def is_detached(user):
+    """Пользователь восстановлен из токена или кэша, а не прочитан из базы."""
+    return getattr(user, 'detached', False)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWTAuthentication, который держит пользователей в кэше процесса."""
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        user = user_cache.get(user_id)
+        if user is None:
+            user = super().get_user(validated_token)
+            user_cache.set(user_id, user)
+        # Копия, чтобы запрос не менял общий объект из кэша.
+        user = copy.copy(user)
+        user.detached = True
+        return user
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """Собирает пользователя из утверждений токена без запроса к базе.
+
+    Токены без утверждений о роли и токены, выпущенные до forget_user,
+    проверяются по базе, как в JWTAuthentication.
+    """
+
+    def get_user(self, validated_token):
+        if any(
+            claim not in validated_token
+            for claim in USER_CLAIMS + (ISSUED_CLAIM,)
+        ):
+            return super().get_user(validated_token)
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        revoked = get_cache().get(REVOKED_KEY.format(user_id))
+        if revoked is not None and validated_token[ISSUED_CLAIM] <= revoked:
+            return super().get_user(validated_token)
+        user = CustomUser(
+            **{api_settings.USER_ID_FIELD: user_id},
+            **{claim: validated_token[claim] for claim in USER_CLAIMS}
+        )
+        user.detached = True
+        return user
@@ -0,0 +1,338 @@
+import json
+import math
+import re
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+from itertools import count
+from urllib.error import URLError
+from urllib.request import Request, urlopen
+
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIHandler
+from django.db import connections
+from django.test import Client, RequestFactory, override_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from reviews.models import Comment, Review, Title
+from users.models import CustomUser
+
+from .metrics import QueryTimer
+from .urls import router_v1
+
+# GET-запросы ко всем эндпоинтам router_v1 с подстановкой образцов из базы.
+ENDPOINTS = (
+    'categories/',
+    'genres/',
+    'titles/',
+    'titles/?fields=id,name',
+    'titles/?year={year}',
+    'titles/?category={category}',
+    'titles/?genre={genre}',
+    'titles/?name={name}',
+    'titles/?search={name}',
+    'titles/top/',
+    'titles/top/?category={category}',
+    'titles/top/?genre={genre}',
+    'titles/trending/',
+    'titles/{title_id}/',
+    'titles/{title_id}/stats/',
+    'titles/{title_id}/reviews/',
+    'titles/{title_id}/reviews/?ordering=-pub_date',
+    'titles/{title_id}/reviews/?pagination=cursor',
+    'titles/{title_id}/reviews/?expand=author',
+    'titles/{title_id}/reviews/{review_id}/',
+    'titles/{title_id}/reviews/{review_id}/comments/',
+    'titles/{title_id}/reviews/{review_id}/comments/?ordering=pub_date',
+    'titles/{title_id}/reviews/{review_id}/comments/{comment_id}/',
+    'users/',
+    'users/{username}/',
+)
+
+URL_KWARG = re.compile(r'\(\?P<(\w+)>[^)]*\)')
+
+
+def get_uncovered():
+    """Префиксы router_v1, для которых нет шаблона в ENDPOINTS."""
+    paths = {template.split('?')[0] for template in ENDPOINTS}
+    return [
+        prefix for prefix, _, _ in router_v1.registry
+        if not any(
+            path.startswith(URL_KWARG.sub(r'{\1}', prefix) + '/')
+            for path in paths
+        )
+    ]
+
+
+def get_samples():
+    """Значения для подстановки в ENDPOINTS.
+
+    Берётся произведение с наибольшим числом отзывов, чтобы замеры
+    шли на самых тяжёлых страницах.
+    """
+    samples = {}
+    title = Title.objects.select_related('category').order_by(
+        '-reviews_count', 'pk'
+    ).first()
+    if title is not None:
+        samples.update(
+            title_id=title.pk, year=title.year, name=title.name[:8]
+        )
+        if title.category is not None:
+            samples['category'] = title.category.slug
+        genre = title.genre.first()
+        if genre is not None:
+            samples['genre'] = genre.slug
+    review = Review.objects.filter(
+        title=title, comments__isnull=False
+    ).first() or Review.objects.filter(title=title).first()
+    if review is not None:
+        samples['review_id'] = review.pk
+    comment = Comment.objects.filter(review=review).first()
+    if comment is not None:
+        samples['comment_id'] = comment.pk
+    user = CustomUser.objects.order_by('pk').first()
+    if user is not None:
+        samples['username'] = user.username
+    return samples
+
+
+class WsgiClient:
+    """Вызывает WSGI-приложение напрямую, как это делает gunicorn.
+
+    В отличие от тестового клиента Django, по сигналам начала и конца
+    запроса соединения с базой закрываются согласно CONN_MAX_AGE.
+    """
+
+    def __init__(self, **defaults):
+        self.handler = WSGIHandler()
+        self.factory = RequestFactory(**defaults)
+
+    def get(self, path):
+        return self.call(self.factory.get(path))
+
+    def post(self, path, data, **extra):
+        return self.call(self.factory.post(
+            path, json.dumps(data), content_type='application/json', **extra
+        ))
+
+    def call(self, request):
+        statuses = []
+
+        def start_response(status, headers, exc_info=None):
+            statuses.append(status)
+
+        response = self.handler(request.environ, start_response)
+        try:
+            content = b''.join(response)
+        finally:
+            response.close()
+        response.status_code = int(statuses[0].split()[0])
+        response.content = content
+        return response
+
+
+@contextmanager
+def private_cache():
+    """Временный кэш ответов API вместо общего с рабочими серверами.
+
+    Замер на тестовой базе иначе сбросил бы версии пространств имён
+    и отметку о пересчёте trending в кэше рабочих серверов.
+    """
+    location = tempfile.mkdtemp(prefix='yamdb_benchmark_cache_')
+    alias = settings.API_CACHE_ALIAS
+    try:
+        with override_settings(CACHES={
+            **settings.CACHES,
+            alias: {
+                **settings.CACHES[alias],
+                'BACKEND': (
+                    'django.core.cache.backends.filebased.FileBasedCache'
+                ),
+                'LOCATION': location,
+            },
+        }):
+            yield
+    finally:
+        shutil.rmtree(location, ignore_errors=True)
+
+
+def get_client(user=None, client_class=Client):
+    hosts = settings.ALLOWED_HOSTS
+    host = hosts[0] if hosts and 'localhost' not in hosts else 'localhost'
+    headers = {'HTTP_HOST': host}
+    if user is not None:
+        token = RefreshToken.for_user(user).access_token
+        headers['HTTP_AUTHORIZATION'] = f'Bearer {token}'
+    return client_class(**headers)
+
+
+def add_nonce(url):
+    """Уникальный параметр исключает попадание в кэш ответов."""
+    separator = '&' if '?' in url else '?'
+    return f'{url}{separator}_nonce={uuid.uuid4().hex}'
+
+
+def percentile(values, fraction):
+    """Перцентиль методом ближайшего ранга."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(math.ceil(fraction * len(ordered)) - 1, 0)]
+
+
+def measure(client, url, requests, warmup=0, cached=False):
+    for _ in range(warmup):
+        client.get(url if cached else add_nonce(url))
+    latencies = []
+    queries = 0
+    status_code = None
+    started = time.perf_counter()
+    for _ in range(requests):
+        timer = QueryTimer()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(timer))
+            request_started = time.perf_counter()
+            response = client.get(url if cached else add_nonce(url))
+            latencies.append((time.perf_counter() - request_started) * 1000)
+        queries += timer.count
+        status_code = response.status_code
+    elapsed = time.perf_counter() - started
+    return {
+        'status': status_code,
+        'requests': requests,
+        'mean_ms': round(sum(latencies) / requests, 3),
+        'p50_ms': round(percentile(latencies, 0.5), 3),
+        'p95_ms': round(percentile(latencies, 0.95), 3),
+        'p99_ms': round(percentile(latencies, 0.99), 3),
+        'queries': round(queries / requests, 2),
+        'rps': round(requests / elapsed, 1),
+    }
+
+
+def run_load(base_url, paths, concurrency, requests, host='localhost'):
+    """Отправляет requests GET-запросов в concurrency потоков."""
+    latencies = []
+    errors = []
+    numbers = count()
+
+    def worker():
+        while True:
+            number = next(numbers)
+            if number >= requests:
+                return
+            url = base_url + add_nonce(paths[number % len(paths)])
+            started = time.perf_counter()
+            try:
+                with urlopen(Request(url, headers={'Host': host})) as response:
+                    response.read()
+            except (URLError, OSError):
+                errors.append(number)
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    return {
+        'concurrency': concurrency,
+        'requests': requests,
+        'errors': len(errors),
+        'rps': round(requests / elapsed, 1),
+        'p50_ms': round(percentile(latencies, 0.5), 3),
+        'p95_ms': round(percentile(latencies, 0.95), 3),
+        'p99_ms': round(percentile(latencies, 0.99), 3),
+    }
+
+
+def run_review_writes(pairs, concurrency, duplicates=2):
+    """Создаёт отзывы POST-запросами в concurrency потоках.
+
+    Каждая пара (автор, произведение) отправляется duplicates раз подряд,
+    так что одновременные запросы спорят за одну строку: ровно один из
+    них должен вернуть 201, остальные — 400.
+    """
+    tokens = {
+        user.pk: str(RefreshToken.for_user(user).access_token)
+        for user, _ in pairs
+    }
+    jobs = [pair for pair in pairs for _ in range(duplicates)]
+    statuses = []
+    latencies = []
+    numbers = count()
+
+    def worker():
+        client = get_client(client_class=WsgiClient)
+        try:
+            while True:
+                number = next(numbers)
+                if number >= len(jobs):
+                    return
+                user, title_id = jobs[number]
+                started = time.perf_counter()
+                response = client.post(
+                    f'/api/v1/titles/{title_id}/reviews/',
+                    {'text': f'Отзыв {number}', 'score': number % 10 + 1},
+                    HTTP_AUTHORIZATION=f'Bearer {tokens[user.pk]}'
+                )
+                latencies.append((time.perf_counter() - started) * 1000)
+                statuses.append(response.status_code)
+        finally:
+            connections.close_all()
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    counts = Counter(statuses)
+    return {
+        'concurrency': concurrency,
+        'requests': len(jobs),
+        'created': counts[201],
+        'rejected': counts[400],
+        'errors': len(jobs) - counts[201] - counts[400],
+        'rps': round(len(jobs) / elapsed, 1),
+        'p50_ms': round(percentile(latencies, 0.5), 3),
+        'p95_ms': round(percentile(latencies, 0.95), 3),
+        'p99_ms': round(percentile(latencies, 0.99), 3),
+    }
+
+
+def compare(report, baseline, tolerance, noise_ms=1.0):
+    """Регрессии отчёта относительно базового.
+
+    Задержка считается выросшей, если p95 превысил базовый больше
+    чем на долю tolerance и на noise_ms; число запросов к базе
+    расти не должно вовсе.
+    """
+    regressions = []
+    for endpoint, result in report['endpoints'].items():
+        base = baseline.get('endpoints', {}).get(endpoint)
+        if base is None:
+            continue
+        if result['status'] != base['status']:
+            regressions.append(
+                f'{endpoint}: статус {base["status"]} → {result["status"]}'
+            )
+        if result['queries'] > base['queries']:
+            regressions.append(
+                f'{endpoint}: запросов к базе '
+                f'{base["queries"]} → {result["queries"]}'
+            )
+        limit = base['p95_ms'] * (1 + tolerance)
+        if result['p95_ms'] > max(limit, base['p95_ms'] + noise_ms):
+            regressions.append(
+                f'{endpoint}: p95 {base["p95_ms"]} → {result["p95_ms"]} мс'
+            )
+    return regressions
@@ -0,0 +1,204 @@
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Max
+from django.utils.encoding import smart_str
+from rest_framework import serializers, status
+from rest_framework.decorators import action
+from rest_framework.exceptions import MethodNotAllowed, ValidationError
+from rest_framework.relations import ManyRelatedField
+from rest_framework.response import Response
+
+from .cache import invalidate
+from .permissions import IsAdmin
+
+
+def bulk_insert(model, objects):
+    """bulk_create, проставляющий id и на базах без INSERT ... RETURNING.
+
+    Вызывается внутри transaction.atomic().
+    """
+    model.objects.bulk_create(objects)
+    if objects and objects[0].pk is None:
+        # SQLite не возвращает id множественной вставки. До конца
+        # транзакции запись в базу заблокирована, поэтому id идут подряд.
+        last = model.objects.aggregate(last=Max('pk'))['last']
+        for pk, obj in enumerate(objects, last - len(objects) + 1):
+            obj.pk = pk
+    return objects
+
+
+class PrefetchedSlugRelatedField(serializers.SlugRelatedField):
+    """Берёт объекты из словаря, загруженного на всю пачку сразу."""
+
+    def to_internal_value(self, data):
+        objects = self.context.get('slugs', {}).get(self.queryset.model)
+        if objects is None:
+            return super().to_internal_value(data)
+        if not isinstance(data, str):
+            self.fail('invalid')
+        try:
+            return objects[data]
+        except KeyError:
+            self.fail('does_not_exist', slug_name=self.slug_field,
+                      value=smart_str(data))
+
+
+class BulkListSerializer(serializers.ListSerializer):
+    """Пакетная запись списка объектов.
+
+    Перед проверкой элементов слаги связанных объектов и изменяемые
+    объекты загружаются одним запросом на пачку; запись идёт через
+    bulk_create/bulk_update. Ошибки возвращаются списком по позициям.
+    """
+
+    def to_internal_value(self, data):
+        if isinstance(data, list):
+            self.prefetch([item for item in data if isinstance(item, dict)])
+        return super().to_internal_value(data)
+
+    @property
+    def model(self):
+        return self.child.Meta.model
+
+    def get_relations(self, many):
+        for name, field in self.child.fields.items():
+            relation = getattr(field, 'child_relation', field)
+            if (
+                not field.read_only
+                and isinstance(relation, PrefetchedSlugRelatedField)
+                and isinstance(field, ManyRelatedField) == many
+            ):
+                yield name, relation
+
+    def prefetch(self, items):
+        slugs = self._context.setdefault('slugs', {})
+        for many in (False, True):
+            for name, relation in self.get_relations(many):
+                values = set()
+                for item in items:
+                    value = item.get(name)
+                    if not many:
+                        value = [value]
+                    elif not isinstance(value, list):
+                        continue
+                    values.update(
+                        slug for slug in value if isinstance(slug, str)
+                    )
+                slugs[relation.queryset.model] = relation.queryset.in_bulk(
+                    values, field_name=relation.slug_field
+                )
+        queryset = self.instance
+        if queryset is None:
+            queryset = self.model.objects.all()
+        self.child.prefetch(items, queryset)
+
+    def split(self, item):
+        m2m = dict(self.get_relations(many=True))
+        return (
+            {name: value for name, value in item.items() if name not in m2m},
+            {name: value for name, value in item.items() if name in m2m},
+        )
+
+    def create(self, validated_data):
+        if not validated_data:
+            return []
+        fields, links = zip(*map(self.split, validated_data))
+        objects = bulk_insert(
+            self.model, [self.model(**item) for item in fields]
+        )
+        self.set_links(objects, links)
+        return self.reload(objects)
+
+    def update(self, queryset, validated_data):
+        instances = self._context['instances']
+        objects, links, changed = [], [], set()
+        for item in validated_data:
+            item = dict(item)
+            obj = instances[item.pop('id')]
+            fields, item_links = self.split(item)
+            for name, value in fields.items():
+                setattr(obj, name, value)
+            changed.update(fields)
+            objects.append(obj)
+            links.append(item_links)
+        if changed:
+            self.model.objects.bulk_update(objects, changed)
+        self.set_links(objects, links, replace=True)
+        return self.reload(objects)
+
+    def set_links(self, objects, links, replace=False):
+        for name, _ in self.get_relations(many=True):
+            field = self.model._meta.get_field(name)
+            through = field.remote_field.through
+            source = field.m2m_field_name()
+            target = field.m2m_reverse_field_name()
+            changed = [
+                (obj, item[name]) for obj, item in zip(objects, links)
+                if name in item
+            ]
+            if replace:
+                through.objects.filter(**{
+                    f'{source}__in': [obj.pk for obj, _ in changed]
+                }).delete()
+            through.objects.bulk_create(
+                through(**{f'{source}_id': obj.pk, f'{target}_id': other.pk})
+                for obj, others in changed
+                for other in dict.fromkeys(others)
+            )
+
+    def reload(self, objects):
+        loaded = self.model.objects.select_related(
+            *(relation.source for _, relation in self.get_relations(False))
+        ).prefetch_related(
+            *(name for name, _ in self.get_relations(True))
+        ).in_bulk([obj.pk for obj in objects])
+        return [loaded[obj.pk] for obj in objects]
+
+
+class BulkWriteMixin:
+    """Действие bulk/: POST создаёт, PATCH изменяет список объектов."""
+
+    bulk_create_serializer_class = None
+    bulk_update_serializer_class = None
+    bulk_invalidated = ()
+
+    @action(methods=('POST', 'PATCH'), detail=False,
+            permission_classes=(IsAdmin,))
+    def bulk(self, request):
+        updating = request.method == 'PATCH'
+        serializer_class = (
+            self.bulk_update_serializer_class if updating
+            else self.bulk_create_serializer_class
+        )
+        if serializer_class is None:
+            raise MethodNotAllowed(request.method)
+        if not isinstance(request.data, list):
+            raise ValidationError(['Ожидается список объектов.'])
+        if len(request.data) > settings.API_BULK_LIMIT:
+            raise ValidationError([
+                f'Не больше {settings.API_BULK_LIMIT} объектов за запрос.'
+            ])
+        serializer = serializer_class(
+            self.get_queryset() if updating else None,
+            data=request.data,
+            many=True,
+            partial=updating,
+            context=self.get_serializer_context()
+        )
+        serializer.is_valid(raise_exception=True)
+        try:
+            with transaction.atomic():
+                self.perform_bulk_write(serializer.save())
+        except IntegrityError:
+            # Параллельный запрос успел записать конфликтующие данные.
+            raise ValidationError([
+                'Данные изменились во время записи, повторите запрос.'
+            ])
+        invalidate(*self.bulk_invalidated)
+        return Response(
+            serializer.data,
+            status=status.HTTP_200_OK if updating else status.HTTP_201_CREATED
+        )
+
+    def perform_bulk_write(self, objects):
+        pass
@@ -0,0 +1,158 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.http import parse_etags, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+VERSION_KEY = 'api:version:{}'
+STATS_KEY = 'api:stats:{}:{}'
+RESPONSE_KEY = 'api:response:{}:{}:{}'
+
+
+def get_cache():
+    return caches[settings.API_CACHE_ALIAS]
+
+
+def get_version(namespace):
+    # Начальное значение берётся из времени, чтобы после вытеснения
+    # ключа версии старые ответы не стали снова актуальными.
+    return get_cache().get_or_set(
+        VERSION_KEY.format(namespace),
+        time.time_ns,
+        timeout=None
+    )
+
+
+def invalidate(*namespaces):
+    # Новая версия записывается целиком, а не через incr: в файловом
+    # кэше incr не атомарен, и два сброса подряд могли бы дать одну версию.
+    get_cache().set_many(
+        {VERSION_KEY.format(namespace): time.time_ns()
+         for namespace in namespaces},
+        timeout=None
+    )
+
+
+def record(namespace, outcome):
+    cache = get_cache()
+    key = STATS_KEY.format(namespace, outcome)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, timeout=None)
+
+
+def get_stats():
+    cache = get_cache()
+    return {
+        namespace: {
+            outcome: cache.get(STATS_KEY.format(namespace, outcome), 0)
+            for outcome in ('hits', 'misses')
+        }
+        for namespace in settings.API_CACHE_NAMESPACES
+    }
+
+
+def clear_stats():
+    get_cache().delete_many([
+        STATS_KEY.format(namespace, outcome)
+        for namespace in settings.API_CACHE_NAMESPACES
+        for outcome in ('hits', 'misses')
+    ])
+
+
+def get_request_digest(request, *extra):
+    query = sorted(
+        (name, value)
+        for name, values in request.query_params.lists()
+        for value in values
+    )
+    return hashlib.md5(
+        f'{request.get_host()}{request.path}{query}{extra}'.encode()
+    ).hexdigest()
+
+
+def get_response_key(namespace, request):
+    return RESPONSE_KEY.format(
+        namespace, get_version(namespace), get_request_digest(request)
+    )
+
+
+class CachedListMixin:
+    """Кэширует ответы list() до записи в модели пространства имён."""
+
+    cache_namespace = None
+
+    def list(self, request, *args, **kwargs):
+        cache = get_cache()
+        key = get_response_key(self.cache_namespace, request)
+        data = cache.get(key)
+        if data is not None:
+            record(self.cache_namespace, 'hits')
+            return Response(data, headers={'X-Cache': 'HIT'})
+        record(self.cache_namespace, 'misses')
+        response = super().list(request, *args, **kwargs)
+        if response.status_code == 200:
+            cache.set(key, response.data)
+        response['X-Cache'] = 'MISS'
+        return response
+
+
+class ConditionalGetMixin:
+    """Отдаёт ETag и отвечает 304 на совпавший If-None-Match.
+
+    ETag строится из версии пространства имён, которая меняется при
+    каждой записи, поэтому проверка не требует ни запросов к базе,
+    ни сериализации.
+    """
+
+    etag_vary_on_user = False
+    # Пространства имён связанных данных, которые тоже попадают в ответ
+    # (например, авторы отзывов); подставляются аргументы из URL.
+    etag_related_namespaces = ()
+
+    def get_etag_namespace(self):
+        return self.cache_namespace
+
+    def get_etag(self, request):
+        versions = '-'.join(
+            str(get_version(namespace))
+            for namespace in (
+                self.get_etag_namespace(),
+                *(
+                    namespace.format(**self.kwargs)
+                    for namespace in self.etag_related_namespaces
+                )
+            )
+        )
+        extra = (request.user.pk,) if self.etag_vary_on_user else ()
+        return quote_etag(f'{versions}-{get_request_digest(request, *extra)}')
+
+    def conditional_response(self, request, handler, *args, **kwargs):
+        etag = self.get_etag(request)
+        if_none_match = parse_etags(request.META.get('HTTP_IF_NONE_MATCH', ''))
+        if etag in if_none_match:
+            return Response(status=status.HTTP_304_NOT_MODIFIED,
+                            headers={'ETag': etag})
+        response = handler(request, *args, **kwargs)
+        if response.status_code != status.HTTP_200_OK:
+            return response
+        if '*' in if_none_match:
+            # «*» совпадает с любым ответом, но только если объект есть.
+            return Response(status=status.HTTP_304_NOT_MODIFIED,
+                            headers={'ETag': etag})
+        response['ETag'] = etag
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(
+            request, super().list, *args, **kwargs
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(
+            request, super().retrieve, *args, **kwargs
+        )
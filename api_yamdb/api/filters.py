@@ -1,16 +1,21 @@
 import django_filters
 
+from reviews import search as title_search
 from reviews.models import Title
 
 
 class TitleGenreFilter(django_filters.FilterSet):
-    name = django_filters.CharFilter(
-        field_name='name',
-        lookup_expr='icontains'
-    )
+    name = django_filters.CharFilter(method='filter_name')
+    search = django_filters.CharFilter(method='filter_search')
     genre = django_filters.CharFilter(field_name='genre__slug')
     category = django_filters.CharFilter(field_name='category__slug')
 
     class Meta:
         model = Title
-        fields = ('name', 'year', 'category', 'genre')
+        fields = ('name', 'year', 'category', 'genre', 'search')
+
+    def filter_name(self, queryset, name, value):
+        return title_search.filter_name(queryset, value)
+
+    def filter_search(self, queryset, name, value):
+        return title_search.search(queryset, value)
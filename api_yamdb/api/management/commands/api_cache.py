@@ -0,0 +1,29 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from api import cache
+
+
+class Command(BaseCommand):
+    help = 'Показывает статистику кэша ответов API.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--clear',
+            action='store_true',
+            help='Сбросить кэш ответов и счётчики попаданий.'
+        )
+
+    def handle(self, *args, **options):
+        if options['clear']:
+            cache.invalidate(*settings.API_CACHE_NAMESPACES)
+            cache.clear_stats()
+            self.stdout.write(self.style.SUCCESS('Кэш ответов сброшен.'))
+            return
+        for namespace, stats in cache.get_stats().items():
+            total = stats['hits'] + stats['misses']
+            ratio = stats['hits'] / total if total else 0
+            self.stdout.write(
+                f'{namespace}: попаданий {stats["hits"]}, '
+                f'промахов {stats["misses"]}, доля попаданий {ratio:.1%}'
+            )
@@ -0,0 +1,198 @@
+import json
+import platform
+import sys
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+
+from api import benchmarks
+from api.cache import invalidate
+from reviews.generator import CatalogGenerator
+from users.models import CustomUser
+
+
+class Command(BaseCommand):
+    help = ('Замеряет задержку, число запросов к базе и пропускную '
+            'способность всех эндпоинтов API и пишет отчёт в JSON.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=500)
+        parser.add_argument('--titles', type=int, default=2000)
+        parser.add_argument('--reviews', type=int, default=50000)
+        parser.add_argument('--comments', type=int, default=50000)
+        parser.add_argument('--seed', type=int, default=1)
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=50,
+            help='Количество замеряемых запросов к каждому эндпоинту.'
+        )
+        parser.add_argument(
+            '--warmup',
+            type=int,
+            default=5,
+            help='Количество незамеряемых запросов перед замером.'
+        )
+        parser.add_argument(
+            '--cached',
+            action='store_true',
+            help='Не обходить кэш ответов.'
+        )
+        parser.add_argument(
+            '--existing',
+            action='store_true',
+            help='Замерять на текущей базе без генерации данных. '
+                 'По умолчанию создаётся временная тестовая база.'
+        )
+        parser.add_argument(
+            '--username',
+            help='Пользователь, от имени которого выполняются запросы '
+                 '(нужен администратор для /users/). По умолчанию во '
+                 'временной базе создаётся администратор, с --existing '
+                 'запросы анонимные.'
+        )
+        parser.add_argument(
+            '--keepdb',
+            action='store_true',
+            help='Не удалять тестовую базу и переиспользовать '
+                 'сгенерированные данные при следующем запуске.'
+        )
+        parser.add_argument(
+            '--output',
+            help='Файл для отчёта в JSON.'
+        )
+        parser.add_argument(
+            '--baseline',
+            help='Отчёт для сравнения; при регрессиях команда '
+                 'завершается с ошибкой.'
+        )
+        parser.add_argument(
+            '--tolerance',
+            type=float,
+            default=0.2,
+            help='Допустимый рост p95 относительно базового отчёта.'
+        )
+
+    def handle(self, *args, **options):
+        baseline = None
+        if options['baseline']:
+            with open(options['baseline'], encoding='utf-8') as file:
+                baseline = json.load(file)
+        if options['existing']:
+            report = self.run(options, self.get_user(options['username']))
+        else:
+            old_name = connection.creation.create_test_db(
+                verbosity=0, autoclobber=True, keepdb=options['keepdb']
+            )
+            try:
+                with benchmarks.private_cache():
+                    if not CustomUser.objects.exists():
+                        self.generate(options)
+                    user = (
+                        self.get_user(options['username'])
+                        if options['username'] else self.get_admin()
+                    )
+                    report = self.run(options, user)
+            finally:
+                connection.creation.destroy_test_db(
+                    old_name, verbosity=0, keepdb=options['keepdb']
+                )
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as file:
+                json.dump(report, file, ensure_ascii=False, indent=2)
+            self.stdout.write(
+                self.style.SUCCESS(f'Отчёт записан в {options["output"]}.')
+            )
+        if baseline is not None:
+            regressions = benchmarks.compare(
+                report, baseline, options['tolerance']
+            )
+            for regression in regressions:
+                self.stdout.write(self.style.ERROR(regression))
+            if regressions:
+                raise CommandError(
+                    f'Найдено регрессий: {len(regressions)}.'
+                )
+            self.stdout.write(self.style.SUCCESS('Регрессий нет.'))
+
+    def generate(self, options):
+        self.stdout.write('Генерация данных...')
+        counts = CatalogGenerator(seed=options['seed']).generate(
+            options['users'], options['titles'],
+            options['reviews'], options['comments']
+        )
+        invalidate('categories', 'genres', 'titles', 'trending', 'users')
+        self.stdout.write(', '.join(
+            f'{name}: {count}' for name, count in counts.items()
+        ))
+
+    def get_admin(self):
+        # Только во временной тестовой базе: в рабочей базе
+        # администратор не создаётся.
+        admin, _ = CustomUser.objects.get_or_create(
+            username='benchmark-admin',
+            defaults={
+                'email': 'benchmark-admin@yamdb.fake',
+                'role': CustomUser.ADMIN,
+            }
+        )
+        return admin
+
+    def get_user(self, username):
+        if not username:
+            return None
+        try:
+            return CustomUser.objects.get(username=username)
+        except CustomUser.DoesNotExist:
+            raise CommandError(f'Пользователь {username} не найден.')
+
+    def run(self, options, user):
+        for prefix in benchmarks.get_uncovered():
+            self.stdout.write(self.style.WARNING(
+                f'{prefix}: эндпоинт не замеряется.'
+            ))
+        client = benchmarks.get_client(user)
+        samples = benchmarks.get_samples()
+        self.stdout.write(
+            f'{"эндпоинт":<66} {"p50":>8} {"p95":>8} {"p99":>8} '
+            f'{"SQL":>6} {"rps":>8}'
+        )
+        results = {}
+        for template in benchmarks.ENDPOINTS:
+            try:
+                url = '/api/v1/' + template.format(**samples)
+            except KeyError:
+                self.stdout.write(self.style.WARNING(
+                    f'{template}: нет данных для подстановки, пропущено.'
+                ))
+                continue
+            result = benchmarks.measure(
+                client, url, options['requests'],
+                warmup=options['warmup'], cached=options['cached']
+            )
+            results[template] = result
+            self.stdout.write(
+                f'{template:<66} {result["p50_ms"]:>8.2f} '
+                f'{result["p95_ms"]:>8.2f} {result["p99_ms"]:>8.2f} '
+                f'{result["queries"]:>6} {result["rps"]:>8.1f}'
+            )
+        return {
+            'meta': {
+                'created': timezone.now().isoformat(),
+                'python': sys.version.split()[0],
+                'django': django.get_version(),
+                'platform': platform.platform(),
+                'database': connection.vendor,
+                'seed': options['seed'],
+                'sizes': {
+                    name: options[name]
+                    for name in ('users', 'titles', 'reviews', 'comments')
+                },
+                'existing': options['existing'],
+                'cached': options['cached'],
+                'requests': options['requests'],
+            },
+            'endpoints': results,
+        }
@@ -0,0 +1,68 @@
+import json
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from api import benchmarks
+from api.metrics import connection_stats
+
+
+class Command(BaseCommand):
+    help = ('Сравнивает задержку запросов к API с новым соединением '
+            'на каждый запрос и с постоянными соединениями.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200)
+        parser.add_argument(
+            '--max-age',
+            type=int,
+            default=60,
+            help='CONN_MAX_AGE для замера постоянных соединений.'
+        )
+        parser.add_argument(
+            '--path',
+            default='/api/v1/categories/',
+            help='Замеряемый эндпоинт.'
+        )
+        parser.add_argument('--output', help='Файл для отчёта в JSON.')
+
+    def handle(self, *args, **options):
+        saved = {
+            connection.alias: connection.settings_dict['CONN_MAX_AGE']
+            for connection in connections.all()
+        }
+        report = {}
+        self.stdout.write(
+            f'{"CONN_MAX_AGE":>12} {"соединений":>10} {"p50":>8} '
+            f'{"p95":>8} {"среднее":>8}'
+        )
+        try:
+            for max_age in (0, options['max_age']):
+                report[str(max_age)] = result = self.measure(max_age, options)
+                self.stdout.write(
+                    f'{max_age:>12} {result["connections"]:>10} '
+                    f'{result["p50_ms"]:>8.2f} {result["p95_ms"]:>8.2f} '
+                    f'{result["mean_ms"]:>8.2f}'
+                )
+        finally:
+            for connection in connections.all():
+                connection.settings_dict['CONN_MAX_AGE'] = saved[
+                    connection.alias
+                ]
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as file:
+                json.dump(report, file, indent=2)
+
+    def measure(self, max_age, options):
+        for connection in connections.all():
+            connection.settings_dict['CONN_MAX_AGE'] = max_age
+        connections.close_all()
+        connection_stats.clear()
+        result = benchmarks.measure(
+            benchmarks.get_client(client_class=benchmarks.WsgiClient),
+            options['path'], options['requests']
+        )
+        stats = connection_stats.export()
+        result['connections'] = stats['opened']
+        result['reused'] = stats['reused']
+        return result
@@ -0,0 +1,121 @@
+import json
+import statistics
+import time
+from io import BytesIO
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from api import renderers
+from api.serializers import ReviewSerializer, TitleSerializer
+from reviews.generator import CatalogGenerator
+from reviews.models import Review, Title
+
+PAYLOADS = {
+    'titles': lambda count: TitleSerializer(
+        Title.objects.select_related('category').prefetch_related('genre')[
+            :count
+        ],
+        many=True
+    ).data,
+    'reviews': lambda count: ReviewSerializer(
+        Review.objects.select_related('author')[:count],
+        many=True
+    ).data,
+}
+
+
+class Command(BaseCommand):
+    help = ('Сравнивает рендеринг и разбор JSON стандартным json и '
+            'api.renderers на страницах произведений и отзывов. '
+            'Данные генерируются во временной транзакции и откатываются.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--titles',
+            type=int,
+            default=100,
+            help='Произведений в замеряемой странице.'
+        )
+        parser.add_argument(
+            '--reviews',
+            type=int,
+            default=500,
+            help='Отзывов в замеряемой странице.'
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=50,
+            help='Повторов каждого замера; в отчёт идёт медиана.'
+        )
+        parser.add_argument('--seed', type=int, default=1)
+        parser.add_argument('--output', help='Файл для отчёта в JSON.')
+
+    def handle(self, *args, **options):
+        if renderers.orjson is None:
+            self.stdout.write(self.style.WARNING(
+                'orjson не установлен: api.renderers использует '
+                'стандартный json.'
+            ))
+        with transaction.atomic():
+            CatalogGenerator(seed=options['seed']).generate(
+                users=max(50, options['reviews'] // options['titles'] + 2),
+                titles=options['titles'],
+                reviews=options['reviews'],
+                comments=0
+            )
+            data = {
+                name: build(options[name])
+                for name, build in PAYLOADS.items()
+            }
+            report = {
+                name: self.measure(payload, options['repeat'])
+                for name, payload in data.items()
+            }
+            transaction.set_rollback(True)
+        self.stdout.write(
+            f'{"страница":>9} {"КБ":>7} '
+            f'{"json":>8} {"fast":>8} {"разбор json":>12} {"fast":>8}'
+        )
+        for name, result in report.items():
+            self.stdout.write(
+                f'{name:>9} {result["size_kb"]:>7.1f} '
+                f'{result["render_json_ms"]:>8.2f} '
+                f'{result["render_fast_ms"]:>8.2f} '
+                f'{result["parse_json_ms"]:>12.2f} '
+                f'{result["parse_fast_ms"]:>8.2f}'
+            )
+        if options['output']:
+            report['backend'] = 'orjson' if renderers.orjson else 'json'
+            with open(options['output'], 'w', encoding='utf-8') as file:
+                json.dump(report, file, indent=2)
+
+    def measure(self, payload, repeat):
+        content = JSONRenderer().render(payload)
+        return {
+            'size_kb': len(content) / 1024,
+            'render_json_ms': self.time(
+                lambda: JSONRenderer().render(payload), repeat
+            ),
+            'render_fast_ms': self.time(
+                lambda: renderers.FastJSONRenderer().render(payload), repeat
+            ),
+            'parse_json_ms': self.time(
+                lambda: JSONParser().parse(BytesIO(content)), repeat
+            ),
+            'parse_fast_ms': self.time(
+                lambda: renderers.FastJSONParser().parse(BytesIO(content)),
+                repeat
+            ),
+        }
+
+    def time(self, action, repeat):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            action()
+            timings.append(time.perf_counter() - started)
+        return statistics.median(timings) * 1000
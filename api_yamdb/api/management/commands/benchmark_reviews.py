@@ -0,0 +1,104 @@
+import json
+from itertools import product
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from api import benchmarks
+from reviews.generator import CatalogGenerator
+from reviews.models import Review, Title
+from users.models import CustomUser
+
+
+class Command(BaseCommand):
+    help = ('Замеряет создание отзывов одновременными POST-запросами, '
+            'в том числе повторными от одного автора. Ошибки сервера '
+            'завершают команду с ошибкой. Гонки воспроизводятся на '
+            'PostgreSQL: SQLite не допускает одновременной записи.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=50)
+        parser.add_argument('--titles', type=int, default=50)
+        parser.add_argument('--seed', type=int, default=1)
+        parser.add_argument(
+            '--reviews',
+            type=int,
+            default=500,
+            help='Пар автор — произведение, для которых создаются отзывы.'
+        )
+        parser.add_argument(
+            '--duplicates',
+            type=int,
+            default=2,
+            help='Одновременных запросов на одну пару.'
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=8,
+            help='Число потоков-писателей.'
+        )
+        parser.add_argument(
+            '--existing',
+            action='store_true',
+            help='Писать в текущую базу. По умолчанию создаётся временная '
+                 'тестовая база.'
+        )
+        parser.add_argument('--output', help='Файл для отчёта в JSON.')
+
+    def handle(self, *args, **options):
+        if options['existing']:
+            report = self.run(options)
+        else:
+            old_name = connection.creation.create_test_db(
+                verbosity=0, autoclobber=True
+            )
+            try:
+                with benchmarks.private_cache():
+                    CatalogGenerator(seed=options['seed']).generate(
+                        options['users'], options['titles'], 0, 0
+                    )
+                    report = self.run(options)
+            finally:
+                connection.creation.destroy_test_db(old_name, verbosity=0)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as file:
+                json.dump(report, file, ensure_ascii=False, indent=2)
+        if report['errors']:
+            raise CommandError(
+                f'Ответов с ошибкой сервера: {report["errors"]}.'
+            )
+
+    def get_pairs(self, count):
+        reviewed = set(Review.objects.values_list('author_id', 'title_id'))
+        pairs = []
+        users = CustomUser.objects.order_by('pk')
+        titles = Title.objects.order_by('pk').values_list('pk', flat=True)
+        for user, title_id in product(users, titles):
+            # author_not_title_again запрещает совпадение id.
+            if user.pk != title_id and (user.pk, title_id) not in reviewed:
+                pairs.append((user, title_id))
+                if len(pairs) == count:
+                    break
+        return pairs
+
+    def run(self, options):
+        if connection.vendor == 'sqlite' and options['concurrency'] > 1:
+            self.stdout.write(self.style.WARNING(
+                'SQLite блокирует таблицы при одновременной записи: часть '
+                'запросов завершится ошибкой блокировки.'
+            ))
+        pairs = self.get_pairs(options['reviews'])
+        report = benchmarks.run_review_writes(
+            pairs, options['concurrency'], options['duplicates']
+        )
+        self.stdout.write(
+            f'запросов {report["requests"]}, потоков {report["concurrency"]}: '
+            f'создано {report["created"]}, отклонено {report["rejected"]}, '
+            f'ошибок {report["errors"]}'
+        )
+        self.stdout.write(
+            f'p50 {report["p50_ms"]:.2f} мс, p95 {report["p95_ms"]:.2f} мс, '
+            f'p99 {report["p99_ms"]:.2f} мс, {report["rps"]:.1f} запросов/с'
+        )
+        return report
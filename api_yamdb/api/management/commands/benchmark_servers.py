@@ -0,0 +1,150 @@
+import json
+import os
+import subprocess
+import sys
+import time
+from urllib.error import URLError
+from urllib.request import Request, urlopen
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from api import benchmarks
+
+MODES = {
+    'sync': ('api_yamdb.wsgi:application', {
+        'GUNICORN_WORKER_CLASS': 'sync',
+    }),
+    'gthread': ('api_yamdb.wsgi:application', {
+        'GUNICORN_WORKER_CLASS': 'gthread',
+    }),
+    'asgi': ('api_yamdb.asgi:application', {
+        'GUNICORN_WORKER_CLASS': 'uvicorn.workers.UvicornH11Worker',
+    }),
+}
+# Тяжёлые на чтение списки, ради которых нужен ASGI-режим.
+PATHS = (
+    '/api/v1/titles/',
+    '/api/v1/titles/{title_id}/reviews/',
+    '/api/v1/titles/{title_id}/reviews/{review_id}/comments/',
+)
+
+
+class Command(BaseCommand):
+    help = ('Запускает gunicorn в режимах WSGI и ASGI на текущей базе '
+            'и сравнивает пропускную способность при росте '
+            'числа одновременных запросов.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--modes',
+            default='sync,asgi',
+            help=f'Режимы через запятую: {", ".join(MODES)}.'
+        )
+        parser.add_argument('--workers', type=int, default=2)
+        parser.add_argument(
+            '--threads',
+            type=int,
+            default=20,
+            help='Потоков на процесс для режимов gthread и asgi.'
+        )
+        parser.add_argument(
+            '--concurrency',
+            default='1,8,32,64',
+            help='Уровни одновременных запросов через запятую.'
+        )
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=500,
+            help='Количество запросов на каждом уровне.'
+        )
+        parser.add_argument('--port', type=int, default=8765)
+        parser.add_argument('--output', help='Файл для отчёта в JSON.')
+
+    def handle(self, *args, **options):
+        modes = options['modes'].split(',')
+        unknown = set(modes) - set(MODES)
+        if unknown:
+            raise CommandError(
+                f'Неизвестные режимы: {", ".join(sorted(unknown))}.'
+            )
+        samples = benchmarks.get_samples()
+        try:
+            paths = [path.format(**samples) for path in PATHS]
+        except KeyError:
+            raise CommandError(
+                'В базе нет данных: заполните её командой generate_data.'
+            )
+        levels = [int(level) for level in options['concurrency'].split(',')]
+        report = {}
+        self.stdout.write(
+            f'{"режим":<8} {"клиентов":>8} {"rps":>8} {"p50":>8} '
+            f'{"p95":>8} {"p99":>8} {"ошибок":>7}'
+        )
+        for mode in modes:
+            report[mode] = []
+            with self.serve(mode, options):
+                for level in levels:
+                    result = benchmarks.run_load(
+                        f'http://127.0.0.1:{options["port"]}', paths,
+                        level, options['requests']
+                    )
+                    report[mode].append(result)
+                    self.stdout.write(
+                        f'{mode:<8} {level:>8} {result["rps"]:>8.1f} '
+                        f'{result["p50_ms"]:>8.1f} {result["p95_ms"]:>8.1f} '
+                        f'{result["p99_ms"]:>8.1f} {result["errors"]:>7}'
+                    )
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as file:
+                json.dump(report, file, ensure_ascii=False, indent=2)
+
+    def serve(self, mode, options):
+        application, env = MODES[mode]
+        return Server(application, {
+            **os.environ,
+            **env,
+            'GUNICORN_BIND': f'127.0.0.1:{options["port"]}',
+            'GUNICORN_WORKERS': str(options['workers']),
+            'GUNICORN_THREADS': str(options['threads']),
+            'ASGI_THREADS': str(options['threads']),
+        })
+
+
+class Server:
+    """gunicorn в дочернем процессе на время замера."""
+
+    def __init__(self, application, env, timeout=30):
+        self.application = application
+        self.env = env
+        self.timeout = timeout
+
+    def __enter__(self):
+        self.process = subprocess.Popen(
+            [
+                sys.executable, '-c',
+                'from gunicorn.app.wsgiapp import run; run()',
+                self.application
+            ],
+            cwd=settings.BASE_DIR,
+            env=self.env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL
+        )
+        url = f'http://{self.env["GUNICORN_BIND"]}/api/v1/categories/'
+        deadline = time.monotonic() + self.timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise CommandError(f'Сервер {self.application} не запустился.')
+            try:
+                with urlopen(Request(url, headers={'Host': 'localhost'})):
+                    return self
+            except (URLError, OSError):
+                time.sleep(0.2)
+        self.__exit__()
+        raise CommandError(f'Сервер {self.application} не ответил вовремя.')
+
+    def __exit__(self, *exc_info):
+        self.process.terminate()
+        self.process.wait()
@@ -0,0 +1,111 @@
+import re
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api.benchmarks import (
+    ENDPOINTS, add_nonce, get_client, get_samples, get_uncovered
+)
+from users.models import CustomUser
+
+# Признаки полного просмотра таблицы и сортировки в планах
+# PostgreSQL и SQLite.
+WARNINGS = (
+    ('полный просмотр', re.compile(
+        r'Seq Scan on (?P<table>\w+)|SCAN (?:TABLE )?(?P<sqlite>\w+)$'
+    )),
+    ('сортировка', re.compile(r'\bSort\b|USE TEMP B-TREE FOR ORDER BY')),
+)
+
+
+class Command(BaseCommand):
+    help = ('Выполняет EXPLAIN для запросов каждого эндпоинта API '
+            'и отмечает полные просмотры таблиц и сортировки.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--username',
+            help='Пользователь, от имени которого выполняются запросы '
+                 '(нужен администратор для /users/).'
+        )
+        parser.add_argument(
+            '--allow',
+            default='reviews_category,reviews_genre',
+            help='Таблицы через запятую, полный просмотр которых допустим.'
+        )
+        parser.add_argument(
+            '--fail',
+            action='store_true',
+            help='Завершиться с ошибкой, если найдены предупреждения.'
+        )
+
+    def handle(self, *args, **options):
+        self.allowed = set(filter(None, options['allow'].split(',')))
+        self.tables = set(connection.introspection.table_names())
+        client = self.get_client(options['username'])
+        samples = get_samples()
+        self.check_coverage()
+        flagged = 0
+        for template in ENDPOINTS:
+            try:
+                url = '/api/v1/' + template.format(**samples)
+            except KeyError:
+                self.stdout.write(self.style.WARNING(
+                    f'{template}: нет данных для подстановки, пропущено.'
+                ))
+                continue
+            with CaptureQueriesContext(connection) as context:
+                response = client.get(add_nonce(url))
+            queries = [
+                query['sql'] for query in context.captured_queries
+                if query['sql'].lstrip().upper().startswith('SELECT')
+            ]
+            self.stdout.write(self.style.MIGRATE_HEADING(
+                f'{url} — {response.status_code}, запросов: {len(queries)}'
+            ))
+            for sql in queries:
+                flagged += self.explain(sql)
+        if flagged and options['fail']:
+            raise CommandError(f'Найдено предупреждений: {flagged}.')
+
+    def get_client(self, username):
+        if not username:
+            return get_client()
+        try:
+            user = CustomUser.objects.get(username=username)
+        except CustomUser.DoesNotExist:
+            raise CommandError(f'Пользователь {username} не найден.')
+        return get_client(user)
+
+    def check_coverage(self):
+        for prefix in get_uncovered():
+            self.stdout.write(self.style.WARNING(
+                f'{prefix}: эндпоинт не проверяется.'
+            ))
+
+    def explain(self, sql):
+        with connection.cursor() as cursor:
+            cursor.execute(f'{connection.ops.explain_query_prefix()} {sql}')
+            plan = [
+                ' '.join(str(column) for column in row)
+                for row in cursor.fetchall()
+            ]
+        warnings = []
+        for line in plan:
+            for label, pattern in WARNINGS:
+                match = pattern.search(line)
+                if not match:
+                    continue
+                groups = match.groupdict()
+                table = groups.get('table') or groups.get('sqlite')
+                if table in self.allowed or (
+                    table is not None and table not in self.tables
+                ):
+                    continue
+                warnings.append(f'{label}: {line.strip()}')
+        if warnings:
+            self.stdout.write(f'  {sql}')
+            for warning in warnings:
+                self.stdout.write(self.style.WARNING(f'    {warning}'))
+        return len(warnings)
@@ -0,0 +1,286 @@
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from contextlib import ExitStack, contextmanager
+from weakref import WeakSet
+
+from django.conf import settings
+from django.db import connections
+from rest_framework.serializers import ListSerializer
+
+logger = logging.getLogger('api.sql')
+
+# Верхние границы корзин гистограммы, мс.
+BUCKETS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, float('inf'))
+METRICS = ('total', 'db', 'serialize', 'render')
+
+
+class Slot:
+    """Метрики одного маршрута за одну минуту."""
+
+    def __init__(self, minute):
+        self.minute = minute
+        self.count = 0
+        self.queries = 0
+        self.max_queries = 0
+        self.sums = dict.fromkeys(METRICS, 0.0)
+        self.buckets = {metric: [0] * len(BUCKETS) for metric in METRICS}
+
+    def add(self, queries, timings):
+        self.count += 1
+        self.queries += queries
+        self.max_queries = max(self.max_queries, queries)
+        for metric, value in timings.items():
+            self.sums[metric] += value
+            self.buckets[metric][bisect_left(BUCKETS, value)] += 1
+
+
+class Registry:
+    """Скользящие гистограммы по маршрутам в памяти процесса.
+
+    Каждый воркер gunicorn копит свои данные, поэтому отчёт
+    описывает запросы, обслуженные этим процессом.
+    """
+
+    def __init__(self, window):
+        self.window = window
+        self.lock = threading.Lock()
+        self.routes = {}
+
+    def add(self, route, queries, timings):
+        minute = int(time.time() // 60)
+        with self.lock:
+            slots = self.routes.setdefault(
+                route, deque(maxlen=self.window)
+            )
+            if not slots or slots[-1].minute != minute:
+                slots.append(Slot(minute))
+            slots[-1].add(queries, timings)
+
+    def clear(self):
+        with self.lock:
+            self.routes.clear()
+
+    def export(self):
+        oldest = int(time.time() // 60) - self.window
+        report = {}
+        with self.lock:
+            for route, slots in sorted(self.routes.items()):
+                slots = [slot for slot in slots if slot.minute > oldest]
+                count = sum(slot.count for slot in slots)
+                if not count:
+                    continue
+                report[route] = {
+                    'count': count,
+                    'queries_avg': round(
+                        sum(slot.queries for slot in slots) / count, 2
+                    ),
+                    'queries_max': max(slot.max_queries for slot in slots),
+                    **{
+                        metric: summarize(metric, slots, count)
+                        for metric in METRICS
+                    },
+                }
+        return {
+            'pid': os.getpid(),
+            'window_minutes': self.window,
+            'routes': report,
+        }
+
+
+def summarize(metric, slots, count):
+    buckets = [
+        sum(slot.buckets[metric][index] for slot in slots)
+        for index in range(len(BUCKETS))
+    ]
+    return {
+        'avg_ms': round(sum(slot.sums[metric] for slot in slots) / count, 2),
+        'p50_ms': quantile(buckets, count, 0.5),
+        'p95_ms': quantile(buckets, count, 0.95),
+        'p99_ms': quantile(buckets, count, 0.99),
+        'buckets': {
+            str(bound): value for bound, value in zip(BUCKETS, buckets)
+        },
+    }
+
+
+def quantile(buckets, count, fraction):
+    """Верхняя граница корзины, в которую попадает квантиль."""
+    seen = 0
+    for bound, value in zip(BUCKETS, buckets):
+        seen += value
+        if seen >= count * fraction:
+            return bound if bound != float('inf') else None
+    return None
+
+
+registry = Registry(settings.API_METRICS_WINDOW)
+
+
+class ConnectionStats:
+    """Счётчики жизненного цикла соединений с базой в этом процессе."""
+
+    FIELDS = ('opened', 'reused', 'checked', 'unusable')
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.wrappers = WeakSet()
+        self.clear()
+
+    def add(self, field, value=1):
+        with self.lock:
+            self.counters[field] += value
+
+    def track(self, wrapper):
+        with self.lock:
+            self.counters['opened'] += 1
+            self.wrappers.add(wrapper)
+
+    def clear(self):
+        with self.lock:
+            self.counters = dict.fromkeys(self.FIELDS, 0)
+
+    def export(self):
+        with self.lock:
+            counters = dict(self.counters)
+            wrappers = list(self.wrappers)
+        return {
+            **counters,
+            # Соединения всех потоков процесса, открытые сейчас.
+            'open': sum(
+                wrapper.connection is not None for wrapper in wrappers
+            ),
+            'max_age': {
+                alias: connections.databases[alias].get('CONN_MAX_AGE')
+                for alias in connections
+            },
+        }
+
+
+connection_stats = ConnectionStats()
+
+
+class QueryTimer:
+    """Обёртка execute_wrapper: считает запросы и время в базе."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = (time.perf_counter() - started) * 1000
+            self.count += 1
+            self.duration += duration
+            threshold = settings.API_SLOW_QUERY_MS
+            if threshold and duration >= threshold:
+                logger.warning(
+                    'Медленный запрос %.1f мс: %s; %r', duration, sql, params
+                )
+
+
+class SerializeTimer:
+    """Время сериализации ответа без запросов к базе по ходу неё."""
+
+    def __init__(self, queries):
+        self.queries = queries
+        self.duration = 0.0
+
+    @contextmanager
+    def measure(self):
+        started = time.perf_counter()
+        db_started = self.queries.duration
+        try:
+            yield
+        finally:
+            self.duration += (
+                (time.perf_counter() - started) * 1000
+                - (self.queries.duration - db_started)
+            )
+
+
+class SerializeTimingMixin:
+    """Копит время to_representation сериализатора верхнего уровня.
+
+    Данные ответа сериализуются внутри представления, поэтому без
+    этого замера их стоимость попадала бы в app.
+    """
+
+    def to_representation(self, instance):
+        request = self.context.get('request')
+        timer = getattr(request, '_metrics_serialize', None)
+        parent = self.parent
+        if isinstance(parent, ListSerializer):
+            parent = parent.parent
+        if timer is None or parent is not None:
+            return super().to_representation(instance)
+        with timer.measure():
+            return super().to_representation(instance)
+
+
+def get_route(request):
+    match = getattr(request, 'resolver_match', None)
+    view_name = match.view_name if match is not None else 'unmatched'
+    return f'{request.method} {view_name}'
+
+
+class RequestMetricsMiddleware:
+    """Замеряет запросы к базе, время сериализации и рендеринга
+    и общую длительность.
+
+    Результат отдаётся в заголовке Server-Timing и копится
+    в гистограммах по маршрутам.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.API_METRICS_ENABLED:
+            return self.get_response(request)
+        started = time.perf_counter()
+        timer = QueryTimer()
+        request._metrics_render = 0.0
+        request._metrics_serialize = SerializeTimer(timer)
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(timer))
+            response = self.get_response(request)
+        timings = {
+            'total': (time.perf_counter() - started) * 1000,
+            'db': timer.duration,
+            'serialize': request._metrics_serialize.duration,
+            'render': request._metrics_render,
+        }
+        registry.add(get_route(request), timer.count, timings)
+        app = timings['total'] - sum(
+            timings[metric] for metric in ('db', 'serialize', 'render')
+        )
+        response['Server-Timing'] = ', '.join((
+            f'db;dur={timings["db"]:.1f};desc="{timer.count} queries"',
+            f'serialize;dur={timings["serialize"]:.1f}',
+            f'render;dur={timings["render"]:.1f}',
+            f'app;dur={app:.1f}',
+            f'total;dur={timings["total"]:.1f}',
+        ))
+        return response
+
+    def process_template_response(self, request, response):
+        # Ответы DRF рендерятся после выхода из представления:
+        # замеряем время от этого момента до конца рендеринга.
+        if settings.API_METRICS_ENABLED:
+            started = time.perf_counter()
+
+            def finish(response):
+                request._metrics_render = (
+                    time.perf_counter() - started
+                ) * 1000
+
+            response.add_post_render_callback(finish)
+        return response
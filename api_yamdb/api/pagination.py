@@ -0,0 +1,186 @@
+from base64 import b64decode, b64encode
+from collections import namedtuple
+from urllib import parse
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+from rest_framework.utils.urls import replace_query_param
+
+Position = namedtuple('Position', ('reverse', 'value', 'pk'))
+
+
+class KeysetCursorPagination(CursorPagination):
+    """Keyset-пагинация по паре (поле ordering, id) без OFFSET и COUNT(*)."""
+
+    ordering = 'pub_date'
+    invalid_cursor_message = 'Некорректный курсор'
+
+    @property
+    def field(self):
+        return self.ordering.lstrip('-')
+
+    def parse_value(self, value):
+        return value
+
+    def format_value(self, value):
+        return str(value)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+        self.base_url = request.build_absolute_uri()
+        self.descending = self.get_ordering(
+            request, queryset, view
+        )[0].startswith('-')
+        self.cursor = self.decode_cursor(request)
+        reverse = self.cursor is not None and self.cursor.reverse
+
+        ordering = (self.field, 'pk')
+        if self.descending != reverse:
+            ordering = (f'-{self.field}', '-pk')
+        queryset = queryset.order_by(*ordering)
+        if self.cursor is not None:
+            lookup = 'lt' if self.descending != reverse else 'gt'
+            queryset = queryset.filter(
+                Q(**{f'{self.field}__{lookup}': self.cursor.value})
+                | Q(**{self.field: self.cursor.value,
+                       f'pk__{lookup}': self.cursor.pk})
+            )
+
+        results = list(queryset[:self.page_size + 1])
+        self.has_following = len(results) > self.page_size
+        self.page = results[:self.page_size]
+        if reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = True, self.has_following
+        else:
+            self.has_next = self.has_following
+            self.has_previous = self.cursor is not None
+        return self.page
+
+    def get_ordering(self, request, queryset, view):
+        for backend in getattr(view, 'filter_backends', ()):
+            if hasattr(backend, 'get_ordering'):
+                ordering = backend().get_ordering(request, queryset, view)
+                if ordering and ordering[0].lstrip('-') == self.field:
+                    return tuple(ordering)
+        return (self.ordering,)
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            tokens = parse.parse_qs(
+                b64decode(encoded.encode('ascii')).decode('ascii')
+            )
+            value = self.parse_value(tokens['p'][0])
+            position = Position(
+                reverse=tokens.get('r', ['0'])[0] == '1',
+                value=value,
+                pk=int(tokens['i'][0])
+            )
+        except (TypeError, ValueError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+        if value is None:
+            raise NotFound(self.invalid_cursor_message)
+        return position
+
+    def encode_cursor(self, position):
+        tokens = {'p': self.format_value(position.value), 'i': position.pk}
+        if position.reverse:
+            tokens['r'] = '1'
+        encoded = b64encode(
+            parse.urlencode(tokens).encode('ascii')
+        ).decode('ascii')
+        return replace_query_param(
+            self.base_url, self.cursor_query_param, encoded
+        )
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        last = self.page[-1]
+        return self.encode_cursor(
+            Position(False, getattr(last, self.field), last.pk)
+        )
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        first = self.page[0]
+        return self.encode_cursor(
+            Position(True, getattr(first, self.field), first.pk)
+        )
+
+
+class PubDateCursorPagination(KeysetCursorPagination):
+    ordering = 'pub_date'
+
+    def parse_value(self, value):
+        return parse_datetime(value)
+
+    def format_value(self, value):
+        return value.isoformat()
+
+
+class TopCursorPagination(KeysetCursorPagination):
+    ordering = '-weighted_rating'
+
+    def parse_value(self, value):
+        return float(value)
+
+    def format_value(self, value):
+        return repr(value)
+
+
+class TrendingCursorPagination(KeysetCursorPagination):
+    ordering = '-trending'
+
+    def parse_value(self, value):
+        return int(value)
+
+
+class OptionalCursorPagination(PageNumberPagination):
+    """Постраничная пагинация с переключением на курсорную.
+
+    Курсорный режим включается параметром `?pagination=cursor`
+    или наличием `?cursor=` в запросе.
+    """
+
+    mode_query_param = 'pagination'
+    cursor_pagination_class = PubDateCursorPagination
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.cursor_paginator = None
+        if self.is_cursor_mode(request):
+            self.cursor_paginator = self.cursor_pagination_class()
+            return self.cursor_paginator.paginate_queryset(
+                queryset, request, view
+            )
+        return super().paginate_queryset(queryset, request, view)
+
+    def is_cursor_mode(self, request):
+        cursor_param = self.cursor_pagination_class.cursor_query_param
+        return (
+            request.query_params.get(self.mode_query_param) == 'cursor'
+            or cursor_param in request.query_params
+        )
+
+    def get_paginated_response(self, data):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def get_next_link(self):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_next_link()
+        return super().get_next_link()
+
+    def get_previous_link(self):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_previous_link()
+        return super().get_previous_link()
@@ -5,7 +5,7 @@ class IsAuthorOrAdminOrModerReadOnly(BasePermission):
     def has_object_permission(self, request, view, obj):
         return(
             request.method in SAFE_METHODS
-            or request.user == obj.author
+            or obj.author_id == request.user.id
             or request.user.is_moderator
             or request.user.is_admin
         )
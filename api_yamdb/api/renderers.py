@@ -0,0 +1,60 @@
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+UTF8 = ('utf-8', 'utf8')
+LINE_SEPARATOR = '\u2028'.encode()
+PARAGRAPH_SEPARATOR = '\u2029'.encode()
+
+
+class FastJSONRenderer(JSONRenderer):
+    """JSONRenderer на orjson; без orjson — стандартный json DRF.
+
+    Отступы (indent в заголовке Accept), даты и типы, которых orjson
+    не знает (Decimal, ленивые строки, QuerySet), обрабатываются как в DRF.
+    """
+
+    encoder = JSONEncoder()
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None or self.get_indent(
+            accepted_media_type or '', renderer_context or {}
+        ):
+            return super().render(
+                data, accepted_media_type, renderer_context
+            )
+        # Как и DRF, экранирует разделители строк, недопустимые в JS.
+        return orjson.dumps(
+            data,
+            default=self.encoder.default,
+            # Даты отдаёт encoder DRF: формат (Z вместо +00:00) не меняется.
+            option=(
+                orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+            )
+        ).replace(LINE_SEPARATOR, b'\\u2028').replace(
+            PARAGRAPH_SEPARATOR, b'\\u2029'
+        )
+
+
+class FastJSONParser(JSONParser):
+    """JSONParser на orjson; без orjson — стандартный json DRF."""
+
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        encoding = (parser_context or {}).get(
+            'encoding', settings.DEFAULT_CHARSET
+        )
+        if orjson is None or encoding.lower() not in UTF8:
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as error:
+            raise ParseError(f'JSON parse error - {error}')
@@ -1,7 +1,10 @@
 import re
 
-from rest_framework import serializers, status
+from django.db import IntegrityError, transaction
+
+from rest_framework import serializers
 from rest_framework.relations import SlugRelatedField
+from rest_framework.settings import api_settings
 
 from users.models import CustomUser
 from reviews.models import (
@@ -11,25 +14,33 @@ from reviews.models import (
     Genre,
     Title
 )
+from reviews.stats import PERIODS
+
+from .bulk import BulkListSerializer, PrefetchedSlugRelatedField
+from .metrics import SerializeTimingMixin
+from .sparse import SparseFieldsMixin
 
 
-class CategorySerializer(serializers.ModelSerializer):
+class CategorySerializer(SerializeTimingMixin, SparseFieldsMixin,
+                         serializers.ModelSerializer):
     class Meta:
         fields = ('name', 'slug')
         model = Category
 
 
-class GenreSerializer(serializers.ModelSerializer):
+class GenreSerializer(SerializeTimingMixin, SparseFieldsMixin,
+                      serializers.ModelSerializer):
     class Meta:
         fields = ('name', 'slug')
         model = Genre
         lookup_field = 'slug'
 
 
-class TitleSerializer(serializers.ModelSerializer):
+class TitleSerializer(SerializeTimingMixin, SparseFieldsMixin,
+                      serializers.ModelSerializer):
     genre = GenreSerializer(read_only=True, many=True)
     category = CategorySerializer(read_only=True)
-    rating = serializers.IntegerField()
+    rating = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = Title
@@ -45,7 +56,13 @@ class TitleSerializer(serializers.ModelSerializer):
             'rating')
 
 
-class TitleCreateSerializer(serializers.ModelSerializer):
+class TitleRankSerializer(TitleSerializer):
+    class Meta(TitleSerializer.Meta):
+        fields = TitleSerializer.Meta.fields + ('weighted_rating', 'trending')
+
+
+class TitleCreateSerializer(SerializeTimingMixin,
+                            serializers.ModelSerializer):
     category = serializers.SlugRelatedField(
         slug_field='slug',
         queryset=Category.objects.all()
@@ -57,14 +74,111 @@ class TitleCreateSerializer(serializers.ModelSerializer):
     )
 
     class Meta:
-        fields = '__all__'
+        fields = ('id', 'name', 'year', 'description', 'genre', 'category')
         model = Title
 
 
-class ReviewSerializer(serializers.ModelSerializer):
+class TitleStatsQuerySerializer(serializers.Serializer):
+    since = serializers.DateField(required=False)
+    period = serializers.ChoiceField(choices=PERIODS, default='day')
+
+
+class TitleBulkCreateSerializer(TitleCreateSerializer):
+    category = PrefetchedSlugRelatedField(
+        slug_field='slug',
+        queryset=Category.objects.all()
+    )
+    genre = PrefetchedSlugRelatedField(
+        slug_field='slug',
+        queryset=Genre.objects.all(),
+        many=True
+    )
+
+    class Meta(TitleCreateSerializer.Meta):
+        list_serializer_class = BulkListSerializer
+
+    def prefetch(self, items, queryset):
+        pass
+
+
+class TitleBulkUpdateSerializer(TitleBulkCreateSerializer):
+    id = serializers.IntegerField()
+
+    def prefetch(self, items, queryset):
+        ids = set()
+        for item in items:
+            try:
+                ids.add(int(item.get('id')))
+            except (TypeError, ValueError):
+                pass
+        self.context['instances'] = queryset.in_bulk(ids)
+        self.context['seen'] = set()
+
+    def validate_id(self, value):
+        if value not in self.context['instances']:
+            raise serializers.ValidationError('Произведение не найдено.')
+        if value in self.context['seen']:
+            raise serializers.ValidationError(
+                'Произведение повторяется в запросе.'
+            )
+        self.context['seen'].add(value)
+        return value
+
+    def validate(self, data):
+        if 'id' not in data:
+            raise serializers.ValidationError({'id': 'Обязательное поле.'})
+        return data
+
+
+class SlugBulkCreateSerializer(SerializeTimingMixin,
+                               serializers.ModelSerializer):
+    slug = serializers.SlugField(max_length=50)
+
+    def prefetch(self, items, queryset):
+        slugs = {
+            item.get('slug') for item in items
+            if isinstance(item.get('slug'), str)
+        }
+        self.context['taken'] = set(
+            queryset.filter(slug__in=slugs).values_list('slug', flat=True)
+        )
+
+    def validate_slug(self, value):
+        if value in self.context['taken']:
+            raise serializers.ValidationError(
+                'Объект с таким slug уже существует.'
+            )
+        # Повтор внутри пачки тоже считается занятым slug.
+        self.context['taken'].add(value)
+        return value
+
+
+class CategoryBulkSerializer(SlugBulkCreateSerializer):
+    class Meta:
+        fields = ('name', 'slug')
+        model = Category
+        list_serializer_class = BulkListSerializer
+
+
+class GenreBulkSerializer(SlugBulkCreateSerializer):
+    class Meta:
+        fields = ('name', 'slug')
+        model = Genre
+        list_serializer_class = BulkListSerializer
+
+
+class AuthorSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = CustomUser
+        fields = ('username', 'first_name', 'last_name', 'bio')
+
+
+class ReviewSerializer(SerializeTimingMixin, SparseFieldsMixin,
+                       serializers.ModelSerializer):
     author = SlugRelatedField(slug_field='username',
                               read_only=True,)
     score = serializers.IntegerField(required=True)
+    expandable_fields = {'author': AuthorSerializer}
 
     class Meta:
         model = Review
@@ -77,32 +191,43 @@ class ReviewSerializer(serializers.ModelSerializer):
             )
         return score
 
-    def validate(self, data):
-        context = self.context['request']
-        title = context.parser_context['kwargs']['title_id']
-        author = context.user
-        review = Review.objects.filter(title_id=title, author=author)
-        if not context.method == 'POST':
-            return data
-        if review.exists():
-            raise serializers.ValidationError(
-                detail='Вы уже оставили свой отзыв к данному произведению',
-                code=status.HTTP_400_BAD_REQUEST
-            )
-        return data
-
-
-class CommentSerializer(serializers.ModelSerializer):
+    def create(self, validated_data):
+        # Повторный отзыв отсекает ограничение unique_review: проверка
+        # перед вставкой не защищает от одновременных запросов.
+        try:
+            with transaction.atomic():
+                return super().create(validated_data)
+        except IntegrityError:
+            title_id = validated_data['title_id']
+            if Review.objects.filter(
+                title_id=title_id, author=validated_data['author']
+            ).exists():
+                raise serializers.ValidationError({
+                    api_settings.NON_FIELD_ERRORS_KEY: [
+                        'Вы уже оставили свой отзыв к данному произведению'
+                    ]
+                })
+            if not Title.objects.filter(pk=title_id).exists():
+                raise Title.DoesNotExist(
+                    f'Произведение {title_id} не найдено.'
+                )
+            raise
+
+
+class CommentSerializer(SerializeTimingMixin, SparseFieldsMixin,
+                        serializers.ModelSerializer):
     author = SlugRelatedField(slug_field='username',
                               read_only=True,
                               allow_null=False)
+    expandable_fields = {'author': AuthorSerializer}
 
     class Meta:
         model = Comment
         fields = ('id', 'text', 'author', 'pub_date')
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(SerializeTimingMixin, SparseFieldsMixin,
+                     serializers.ModelSerializer):
 
     class Meta:
         model = CustomUser
@@ -0,0 +1,115 @@
+import time
+
+from django.conf import settings
+from django.core.signals import request_finished, request_started
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from reviews.models import Category, Comment, Genre, Review, Title
+from reviews.signals import get_author_titles, in_cascade
+from users.models import CustomUser
+
+from .authentication import forget_user
+from .cache import invalidate
+from .metrics import connection_stats
+
+INVALIDATED_NAMESPACES = {
+    Category: lambda instance: ('categories', 'titles'),
+    Genre: lambda instance: ('genres', 'titles'),
+    Title: lambda instance: ('titles',),
+    Review: lambda instance: (
+        'titles',
+        f'reviews:{instance.title_id}',
+        f'stats:{instance.title_id}',
+        'trending'
+    ),
+    Comment: lambda instance: (
+        f'comments:{instance.review_id}',
+        f'stats:{instance.title_id}',
+        'trending'
+    ),
+    CustomUser: lambda instance: ('users',),
+}
+
+
+def invalidate_on_write(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    if sender in (Review, Comment) and in_cascade(instance.title_id):
+        # Сбрасывается один раз при удалении произведения или автора.
+        return
+    invalidate(*INVALIDATED_NAMESPACES[sender](instance))
+
+
+for model in INVALIDATED_NAMESPACES:
+    post_save.connect(invalidate_on_write, sender=model)
+    post_delete.connect(invalidate_on_write, sender=model)
+
+
+@receiver(post_delete, sender=Title)
+def invalidate_title_threads(sender, instance, **kwargs):
+    invalidate(f'title:{instance.pk}', f'stats:{instance.pk}', 'trending')
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def invalidate_on_genre_change(sender, action, **kwargs):
+    if action.startswith('post_'):
+        invalidate('titles')
+
+
+@receiver(post_save, sender=CustomUser)
+@receiver(post_delete, sender=CustomUser)
+def forget_changed_user(sender, instance, raw=False, created=False,
+                        **kwargs):
+    # Роль могла измениться: кэш процесса и утверждения в уже выданных
+    # токенах больше не используются для этого пользователя. Имя и
+    # профиль автора выводятся в отзывах и комментариях.
+    if not raw and not created:
+        forget_user(instance.pk)
+        invalidate('authors')
+
+
+@receiver(post_delete, sender=CustomUser)
+def invalidate_author_titles(sender, instance, **kwargs):
+    # Отзывы и комментарии автора удалены каскадом без сброса по строкам.
+    titles = get_author_titles(instance)
+    if titles:
+        invalidate('titles', 'trending', *(f'stats:{pk}' for pk in titles))
+
+
+@receiver(connection_created)
+def track_connection(sender, connection, **kwargs):
+    connection_stats.track(connection)
+
+
+@receiver(request_started)
+def check_reused_connections(sender, **kwargs):
+    # Выполняется после close_old_connections: устаревшие соединения
+    # и соединения с ошибками уже закрыты, остальные будут
+    # переиспользованы этим запросом. SELECT 1 выполняется только для
+    # соединений, простоявших дольше DB_CONN_HEALTH_CHECK_INTERVAL.
+    interval = settings.DB_CONN_HEALTH_CHECK_INTERVAL
+    now = time.monotonic()
+    for connection in connections.all():
+        if connection.connection is None:
+            continue
+        connection_stats.add('reused')
+        last_used = getattr(connection, 'last_used', None)
+        if interval is None or (
+            last_used is not None and now - last_used < interval
+        ):
+            continue
+        connection_stats.add('checked')
+        if not connection.is_usable():
+            connection_stats.add('unusable')
+            connection.close()
+
+
+@receiver(request_finished)
+def mark_used_connections(sender, **kwargs):
+    now = time.monotonic()
+    for connection in connections.all():
+        if connection.connection is not None:
+            connection.last_used = now
@@ -0,0 +1,100 @@
+from rest_framework.exceptions import ValidationError
+from rest_framework.serializers import ListSerializer
+
+FIELDS_PARAM = 'fields'
+EXPAND_PARAM = 'expand'
+
+
+def parse_names(request, param):
+    """Имена из параметра вида ?fields=id,name; учитываются только в GET."""
+    if request is None or request.method != 'GET':
+        return set()
+    return {
+        name.strip()
+        for name in request.query_params.get(param, '').split(',')
+        if name.strip()
+    }
+
+
+class SparseFieldsMixin:
+    """Оставляет поля из ?fields= и разворачивает связи из ?expand=.
+
+    Действует только на сериализатор верхнего уровня: вложенные
+    объекты отдаются целиком.
+    """
+
+    expandable_fields = {}
+
+    def is_top_level(self):
+        parent = self.parent
+        if isinstance(parent, ListSerializer):
+            parent = parent.parent
+        return parent is None
+
+    def get_fields(self):
+        fields = super().get_fields()
+        request = self.context.get('request')
+        if not self.is_top_level():
+            return fields
+        for name in parse_names(request, EXPAND_PARAM):
+            if name not in self.expandable_fields:
+                raise ValidationError(
+                    {EXPAND_PARAM: f'Поле {name} нельзя развернуть.'}
+                )
+            fields[name] = self.expandable_fields[name](read_only=True)
+        requested = parse_names(request, FIELDS_PARAM)
+        if requested:
+            unknown = requested - set(fields)
+            if unknown:
+                raise ValidationError({
+                    FIELDS_PARAM: 'Неизвестные поля: '
+                                  f'{", ".join(sorted(unknown))}.'
+                })
+            for name in set(fields) - requested:
+                del fields[name]
+        return fields
+
+
+class SparseQuerySetMixin:
+    """Не загружает колонки и связи, которые не попали в ?fields=.
+
+    Связи из select_related_fields и prefetch_related_fields
+    подгружаются, только если соответствующее поле будет в ответе,
+    связи из expand_related_fields — только при ?expand=.
+    """
+
+    select_related_fields = {}
+    prefetch_related_fields = {}
+    expand_related_fields = {}
+    # Колонки, нужные независимо от ?fields= (например, для пагинации).
+    sparse_required_fields = ()
+
+    def get_queryset(self):
+        return self.get_sparse_queryset(super().get_queryset())
+
+    def get_sparse_queryset(self, queryset):
+        requested = parse_names(self.request, FIELDS_PARAM)
+        expanded = parse_names(self.request, EXPAND_PARAM)
+
+        def wanted(name):
+            return not requested or name in requested
+
+        for name, relation in self.select_related_fields.items():
+            if wanted(name):
+                queryset = queryset.select_related(relation)
+        for name, relation in self.expand_related_fields.items():
+            if wanted(name) and name in expanded:
+                queryset = queryset.select_related(relation)
+        for name, relation in self.prefetch_related_fields.items():
+            if wanted(name):
+                queryset = queryset.prefetch_related(relation)
+        if requested:
+            columns = {
+                field.name for field in queryset.model._meta.concrete_fields
+            }
+            queryset = queryset.only(
+                'pk',
+                *(requested & columns),
+                *self.sparse_required_fields
+            )
+        return queryset
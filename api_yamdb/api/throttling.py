@@ -0,0 +1,121 @@
+import sqlite3
+import threading
+import time
+
+from django.conf import settings
+from rest_framework import throttling
+from rest_framework.settings import api_settings
+
+# Записи, у которых окно уже прошло, удаляются раз в PURGE_EVERY проверок.
+PURGE_EVERY = 1000
+
+CREATE_TABLE = '''
+    CREATE TABLE IF NOT EXISTS throttle (
+        name TEXT PRIMARY KEY,
+        tat REAL NOT NULL
+    )
+'''
+# GCRA: tat — теоретическое время прихода следующего запроса. Запрос
+# разрешён, если после сдвига tat на интервал он опережает текущее время
+# не больше чем на длину окна. Проверка и запись — одна инструкция.
+ACQUIRE = '''
+    INSERT INTO throttle (name, tat) VALUES (:name, :now + :interval)
+    ON CONFLICT (name) DO UPDATE SET tat = max(tat, :now) + :interval
+    WHERE max(tat, :now) + :interval - :now <= :limit
+'''
+
+
+class GCRAStore:
+    """Состояние ограничителя в файле SQLite, общем для процессов хоста."""
+
+    def __init__(self, path):
+        self.path = path
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.calls = 0
+
+    def get_connection(self):
+        connection = getattr(self.local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(
+                self.path, timeout=5, isolation_level=None
+            )
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=OFF')
+            connection.execute(CREATE_TABLE)
+            self.local.connection = connection
+        return connection
+
+    def acquire(self, name, interval, limit):
+        """Возвращает 0, если запрос разрешён, иначе секунды до повтора."""
+        connection = self.get_connection()
+        now = time.time()
+        cursor = connection.execute(ACQUIRE, {
+            'name': name, 'now': now, 'interval': interval, 'limit': limit
+        })
+        self.purge(connection, now)
+        if cursor.rowcount:
+            return 0
+        tat, = connection.execute(
+            'SELECT tat FROM throttle WHERE name = ?', (name,)
+        ).fetchone()
+        return max(tat + interval - limit - now, 0) or interval
+
+    def purge(self, connection, now):
+        with self.lock:
+            self.calls += 1
+            if self.calls % PURGE_EVERY:
+                return
+        connection.execute('DELETE FROM throttle WHERE tat < ?', (now,))
+
+
+stores = {}
+
+
+def get_store():
+    path = settings.API_THROTTLE_DB
+    if path not in stores:
+        stores[path] = GCRAStore(path)
+    return stores[path]
+
+
+class GCRAThrottle(throttling.SimpleRateThrottle):
+    """SimpleRateThrottle на GCRA с общим для воркеров хранилищем.
+
+    Вместо списка отметок времени на ключ хранится одно число. Scope
+    без заданной частоты не ограничивается.
+    """
+
+    def get_rate(self):
+        return api_settings.DEFAULT_THROTTLE_RATES.get(self.scope)
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+        self.delay = get_store().acquire(
+            self.key, self.duration / self.num_requests, self.duration
+        )
+        return not self.delay
+
+    def wait(self):
+        return self.delay
+
+
+class AnonRateThrottle(throttling.AnonRateThrottle, GCRAThrottle):
+    pass
+
+
+class UserRateThrottle(throttling.UserRateThrottle, GCRAThrottle):
+    """Квота авторизованного пользователя; анонимов ограничивает anon."""
+
+    def get_cache_key(self, request, view):
+        if not request.user or not request.user.is_authenticated:
+            return None
+        return super().get_cache_key(request, view)
+
+
+class ScopedRateThrottle(throttling.ScopedRateThrottle, GCRAThrottle):
+    """Квота на маршрут: scope задаётся атрибутом throttle_scope view."""
@@ -8,6 +8,7 @@ from .views import (
     ReviewViewSet,
     CommentViewSet,
     UserViewSet,
+    metrics,
     sign_up,
     token)
 
@@ -34,4 +35,8 @@ urlpatterns = [
         'v1/auth/token/',
         token,
     ),
+    path(
+        'v1/_metrics/',
+        metrics,
+    ),
 ]
@@ -1,26 +1,48 @@
-from django.db.models import Avg
 from django.db import IntegrityError
-from django.shortcuts import get_object_or_404
-from django.core.mail import send_mail
+from django.http import Http404
 from django.contrib.auth import tokens
 from django.conf import settings
+from django.utils import timezone
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework import filters, viewsets, status, mixins
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.permissions import (
     AllowAny, IsAuthenticated, IsAuthenticatedOrReadOnly
 )
 from rest_framework.decorators import api_view, permission_classes, action
+from rest_framework.generics import get_object_or_404
 from rest_framework.response import Response
-from rest_framework.throttling import AnonRateThrottle
 
+from users.models import CustomUser
+from users.outbox import enqueue
+from reviews.models import (
+    Comment,
+    Review,
+    Title,
+    Genre,
+    Category
+)
+from reviews.search import index_titles
+from reviews.stats import get_title_stats, refresh_trending
+
+from .authentication import get_access_token, is_detached
+from .bulk import BulkWriteMixin
+from .cache import (
+    CachedListMixin, ConditionalGetMixin, clear_stats, get_cache, get_stats,
+    invalidate
+)
+from .filters import TitleGenreFilter
+from .metrics import connection_stats, registry
+from .pagination import (
+    OptionalCursorPagination,
+    TopCursorPagination,
+    TrendingCursorPagination
+)
 from .permissions import (
     IsAdminOrReadOnly,
     IsAdminOrReadOnlyForGenresTitlesCat,
     IsAdmin,
     IsAuthorOrAdminOrModerReadOnly)
-from .filters import TitleGenreFilter
 from .serializers import (
     GenreSerializer,
     TitleSerializer,
@@ -31,15 +53,18 @@ from .serializers import (
     ReviewSerializer,
     CommentSerializer,
     CategorySerializer,
-    TitleCreateSerializer
-)
-from users.models import CustomUser
-from reviews.models import (
-    Review,
-    Title,
-    Genre,
-    Category
+    CategoryBulkSerializer,
+    GenreBulkSerializer,
+    TitleBulkCreateSerializer,
+    TitleBulkUpdateSerializer,
+    TitleCreateSerializer,
+    TitleRankSerializer,
+    TitleStatsQuerySerializer
 )
+from .sparse import SparseQuerySetMixin
+
+# Отметка о ежедневном пересчёте trending живёт дольше суток.
+TRENDING_REFRESH_TIMEOUT = 2 * 24 * 60 * 60
 
 
 class ListCreateDeleteViewSet(
@@ -54,82 +79,204 @@ class ListCreateDeleteViewSet(
     search_fields = ('=name',)
 
 
-class GenreViewSet(ListCreateDeleteViewSet):
+class GenreViewSet(BulkWriteMixin, SparseQuerySetMixin, ConditionalGetMixin,
+                   CachedListMixin, ListCreateDeleteViewSet):
     queryset = Genre.objects.all().order_by('name')
     serializer_class = GenreSerializer
     permission_classes = (IsAdminOrReadOnly,)
+    cache_namespace = 'genres'
+    throttle_scope = 'genres'
+    bulk_create_serializer_class = GenreBulkSerializer
+    bulk_invalidated = ('genres',)
 
 
-class TitleViewSet(viewsets.ModelViewSet):
-    queryset = Title.objects.annotate(
-        rating=Avg('reviews__score')
-    )
+class TitleViewSet(BulkWriteMixin, SparseQuerySetMixin, ConditionalGetMixin,
+                   CachedListMixin, viewsets.ModelViewSet):
+    queryset = Title.objects.all()
+    select_related_fields = {'category': 'category'}
+    prefetch_related_fields = {'genre': 'genre'}
+    # Ключи курсорной пагинации top/ и trending/.
+    sparse_required_fields = ('weighted_rating', 'trending')
     permission_classes = (IsAdminOrReadOnly,)
     pagination_class = PageNumberPagination
     filter_backends = (DjangoFilterBackend,)
     filterset_class = TitleGenreFilter
+    cache_namespace = 'titles'
+    throttle_scope = 'titles'
+    bulk_create_serializer_class = TitleBulkCreateSerializer
+    bulk_update_serializer_class = TitleBulkUpdateSerializer
+    bulk_invalidated = ('titles',)
 
     def get_serializer_class(self):
         if self.action == 'create' or self.action == 'partial_update':
             return TitleCreateSerializer
+        if self.action in ('top', 'trending'):
+            return TitleRankSerializer
         return TitleSerializer
 
+    def perform_bulk_write(self, titles):
+        index_titles(titles)
+
+    def get_etag_namespace(self):
+        if self.action == 'stats':
+            return f'stats:{self.kwargs["pk"]}'
+        if self.action == 'trending':
+            return 'trending'
+        return super().get_etag_namespace()
+
+    @action(methods=('GET',), detail=True)
+    def stats(self, request, pk):
+        return self.conditional_response(request, self.get_stats, pk)
+
+    def get_stats(self, request, pk):
+        query = TitleStatsQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        title = get_object_or_404(
+            Title.objects.only('reviews_count', 'rating'), pk=pk
+        )
+        return Response(get_title_stats(title, **query.validated_data))
+
+    @action(methods=('GET',), detail=False,
+            serializer_class=TitleRankSerializer,
+            pagination_class=TopCursorPagination)
+    def top(self, request):
+        return self.conditional_response(
+            request, self.get_ranking, weighted_rating__isnull=False
+        )
+
+    @action(methods=('GET',), detail=False,
+            serializer_class=TitleRankSerializer,
+            pagination_class=TrendingCursorPagination)
+    def trending(self, request):
+        # Дни, вышедшие из окна, вычитаются при первом запросе за сутки.
+        if get_cache().add(f'trending:{timezone.localdate()}', True,
+                           timeout=TRENDING_REFRESH_TIMEOUT):
+            refresh_trending()
+            invalidate('trending')
+        return self.conditional_response(
+            request, self.get_ranking, trending__gt=0
+        )
+
+    def get_ranking(self, request, **filters):
+        queryset = self.filter_queryset(self.get_queryset().filter(**filters))
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
 
-class CategoriesViewSet(ListCreateDeleteViewSet):
+
+class CategoriesViewSet(BulkWriteMixin, SparseQuerySetMixin,
+                        ConditionalGetMixin, CachedListMixin,
+                        ListCreateDeleteViewSet):
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
     permission_classes = (IsAdminOrReadOnlyForGenresTitlesCat,)
-    throttle_classes = (AnonRateThrottle,)
+    cache_namespace = 'categories'
+    bulk_create_serializer_class = CategoryBulkSerializer
+    bulk_invalidated = ('categories',)
+    throttle_scope = 'categories'
+
+
+class NestedListMixin:
+    """Вложенный список, отфильтрованный по родителю без его загрузки.
 
+    Существование родителя проверяется только для пустой выборки
+    и при создании объекта, не чаще одного раза за запрос.
+    """
 
-class ReviewViewSet(viewsets.ModelViewSet):
+    parent_model = None
+    parent_lookups = {}
+
+    def get_parent(self):
+        if not hasattr(self, '_parent'):
+            self._parent = get_object_or_404(
+                self.parent_model,
+                **{
+                    field: self.kwargs[kwarg]
+                    for field, kwarg in self.parent_lookups.items()
+                }
+            )
+        return self._parent
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        objects = queryset if page is None else page
+        if not objects:
+            self.get_parent()
+        serializer = self.get_serializer(objects, many=True)
+        if page is None:
+            return Response(serializer.data)
+        return self.get_paginated_response(serializer.data)
+
+
+class ReviewViewSet(SparseQuerySetMixin, ConditionalGetMixin,
+                    NestedListMixin, viewsets.ModelViewSet):
     serializer_class = ReviewSerializer
     permission_classes = (
         IsAuthorOrAdminOrModerReadOnly,
         IsAuthenticatedOrReadOnly
     )
-    pagination_class = PageNumberPagination
-    throttle_classes = (AnonRateThrottle,)
+    pagination_class = OptionalCursorPagination
+    throttle_scope = 'reviews'
+    # Отзывы удалённого произведения сбрасываются одной записью.
+    etag_related_namespaces = ('authors', 'title:{title_id}')
     filter_backends = (filters.OrderingFilter,)
     ordering_fields = ('pub_date',)
+    parent_model = Title
+    parent_lookups = {'id': 'title_id'}
+    select_related_fields = {'author': 'author'}
+    sparse_required_fields = ('pub_date',)
+
+    def get_etag_namespace(self):
+        return f'reviews:{self.kwargs["title_id"]}'
 
     def get_queryset(self):
-        title = get_object_or_404(Title, id=self.kwargs['title_id'])
-        return title.reviews.all()
+        return self.get_sparse_queryset(
+            Review.objects.filter(title_id=self.kwargs['title_id'])
+        )
 
     def perform_create(self, serializer):
-        title = get_object_or_404(Title, id=self.kwargs['title_id'])
-        serializer.save(author=self.request.user, title=title)
-        return title.reviews.all()
+        try:
+            serializer.save(
+                author=self.request.user,
+                title_id=int(self.kwargs['title_id'])
+            )
+        except Title.DoesNotExist:
+            raise Http404
 
 
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(SparseQuerySetMixin, ConditionalGetMixin,
+                     NestedListMixin, viewsets.ModelViewSet):
     serializer_class = CommentSerializer
     permission_classes = (
         IsAuthorOrAdminOrModerReadOnly,
         IsAuthenticatedOrReadOnly
     )
-    pagination_class = PageNumberPagination
-    throttle_classes = (AnonRateThrottle,)
+    pagination_class = OptionalCursorPagination
+    throttle_scope = 'comments'
+    etag_related_namespaces = ('authors', 'title:{title_id}')
     filter_backends = (filters.OrderingFilter,)
     ordering_fields = ('pub_date',)
+    parent_model = Review
+    parent_lookups = {'id': 'review_id', 'title': 'title_id'}
+    select_related_fields = {'author': 'author'}
+    sparse_required_fields = ('pub_date',)
+
+    def get_etag_namespace(self):
+        return f'comments:{self.kwargs["review_id"]}'
 
     def get_queryset(self):
-        review = get_object_or_404(Review,
-                                   id=self.kwargs['review_id'],
-                                   title=self.kwargs['title_id'])
-        return review.comments.all()
+        return self.get_sparse_queryset(Comment.objects.filter(
+            review_id=self.kwargs['review_id'],
+            review__title_id=self.kwargs['title_id']
+        ))
 
     def perform_create(self, serializer):
-        review = get_object_or_404(Review,
-                                   id=self.kwargs['review_id'],
-                                   title=self.kwargs['title_id'])
-        serializer.save(author=self.request.user,
-                        review=review)
-        return review.comments.all()
+        serializer.save(author=self.request.user, review=self.get_parent())
 
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(SparseQuerySetMixin, ConditionalGetMixin,
+                  viewsets.ModelViewSet):
     queryset = CustomUser.objects.all().order_by('username')
     serializer_class = UserSerializer
     lookup_field = 'username'
@@ -137,6 +284,9 @@ class UserViewSet(viewsets.ModelViewSet):
     permission_classes = (IsAdmin,)
     filter_backends = (filters.SearchFilter,)
     search_fields = ('=username',)
+    cache_namespace = 'users'
+    throttle_scope = 'users'
+    etag_vary_on_user = True
 
     @action(
         methods=('GET', 'PATCH',),
@@ -147,10 +297,9 @@ class UserViewSet(viewsets.ModelViewSet):
     )
     def me(self, request):
         if request.method == 'GET':
-            serializer = self.get_serializer(request.user)
-            return Response(serializer.data)
+            return self.conditional_response(request, self.get_account)
         serializer = self.get_serializer(
-            request.user,
+            self.get_account_user(request),
             data=request.data, partial=True
         )
         serializer.is_valid(raise_exception=True)
@@ -159,6 +308,16 @@ class UserViewSet(viewsets.ModelViewSet):
             serializer.data,
             status=status.HTTP_200_OK)
 
+    def get_account(self, request):
+        return Response(
+            self.get_serializer(self.get_account_user(request)).data
+        )
+
+    def get_account_user(self, request):
+        if is_detached(request.user):
+            return get_object_or_404(CustomUser, pk=request.user.pk)
+        return request.user
+
 
 @api_view(['POST'])
 @permission_classes((AllowAny,))
@@ -173,8 +332,7 @@ def token(request):
         confirmation_code
     ):
         return Response(status=status.HTTP_400_BAD_REQUEST)
-    refresh = RefreshToken.for_user(user)
-    return Response({'token': str(refresh.access_token)},
+    return Response({'token': str(get_access_token(user))},
                     status=status.HTTP_200_OK)
 
 
@@ -194,11 +352,28 @@ def sign_up(request):
         )
     except IntegrityError:
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
-    send_mail(
+    enqueue(
         subject='Код подтверждения доступа Yamdb',
         message=f'Код подтверждения доступа: {confirmation_code}',
         from_email=settings.EMAIL,
-        recipient_list=(email,))
+        recipient=email)
     return Response(
         serializer.data,
         status=status.HTTP_200_OK)
+
+
+@api_view(['GET', 'DELETE'])
+@permission_classes((IsAdmin,))
+def metrics(request):
+    if request.method == 'DELETE':
+        registry.clear()
+        connection_stats.clear()
+        clear_stats()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+    return Response(
+        {
+            **registry.export(),
+            'cache': get_stats(),
+            'connections': connection_stats.export(),
+        },
+        status=status.HTTP_200_OK)
@@ -1,7 +1,10 @@
 import os
 
-from django.core.asgi import get_asgi_application
-
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
 
+try:
+    from django.core.asgi import get_asgi_application
+except ImportError:
+    from api_yamdb.asgi_threads import get_asgi_application
+
 application = get_asgi_application()
@@ -0,0 +1,57 @@
+"""ASGI для Django 2.2, который не умеет ASGI сам.
+
+WSGI-приложение выполняется в пуле потоков, а цикл событий
+держит открытые соединения с клиентами.
+"""
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.wsgi import WsgiToAsgi
+from django.core.wsgi import get_wsgi_application
+
+# Число одновременно обрабатываемых запросов в одном процессе.
+# Каждый поток держит своё соединение с базой.
+THREADS = int(os.getenv('ASGI_THREADS', default=20))
+
+
+def closing(wsgi_application):
+    """Закрывает ответ в потоке запроса.
+
+    WsgiToAsgi не вызывает close(), из-за чего не срабатывает
+    request_finished и не закрываются соединения с базой.
+    """
+    def application(environ, start_response):
+        response = wsgi_application(environ, start_response)
+        try:
+            return [b''.join(response)]
+        finally:
+            if hasattr(response, 'close'):
+                response.close()
+    return application
+
+
+class ThreadPoolWsgiToAsgi(WsgiToAsgi):
+    executor = None
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self.lifespan(receive, send)
+            return
+        if self.executor is None:
+            type(self).executor = ThreadPoolExecutor(
+                max_workers=THREADS, thread_name_prefix='asgi'
+            )
+            asyncio.get_event_loop().set_default_executor(self.executor)
+        await super().__call__(scope, receive, send)
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            await send({'type': f'{message["type"]}.complete'})
+            if message['type'] == 'lifespan.shutdown':
+                return
+
+
+def get_asgi_application():
+    return ThreadPoolWsgiToAsgi(closing(get_wsgi_application()))
@@ -1,4 +1,5 @@
 import os
+import tempfile
 from datetime import timedelta
 
 from dotenv import load_dotenv
@@ -32,11 +33,12 @@ INSTALLED_APPS = [
     'rest_framework',
     'rest_framework_simplejwt',
     'django_filters',
-    'api',
-    'reviews',
+    'api.apps.ApiConfig',
+    'reviews.apps.ReviewsConfig',
 ]
 
 MIDDLEWARE = [
+    'api.metrics.RequestMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -84,12 +86,85 @@ DATABASES = {
 
         'HOST': os.getenv('DB_HOST', default='db'),
 
-        'PORT': os.getenv('DB_PORT', default='5432')
+        'PORT': os.getenv('DB_PORT', default='5432'),
+
+        # Время жизни соединения в секундах: 0 — новое соединение
+        # на каждый запрос, пусто — без ограничения.
+        'CONN_MAX_AGE': (
+            int(os.getenv('DB_CONN_MAX_AGE', default=60))
+            if os.getenv('DB_CONN_MAX_AGE') != '' else None
+        ),
+
+        # Нужно при работе через PgBouncer в режиме transaction.
+        'DISABLE_SERVER_SIDE_CURSORS': os.getenv(
+            'DB_DISABLE_SERVER_SIDE_CURSORS', default='0'
+        ) == '1',
 
     }
 
 }
 
+# Проверять переиспользуемое соединение, простоявшее дольше стольких
+# секунд; пусто — не проверять. Соединения с ошибками Django закрывает сам.
+DB_CONN_HEALTH_CHECK_INTERVAL = (
+    float(os.environ['DB_CONN_HEALTH_CHECK_INTERVAL'])
+    if os.getenv('DB_CONN_HEALTH_CHECK_INTERVAL') else None
+)
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    # Версии пространств имён и ответы должны быть общими для всех
+    # воркеров и команд (import_csv, generate_data), поэтому по умолчанию
+    # кэш лежит в файлах; LocMemCache годится только для одного процесса.
+    'api': {
+        'BACKEND': os.getenv(
+            'API_CACHE_BACKEND',
+            default='django.core.cache.backends.filebased.FileBasedCache'
+        ),
+        'LOCATION': os.getenv(
+            'API_CACHE_LOCATION',
+            default=os.path.join(tempfile.gettempdir(), 'yamdb_api_cache')
+        ),
+        'TIMEOUT': int(os.getenv('API_CACHE_TIMEOUT', default=300)),
+        'OPTIONS': {
+            'MAX_ENTRIES': int(
+                os.getenv('API_CACHE_MAX_ENTRIES', default=10000)
+            ),
+        },
+    },
+}
+
+API_CACHE_ALIAS = 'api'
+
+API_CACHE_NAMESPACES = ('categories', 'genres', 'titles')
+
+API_METRICS_ENABLED = os.getenv('API_METRICS_ENABLED', default='1') == '1'
+
+# Ширина окна гистограмм по маршрутам, минуты.
+API_METRICS_WINDOW = int(os.getenv('API_METRICS_WINDOW', default=15))
+
+# Запросы к базе дольше порога (мс) пишутся в лог api.sql; 0 — выключено.
+API_SLOW_QUERY_MS = float(os.getenv('API_SLOW_QUERY_MS', default=200))
+
+# Наибольшее число объектов в одном запросе к bulk/.
+API_BULK_LIMIT = int(os.getenv('API_BULK_LIMIT', default=1000))
+
+# Сглаживание рейтинга для таблицы лидеров: отзывов до полного веса
+# собственных оценок и априорная оценка произведения без отзывов.
+LEADERBOARD_MIN_REVIEWS = int(
+    os.getenv('LEADERBOARD_MIN_REVIEWS', default=10)
+)
+LEADERBOARD_PRIOR_SCORE = float(
+    os.getenv('LEADERBOARD_PRIOR_SCORE', default=5.5)
+)
+
+# Окно «популярного сейчас», дни.
+LEADERBOARD_TRENDING_DAYS = int(
+    os.getenv('LEADERBOARD_TRENDING_DAYS', default=7)
+)
+
 # Password validation
 
 AUTH_PASSWORD_VALIDATORS = [
@@ -131,14 +206,67 @@ MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
 AUTH_USER_MODEL = 'users.CustomUser'
 
+# db — пользователь читается из базы на каждый запрос, cached — кэшируется
+# в памяти процесса, stateless — собирается из утверждений access-токена.
+API_AUTHENTICATION_CLASSES = {
+    'db': 'rest_framework_simplejwt.authentication.JWTAuthentication',
+    'cached': 'api.authentication.CachedJWTAuthentication',
+    'stateless': 'api.authentication.StatelessJWTAuthentication',
+}
+
+API_AUTH_CACHE_SIZE = int(os.getenv('API_AUTH_CACHE_SIZE', default=1000))
+API_AUTH_CACHE_TTL = int(os.getenv('API_AUTH_CACHE_TTL', default=30))
+
+# Частоты в формате DRF (100/min); пустая строка — без ограничения.
+# Квоты маршрутов задаются списком scope=частота через запятую,
+# например reviews=30/min,comments=60/min.
+API_THROTTLE_RATES = {
+    'anon': os.getenv('API_THROTTLE_ANON') or None,
+    'user': os.getenv('API_THROTTLE_USER') or None,
+    **dict(
+        item.strip().split('=', 1)
+        for item in os.getenv('API_THROTTLE_SCOPES', default='').split(',')
+        if item.strip()
+    ),
+}
+# Файл SQLite с состоянием ограничителя, общий для воркеров одного хоста.
+API_THROTTLE_DB = os.getenv(
+    'API_THROTTLE_DB',
+    default=os.path.join(tempfile.gettempdir(), 'yamdb_throttle.sqlite3')
+)
+
 REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
 
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        API_AUTHENTICATION_CLASSES[os.getenv('API_AUTH_MODE', default='db')],
     ],
+    # Без пакета orjson классы api.renderers работают на стандартном json.
+    'DEFAULT_RENDERER_CLASSES': [
+        os.getenv(
+            'API_JSON_RENDERER', default='api.renderers.FastJSONRenderer'
+        ),
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        os.getenv('API_JSON_PARSER', default='api.renderers.FastJSONParser'),
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+    'DEFAULT_THROTTLE_CLASSES': [
+        'api.throttling.AnonRateThrottle',
+        'api.throttling.UserRateThrottle',
+        'api.throttling.ScopedRateThrottle',
+    ],
+    'DEFAULT_THROTTLE_RATES': API_THROTTLE_RATES,
+    # Число прокси перед приложением: адрес клиента для квот берётся
+    # из X-Forwarded-For.
+    'NUM_PROXIES': (
+        int(os.getenv('API_NUM_PROXIES'))
+        if os.getenv('API_NUM_PROXIES') else None
+    ),
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 5,
 }
@@ -149,3 +277,17 @@ SIMPLE_JWT = {
 }
 
 EMAIL = os.getenv('EMAIL_ADRESS')
+
+EMAIL_BACKEND = os.getenv(
+    'EMAIL_BACKEND', default='django.core.mail.backends.smtp.EmailBackend'
+)
+
+# Очередь писем users.OutgoingEmail разбирает команда send_outbox.
+EMAIL_OUTBOX_MAX_ATTEMPTS = int(
+    os.getenv('EMAIL_OUTBOX_MAX_ATTEMPTS', default=5)
+)
+EMAIL_OUTBOX_BACKOFF = int(os.getenv('EMAIL_OUTBOX_BACKOFF', default=60))
+EMAIL_OUTBOX_MAX_BACKOFF = int(
+    os.getenv('EMAIL_OUTBOX_MAX_BACKOFF', default=3600)
+)
+EMAIL_OUTBOX_INTERVAL = float(os.getenv('EMAIL_OUTBOX_INTERVAL', default=5))
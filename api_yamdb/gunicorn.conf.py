@@ -0,0 +1,10 @@
+import os
+
+# Настройки gunicorn из окружения. Режим ASGI:
+# SERVER_APPLICATION=api_yamdb.asgi:application
+# GUNICORN_WORKER_CLASS=uvicorn.workers.UvicornH11Worker
+bind = os.getenv('GUNICORN_BIND', default='0:8000')
+workers = int(os.getenv('GUNICORN_WORKERS', default=1))
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', default='sync')
+threads = int(os.getenv('GUNICORN_THREADS', default=1))
+timeout = int(os.getenv('GUNICORN_TIMEOUT', default=30))
@@ -20,7 +20,8 @@ class GenreAdmin(admin.ModelAdmin):
 @admin.register(Title)
 class TitleAdmin(admin.ModelAdmin):
     list_display = ('pk', 'name', 'year',
-                    'description', 'category')
+                    'description', 'category', 'rating', 'reviews_count')
+    readonly_fields = ('rating', 'reviews_count', 'score_sum')
     search_fields = ('name',)
     list_filter = ('year',)
     list_editable = ('category',)
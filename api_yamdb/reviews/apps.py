@@ -1,5 +1,8 @@
 from django.apps import AppConfig
 
 
-class ReviewConfig(AppConfig):
-    name = 'review'
+class ReviewsConfig(AppConfig):
+    name = 'reviews'
+
+    def ready(self):
+        from . import signals  # noqa: F401
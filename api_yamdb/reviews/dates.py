@@ -0,0 +1,23 @@
+from contextlib import contextmanager
+
+from django.utils.dateparse import parse_datetime
+
+
+@contextmanager
+def keep_pub_date(*models):
+    """Не даёт auto_now_add перезаписать заданные даты публикации."""
+    fields = [model._meta.get_field('pub_date') for model in models]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+def parse_pub_date(value):
+    pub_date = parse_datetime(value)
+    if pub_date is None:
+        raise ValueError(f'некорректная дата {value!r}')
+    return pub_date
@@ -0,0 +1,342 @@
+import multiprocessing
+import random
+from bisect import bisect_right
+from datetime import datetime, timedelta
+from itertools import accumulate, islice
+
+from django.core.management.color import no_style
+from django.db import connection, connections, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from users.models import CustomUser
+
+from .dates import keep_pub_date
+from .models import Category, Comment, Genre, Review, Title
+from .search import rebuild_index
+from .stats import rebuild_stats
+
+WORDS = (
+    'побег', 'шоушенк', 'зелёная', 'миля', 'крёстный', 'отец', 'тёмный',
+    'рыцарь', 'властелин', 'колец', 'бойцовский', 'клуб', 'форрест', 'гамп',
+    'начало', 'матрица', 'интерстеллар', 'леон', 'гладиатор', 'престиж',
+    'одержимость', 'паразиты', 'джокер', 'остров', 'проклятых', 'жизнь',
+    'прекрасна', 'список', 'шиндлера', 'унесённые', 'призраками', 'тишина',
+)
+# Отзывы и комментарии датируются в пределах HISTORY до опорной даты,
+# которая выбирается по зерну в пределах года после EPOCH.
+EPOCH = datetime(2020, 1, 1, tzinfo=timezone.utc)
+HISTORY = timedelta(days=3 * 365)
+
+# План генерации для рабочих процессов.
+plan = None
+
+
+def next_pk(model):
+    return (model.objects.aggregate(last=Max('pk'))['last'] or 0) + 1
+
+
+def save(model, objects, batch_size):
+    objects = iter(objects)
+    created = 0
+    while True:
+        chunk = list(islice(objects, batch_size))
+        if not chunk:
+            return created
+        with transaction.atomic():
+            model.objects.bulk_create(chunk)
+        created += len(chunk)
+
+
+def allocate(total, weights, cap):
+    """Делит total пропорционально весам, не больше cap на элемент."""
+    if total > cap * len(weights):
+        raise ValueError(
+            'Пользователей слишком мало: к одному произведению нельзя '
+            'оставить больше отзывов, чем есть авторов.'
+        )
+    counts = [0] * len(weights)
+    active = list(range(len(weights)))
+    remaining = total
+    while remaining:
+        weight = sum(weights[index] for index in active)
+        added = 0
+        for index in active:
+            share = min(
+                cap - counts[index],
+                int(remaining * weights[index] / weight)
+            )
+            counts[index] += share
+            added += share
+        remaining -= added
+        active = [index for index in active if counts[index] < cap]
+        if not added:
+            # Остаток меньше числа произведений: по одному самым весомым.
+            for index in sorted(active, key=lambda i: -weights[i])[
+                :remaining
+            ]:
+                counts[index] += 1
+            remaining = 0
+    return counts
+
+
+def split(counts, batch_size):
+    """Границы отрезков подряд идущих элементов примерно по batch_size."""
+    bounds = []
+    start = rows = 0
+    for index, count in enumerate(counts):
+        rows += count
+        if rows >= batch_size:
+            bounds.append((start, index + 1))
+            start, rows = index + 1, 0
+    if start < len(counts):
+        bounds.append((start, len(counts)))
+    return bounds
+
+
+def get_rng(kind, start):
+    # Своё зерно у каждого пакета: результат не зависит от числа
+    # процессов и порядка выполнения пакетов.
+    return random.Random(f'{plan["seed"]}:{kind}:{start}')
+
+
+def get_text(rng, low, high):
+    return ' '.join(rng.choice(WORDS) for _ in range(rng.randint(low, high)))
+
+
+def get_pub_date(rng):
+    return plan['until'] - timedelta(
+        seconds=rng.randrange(int(HISTORY.total_seconds()))
+    )
+
+
+def create_users(start, stop):
+    rng = get_rng('users', start)
+    first = plan['users'].start
+    return save(CustomUser, (
+        CustomUser(
+            id=first + index,
+            username=f'user{first + index}',
+            email=f'user{first + index}@yamdb.fake',
+            bio=get_text(rng, 0, 10)
+        )
+        for index in range(start, stop)
+    ), plan['batch_size'])
+
+
+def create_titles(start, stop):
+    rng = get_rng('titles', start)
+    first = plan['titles'].start
+    titles = [
+        Title(
+            id=first + index,
+            name=get_text(rng, 1, 4),
+            year=rng.randint(1900, plan['until'].year),
+            category_id=rng.choice(plan['categories']),
+            description=get_text(rng, 5, 30)
+        )
+        for index in range(start, stop)
+    ]
+    genres = plan['genres']
+    links = [
+        Title.genre.through(title_id=title.pk, genre_id=genre)
+        for title in titles
+        for genre in rng.sample(genres, rng.randint(1, min(3, len(genres))))
+    ]
+    save(Title, titles, plan['batch_size'])
+    save(Title.genre.through, links, plan['batch_size'])
+    return len(titles)
+
+
+def create_reviews(start, stop):
+    rng = get_rng('reviews', start)
+    users = plan['users']
+
+    def build():
+        for index in range(start, stop):
+            title_id = plan['titles'].start + index
+            count = plan['counts'][index]
+            # Одна лишняя выборка на случай совпадения автора с id
+            # произведения (ограничение author_not_title_again).
+            authors = [
+                author for author in rng.sample(
+                    users, min(count + 1, len(users))
+                ) if author != title_id
+            ][:count]
+            # Оценки группируются вокруг «качества» произведения.
+            quality = rng.uniform(3, 9)
+            for offset, author in enumerate(authors):
+                yield Review(
+                    id=plan['review_starts'][index] + offset,
+                    title_id=title_id,
+                    author_id=author,
+                    text=get_text(rng, 5, 40),
+                    score=min(10, max(1, round(rng.gauss(quality, 1.5)))),
+                    pub_date=get_pub_date(rng)
+                )
+
+    return save(Review, build(), plan['batch_size'])
+
+
+def create_comments(start, stop):
+    rng = get_rng('comments', start)
+    review_starts = plan['review_starts']
+    first_review = review_starts[0]
+
+    def build():
+        # Комментарии распределяются равномерно по отзывам, поэтому
+        # популярные произведения получают их пропорционально больше.
+        for index in range(start, stop):
+            review = first_review + rng.randrange(plan['reviews'])
+            yield Comment(
+                id=plan['comments'].start + index,
+                review_id=review,
+                title_id=plan['titles'].start + bisect_right(
+                    review_starts, review
+                ) - 1,
+                author_id=rng.choice(plan['users']),
+                text=get_text(rng, 3, 20),
+                pub_date=get_pub_date(rng)
+            )
+
+    return save(Comment, build(), plan['batch_size'])
+
+
+TASKS = {
+    'users': create_users,
+    'titles': create_titles,
+    'reviews': create_reviews,
+    'comments': create_comments,
+}
+
+
+def set_plan(value):
+    global plan
+    plan = value
+
+
+def run_task(task):
+    kind, start, stop = task
+    with keep_pub_date(Review, Comment):
+        return TASKS[kind](start, stop)
+
+
+class CatalogGenerator:
+    """Пакетно создаёт детерминированный синтетический каталог.
+
+    Одинаковые seed и размеры дают одинаковые данные, поэтому
+    результаты замеров на разных машинах сопоставимы. Число отзывов
+    к произведениям распределено по закону Ципфа с показателем skew:
+    несколько произведений получают огромное число отзывов. Даты
+    публикации отсчитываются назад от until, по умолчанию выводимой
+    из seed. Кэш ответов API не сбрасывается: это делает вызывающий код.
+    """
+
+    def __init__(self, seed=1, batch_size=1000, workers=1, skew=1.0,
+                 until=None, log=None):
+        self.seed = seed
+        self.batch_size = batch_size
+        self.workers = workers
+        self.skew = skew
+        self.until = until
+        self.log = log or (lambda message: None)
+
+    def generate(self, users, titles, reviews, comments, categories=10,
+                 genres=20):
+        self.workers = self.get_workers()
+        rng = random.Random(self.seed)
+        # Популярность не совпадает с порядком id произведений.
+        ranks = list(range(titles))
+        rng.shuffle(ranks)
+        counts = allocate(
+            reviews,
+            [1 / (rank + 1) ** self.skew for rank in ranks],
+            max(users - 1, 0)
+        )
+        first_review = next_pk(Review)
+        # Первый id отзыва каждого произведения.
+        starts = [
+            first_review + total - count
+            for total, count in zip(accumulate(counts), counts)
+        ]
+        until = EPOCH + timedelta(days=rng.randrange(365))
+        if self.until is not None:
+            until = self.until
+        user_start = next_pk(CustomUser)
+        title_start = next_pk(Title)
+        comment_start = next_pk(Comment)
+        set_plan({
+            'seed': self.seed,
+            'batch_size': self.batch_size,
+            'until': until,
+            'categories': self.create_slugged(Category, categories),
+            'genres': self.create_slugged(Genre, genres),
+            'users': range(user_start, user_start + users),
+            'titles': range(title_start, title_start + titles),
+            'comments': range(comment_start, comment_start + comments),
+            'counts': counts,
+            'review_starts': starts,
+            'reviews': reviews,
+        })
+        created = {}
+        for kind, sizes in (
+            ('users', [1] * users),
+            ('titles', [1] * titles),
+            ('reviews', counts),
+            ('comments', [1] * comments if reviews else []),
+        ):
+            created[kind] = self.run(kind, sizes)
+        self.finish()
+        return created
+
+    def create_slugged(self, model, count):
+        existing = list(model.objects.values_list('pk', flat=True))
+        if existing:
+            return existing
+        prefix = model._meta.model_name
+        save(model, (
+            model(id=pk, name=f'{prefix} {pk}', slug=f'{prefix}-{pk}')
+            for pk in range(1, count + 1)
+        ), self.batch_size)
+        return list(range(1, count + 1))
+
+    def get_workers(self):
+        if connection.vendor == 'sqlite' and self.workers > 1:
+            self.log('SQLite не поддерживает параллельную запись, '
+                     'данные пишутся в один процесс.')
+            return 1
+        return self.workers
+
+    def run(self, kind, counts):
+        tasks = [
+            (kind, start, stop)
+            for start, stop in split(counts, self.batch_size)
+        ]
+        if self.workers <= 1:
+            created = sum(map(run_task, tasks))
+        else:
+            # Дочерние процессы открывают собственные соединения.
+            connections.close_all()
+            context = multiprocessing.get_context('fork')
+            with context.Pool(
+                self.workers, initializer=set_plan, initargs=(plan,)
+            ) as pool:
+                created = sum(pool.imap_unordered(run_task, tasks))
+        self.log(f'{kind}: {created}')
+        return created
+
+    def finish(self):
+        sequence_sql = connection.ops.sequence_reset_sql(
+            no_style(), [Category, Genre, CustomUser, Title, Review, Comment]
+        )
+        if sequence_sql:
+            with connection.cursor() as cursor:
+                for sql in sequence_sql:
+                    cursor.execute(sql)
+        titles = plan['titles']
+        titles = Title.objects.filter(
+            pk__gte=titles.start, pk__lt=titles.stop
+        )
+        titles.recalculate_rating()
+        rebuild_index(titles)
+        rebuild_stats(titles)
@@ -0,0 +1,75 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from reviews import search
+from reviews.generator import WORDS
+from reviews.models import Title
+
+
+class Command(BaseCommand):
+    help = ('Сравнивает время поиска icontains и по индексу триграмм '
+            'на каталогах разного размера. Данные откатываются.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes',
+            default='1000,10000,50000',
+            help='Размеры каталога через запятую.'
+        )
+        parser.add_argument(
+            '--queries',
+            type=int,
+            default=20,
+            help='Количество запросов на каждый размер.'
+        )
+        parser.add_argument('--seed', type=int, default=1)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        queries = [
+            rng.choice(WORDS)[1:6] for _ in range(options['queries'])
+        ]
+        self.stdout.write(
+            f'{"размер":>8} {"icontains, мс":>14} {"name, мс":>10} '
+            f'{"search, мс":>11}'
+        )
+        with transaction.atomic():
+            created = 0
+            for size in sorted(map(int, options['sizes'].split(','))):
+                Title.objects.bulk_create(
+                    Title(
+                        name=' '.join(rng.sample(WORDS, 3)),
+                        description=' '.join(rng.sample(WORDS, 12)),
+                        year=rng.randint(1900, 2020)
+                    )
+                    for _ in range(size - created)
+                )
+                created = size
+                search.rebuild_index(
+                    Title.objects.filter(search_tokens__isnull=True)
+                )
+                timings = [
+                    self.measure(queries, lambda q: Title.objects.filter(
+                        name__icontains=q
+                    )),
+                    self.measure(queries, lambda q: search.filter_name(
+                        Title.objects.all(), q
+                    )),
+                    self.measure(queries, lambda q: search.search(
+                        Title.objects.all(), q
+                    )),
+                ]
+                self.stdout.write(
+                    f'{size:>8} {timings[0]:>14.2f} {timings[1]:>10.2f} '
+                    f'{timings[2]:>11.2f}'
+                )
+            transaction.set_rollback(True)
+
+    def measure(self, queries, build):
+        started = time.perf_counter()
+        for query in queries:
+            list(build(query)[:10])
+        return (time.perf_counter() - started) * 1000 / len(queries)
@@ -0,0 +1,132 @@
+import csv
+import json
+import os
+from datetime import datetime, time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from reviews.models import Category, Comment, Genre, Review, Title
+
+# Имена файлов и колонок совпадают с форматом команды import_csv.
+EXPORTS = {
+    'category': (Category, (
+        ('id', 'id'), ('name', 'name'), ('slug', 'slug'),
+    )),
+    'genre': (Genre, (
+        ('id', 'id'), ('name', 'name'), ('slug', 'slug'),
+    )),
+    'titles': (Title, (
+        ('id', 'id'), ('name', 'name'), ('year', 'year'),
+        ('category', 'category_id'), ('description', 'description'),
+    )),
+    'genre_title': (Title.genre.through, (
+        ('id', 'id'), ('title_id', 'title_id'), ('genre_id', 'genre_id'),
+    )),
+    'review': (Review, (
+        ('id', 'id'), ('title_id', 'title_id'), ('text', 'text'),
+        ('author', 'author_id'), ('score', 'score'),
+        ('pub_date', 'pub_date'),
+    )),
+    'comments': (Comment, (
+        ('id', 'id'), ('review_id', 'review_id'), ('text', 'text'),
+        ('author', 'author_id'), ('pub_date', 'pub_date'),
+    )),
+}
+
+
+def parse_since(value):
+    since = parse_datetime(value)
+    if since is None:
+        day = parse_date(value)
+        if day is None:
+            raise CommandError(f'Некорректная дата --since: {value}')
+        since = datetime.combine(day, time.min)
+    if timezone.is_naive(since):
+        return timezone.make_aware(since)
+    return since
+
+
+def to_text(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+class Command(BaseCommand):
+    help = 'Потоково выгружает каталог в JSON Lines или CSV.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'models',
+            nargs='*',
+            metavar='model',
+            help=f'Выгружаемые модели: {", ".join(EXPORTS)}. '
+                 'По умолчанию — все.'
+        )
+        parser.add_argument(
+            '--format',
+            choices=('jsonl', 'csv'),
+            default='jsonl',
+            help='Формат файлов выгрузки.'
+        )
+        parser.add_argument(
+            '--output',
+            default='.',
+            help='Папка для файлов выгрузки.'
+        )
+        parser.add_argument(
+            '--since',
+            help='Выгрузить только отзывы и комментарии, опубликованные '
+                 'начиная с этой даты (YYYY-MM-DD или ISO 8601).'
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=2000,
+            help='Количество строк, читаемых из базы за раз.'
+        )
+
+    def handle(self, *args, **options):
+        unknown = set(options['models']) - set(EXPORTS)
+        if unknown:
+            raise CommandError(
+                f'Неизвестные модели: {", ".join(sorted(unknown))}.'
+            )
+        since = parse_since(options['since']) if options['since'] else None
+        os.makedirs(options['output'], exist_ok=True)
+        for name in options['models'] or EXPORTS:
+            model, columns = EXPORTS[name]
+            queryset = model.objects.order_by('pk')
+            if since is not None and model in (Review, Comment):
+                queryset = queryset.filter(pub_date__gte=since)
+            rows = queryset.values_list(
+                *(field for _, field in columns)
+            ).iterator(chunk_size=options['chunk_size'])
+            path = os.path.join(
+                options['output'], f'{name}.{options["format"]}'
+            )
+            with open(path, 'w', newline='', encoding='utf-8') as file:
+                write = getattr(self, f'write_{options["format"]}')
+                count = write(file, [header for header, _ in columns], rows)
+            self.stdout.write(
+                self.style.SUCCESS(f'{path}: выгружено {count} строк.')
+            )
+
+    def write_jsonl(self, file, headers, rows):
+        count = 0
+        for count, row in enumerate(rows, start=1):
+            file.write(json.dumps(
+                dict(zip(headers, map(to_text, row))), ensure_ascii=False
+            ))
+            file.write('\n')
+        return count
+
+    def write_csv(self, file, headers, rows):
+        writer = csv.writer(file)
+        writer.writerow(headers)
+        count = 0
+        for count, row in enumerate(rows, start=1):
+            writer.writerow(map(to_text, row))
+        return count
@@ -0,0 +1,80 @@
+import time
+from datetime import date, datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from api.cache import invalidate
+from reviews.generator import CatalogGenerator
+
+
+class Command(BaseCommand):
+    help = ('Генерирует детерминированный синтетический каталог '
+            'заданного размера для нагрузочного тестирования.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--categories', type=int, default=10)
+        parser.add_argument('--genres', type=int, default=20)
+        parser.add_argument('--titles', type=int, default=10000)
+        parser.add_argument('--reviews', type=int, default=100000)
+        parser.add_argument('--comments', type=int, default=100000)
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=1,
+            help='Зерно генератора: одинаковое зерно даёт одинаковые данные.'
+        )
+        parser.add_argument(
+            '--until',
+            type=date.fromisoformat,
+            help='Дата ГГГГ-ММ-ДД, к которой относятся самые свежие отзывы. '
+                 'По умолчанию выводится из зерна; для популярного за '
+                 'последние дни укажите сегодняшнюю.'
+        )
+        parser.add_argument(
+            '--skew',
+            type=float,
+            default=1.0,
+            help='Показатель закона Ципфа для числа отзывов к произведениям; '
+                 '0 — равномерно.'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Количество строк в одной транзакции.'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=1,
+            help='Количество процессов, пишущих пакеты параллельно.'
+        )
+
+    def handle(self, *args, **options):
+        generator = CatalogGenerator(
+            seed=options['seed'],
+            batch_size=options['batch_size'],
+            workers=options['workers'],
+            skew=options['skew'],
+            until=options['until'] and timezone.make_aware(
+                datetime.combine(options['until'], datetime.min.time())
+            ),
+            log=self.stdout.write
+        )
+        started = time.monotonic()
+        try:
+            counts = generator.generate(
+                options['users'], options['titles'], options['reviews'],
+                options['comments'], categories=options['categories'],
+                genres=options['genres']
+            )
+        except ValueError as error:
+            raise CommandError(error)
+        invalidate('categories', 'genres', 'titles', 'trending', 'users')
+        self.stdout.write(self.style.SUCCESS(
+            f'Создано за {time.monotonic() - started:.1f} с: ' + ', '.join(
+                f'{name} {count}' for name, count in counts.items()
+            )
+        ))
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from api.cache import invalidate
+from reviews.models import Title
+from reviews.search import rebuild_index
+from reviews.stats import rebuild_stats
+
+
+class Command(BaseCommand):
+    help = ('Пересчитывает сохранённые рейтинги произведений, '
+            'их статистику и поисковый индекс.')
+
+    def handle(self, *args, **kwargs):
+        updated = Title.objects.all().recalculate_rating()
+        self.stdout.write(self.style.SUCCESS(
+            f'Рейтинг пересчитан для {updated} произведений.'
+        ))
+        rebuild_index()
+        self.stdout.write(self.style.SUCCESS('Поисковый индекс перестроен.'))
+        rebuild_stats()
+        self.stdout.write(self.style.SUCCESS(
+            'Статистика произведений пересчитана.'
+        ))
+        # Пересчёт идёт через update() и bulk-операции без сигналов.
+        invalidate('titles', 'trending', *(
+            f'stats:{pk}' for pk in Title.objects.values_list('pk', flat=True)
+        ))
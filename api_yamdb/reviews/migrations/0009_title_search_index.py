@@ -0,0 +1,59 @@
+# Generated by Django 2.2.16 on 2026-10-18 17:56
+
+import re
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+# Копия токенизатора reviews.search на момент миграции: миграция
+# не должна зависеть от последующих изменений кода.
+NON_WORD = re.compile(r'[\W_]+')
+
+
+def normalize(text):
+    return NON_WORD.sub(' ', (text or '').lower().replace('ё', 'е'))
+
+
+def trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def index_titles(apps, schema_editor):
+    Title = apps.get_model('reviews', 'Title')
+    TitleToken = apps.get_model('reviews', 'TitleToken')
+    tokens = []
+    for title in Title.objects.only('name', 'description').iterator():
+        for text, weight in ((title.name, 3), (title.description, 1)):
+            tokens.extend(
+                TitleToken(title_id=title.pk, token=token, weight=weight)
+                for token in trigrams(f' {normalize(text).strip()} ')
+            )
+    TitleToken.objects.bulk_create(tokens, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0008_title_rating'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TitleToken',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('token', models.CharField(max_length=3, verbose_name='Триграмма')),
+                ('weight', models.PositiveSmallIntegerField(verbose_name='Вес')),
+                ('title', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_tokens', to='reviews.Title')),
+            ],
+            options={
+                'verbose_name': 'Триграмма произведения',
+                'verbose_name_plural': 'Поисковый индекс произведений',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='titletoken',
+            constraint=models.UniqueConstraint(fields=('token', 'title', 'weight'), name='unique_title_token'),
+        ),
+        migrations.RunPython(index_titles, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,85 @@
+# Generated by Django 2.2.16 on 2026-10-18 18:14
+
+from django.db import migrations, models
+import django.db.models.deletion
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import TruncDate
+
+
+def fill_stats(apps, schema_editor):
+    Review = apps.get_model('reviews', 'Review')
+    Comment = apps.get_model('reviews', 'Comment')
+    TitleScore = apps.get_model('reviews', 'TitleScore')
+    TitleActivity = apps.get_model('reviews', 'TitleActivity')
+    Comment.objects.filter(title__isnull=True).update(
+        title_id=Subquery(
+            Review.objects.filter(pk=OuterRef('review_id')).values('title_id')
+        )
+    )
+    TitleScore.objects.bulk_create(
+        TitleScore(title_id=row['title'], score=row['score'],
+                   count=row['total'])
+        for row in Review.objects.order_by().values(
+            'title', 'score'
+        ).annotate(total=Count('pk'))
+    )
+    days = {}
+    for kind, model in (('reviews', Review), ('comments', Comment)):
+        for row in model.objects.order_by().annotate(
+            date=TruncDate('pub_date')
+        ).values('title', 'date').annotate(total=Count('pk')):
+            day = days.setdefault(
+                (row['title'], row['date']), {'reviews': 0, 'comments': 0}
+            )
+            day[kind] = row['total']
+    TitleActivity.objects.bulk_create(
+        TitleActivity(title_id=title, date=date, **counts)
+        for (title, date), counts in days.items()
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0010_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TitleScore',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.PositiveSmallIntegerField(verbose_name='Оценка')),
+                ('count', models.PositiveIntegerField(default=0, verbose_name='Количество отзывов')),
+                ('title', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='score_counts', to='reviews.Title')),
+            ],
+            options={
+                'verbose_name': 'Оценки произведения',
+                'verbose_name_plural': 'Гистограммы оценок произведений',
+            },
+        ),
+        migrations.CreateModel(
+            name='TitleActivity',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(verbose_name='День')),
+                ('reviews', models.PositiveIntegerField(default=0, verbose_name='Отзывы')),
+                ('comments', models.PositiveIntegerField(default=0, verbose_name='Комментарии')),
+                ('title', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='activity', to='reviews.Title')),
+            ],
+            options={
+                'verbose_name': 'Активность по произведению',
+                'verbose_name_plural': 'Активность по произведениям',
+                'ordering': ('date',),
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='titlescore',
+            constraint=models.UniqueConstraint(fields=('title', 'score'), name='unique_title_score'),
+        ),
+        migrations.AddConstraint(
+            model_name='titleactivity',
+            constraint=models.UniqueConstraint(fields=('title', 'date'), name='unique_title_activity'),
+        ),
+        migrations.RunPython(fill_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,67 @@
+# Generated by Django 2.2.16 on 2026-10-18 18:17
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import F, FloatField, OuterRef, Subquery, Sum
+from django.db.models.functions import Cast, Coalesce
+from django.utils import timezone
+
+
+def fill_rankings(apps, schema_editor):
+    Title = apps.get_model('reviews', 'Title')
+    TitleActivity = apps.get_model('reviews', 'TitleActivity')
+    weight = settings.LEADERBOARD_MIN_REVIEWS
+    Title.objects.filter(reviews_count__gt=0).update(
+        weighted_rating=(
+            Cast(F('score_sum'), FloatField())
+            + weight * settings.LEADERBOARD_PRIOR_SCORE
+        ) / (F('reviews_count') + weight)
+    )
+    since = timezone.localdate() - timedelta(
+        days=settings.LEADERBOARD_TRENDING_DAYS - 1
+    )
+    activity = TitleActivity.objects.filter(date__gte=since)
+    Title.objects.filter(pk__in=activity.values('title')).update(
+        trending=Coalesce(Subquery(
+            activity.filter(title=OuterRef('pk')).order_by().values(
+                'title'
+            ).annotate(total=Sum(F('reviews') + F('comments'))).values(
+                'total'
+            )
+        ), 0)
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0011_title_stats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='title',
+            name='trending',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Активность за последние дни'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='weighted_rating',
+            field=models.FloatField(blank=True, editable=False, null=True, verbose_name='Взвешенный рейтинг'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['weighted_rating', 'id'], name='title_top_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['category', 'weighted_rating', 'id'], name='title_category_top_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['trending', 'id'], name='title_trending_idx'),
+        ),
+        migrations.RunPython(fill_rankings, migrations.RunPython.noop),
+    ]
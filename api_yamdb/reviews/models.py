@@ -3,6 +3,11 @@ import datetime as dt
 from django.conf import settings
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
+from django.db.models import (
+    Avg, Case, Count, ExpressionWrapper, F, FloatField, OuterRef, Subquery,
+    Sum, Value, When
+)
+from django.db.models.functions import Cast, Coalesce
 
 EVALUATIONS = [
     ('1', '1'),
@@ -60,6 +65,61 @@ class Genre(models.Model):
         return self.name
 
 
+def get_weighted_rating(count, total):
+    """Рейтинг, сглаженный к априорной оценке (байесовское среднее).
+
+    Пока у произведения меньше LEADERBOARD_MIN_REVIEWS отзывов,
+    рейтинг тянется к LEADERBOARD_PRIOR_SCORE, поэтому единственная
+    «десятка» не поднимает произведение на вершину рейтинга.
+    """
+    weight = settings.LEADERBOARD_MIN_REVIEWS
+    return ExpressionWrapper(
+        (Cast(total, FloatField()) + weight * settings.LEADERBOARD_PRIOR_SCORE)
+        / (count + weight),
+        output_field=FloatField()
+    )
+
+
+class TitleQuerySet(models.QuerySet):
+    def apply_review_delta(self, title_id, count, score):
+        new_count = F('reviews_count') + count
+        new_sum = F('score_sum') + score
+        return self.filter(pk=title_id).update(
+            reviews_count=new_count,
+            score_sum=new_sum,
+            rating=Case(
+                When(reviews_count__lte=-count, then=Value(None)),
+                default=ExpressionWrapper(
+                    Cast(new_sum, FloatField()) / new_count,
+                    output_field=FloatField()
+                ),
+                output_field=FloatField()
+            ),
+            weighted_rating=Case(
+                When(reviews_count__lte=-count, then=Value(None)),
+                default=get_weighted_rating(new_count, new_sum),
+                output_field=FloatField()
+            )
+        )
+
+    def recalculate_rating(self):
+        reviews = Review.objects.filter(
+            title=OuterRef('pk')
+        ).order_by().values('title')
+        # Без отзывов подзапросы возвращают NULL, как и рейтинги.
+        count = Subquery(reviews.annotate(total=Count('pk')).values('total'))
+        total = Subquery(reviews.annotate(total=Sum('score')).values('total'))
+        return self.update(
+            reviews_count=Coalesce(count, 0),
+            score_sum=Coalesce(total, 0),
+            rating=Subquery(
+                reviews.annotate(avg=Avg('score')).values('avg'),
+                output_field=FloatField()
+            ),
+            weighted_rating=get_weighted_rating(count, total)
+        )
+
+
 class Title(models.Model):
     name = models.TextField('Название', db_index=True)
     year = models.IntegerField(
@@ -95,12 +155,128 @@ class Title(models.Model):
         null=True,
         blank=True
     )
+    reviews_count = models.PositiveIntegerField(
+        'Количество отзывов',
+        default=0,
+        editable=False
+    )
+    score_sum = models.PositiveIntegerField(
+        'Сумма оценок',
+        default=0,
+        editable=False
+    )
+    rating = models.FloatField(
+        'Рейтинг',
+        null=True,
+        blank=True,
+        editable=False
+    )
+    weighted_rating = models.FloatField(
+        'Взвешенный рейтинг',
+        null=True,
+        blank=True,
+        editable=False
+    )
+    trending = models.PositiveIntegerField(
+        'Активность за последние дни',
+        default=0,
+        editable=False
+    )
+
+    objects = TitleQuerySet.as_manager()
 
     class Meta:
         ordering = ('-year',)
+        indexes = [
+            models.Index(fields=('year',), name='title_year_idx'),
+            models.Index(
+                fields=('category', 'year'), name='title_category_year_idx'
+            ),
+            models.Index(
+                fields=('weighted_rating', 'id'), name='title_top_idx'
+            ),
+            models.Index(
+                fields=('category', 'weighted_rating', 'id'),
+                name='title_category_top_idx'
+            ),
+            models.Index(
+                fields=('trending', 'id'), name='title_trending_idx'
+            ),
+        ]
         verbose_name = 'Название произведения'
         verbose_name_plural = 'Названия произведений'
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_text = (
+            instance.__dict__.get('name'),
+            instance.__dict__.get('description')
+        )
+        return instance
+
+
+class TitleToken(models.Model):
+    NAME_WEIGHT = 3
+    DESCRIPTION_WEIGHT = 1
+
+    title = models.ForeignKey(
+        Title,
+        on_delete=models.CASCADE,
+        related_name='search_tokens'
+    )
+    token = models.CharField('Триграмма', max_length=3)
+    weight = models.PositiveSmallIntegerField('Вес')
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=('token', 'title', 'weight'),
+                name='unique_title_token'),
+        ]
+        verbose_name = 'Триграмма произведения'
+        verbose_name_plural = 'Поисковый индекс произведений'
+
+
+class TitleScore(models.Model):
+    title = models.ForeignKey(
+        Title,
+        on_delete=models.CASCADE,
+        related_name='score_counts'
+    )
+    score = models.PositiveSmallIntegerField('Оценка')
+    count = models.PositiveIntegerField('Количество отзывов', default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=('title', 'score'),
+                name='unique_title_score'),
+        ]
+        verbose_name = 'Оценки произведения'
+        verbose_name_plural = 'Гистограммы оценок произведений'
+
+
+class TitleActivity(models.Model):
+    title = models.ForeignKey(
+        Title,
+        on_delete=models.CASCADE,
+        related_name='activity'
+    )
+    date = models.DateField('День')
+    reviews = models.PositiveIntegerField('Отзывы', default=0)
+    comments = models.PositiveIntegerField('Комментарии', default=0)
+
+    class Meta:
+        ordering = ('date',)
+        constraints = [
+            models.UniqueConstraint(
+                fields=('title', 'date'),
+                name='unique_title_activity'),
+        ]
+        verbose_name = 'Активность по произведению'
+        verbose_name_plural = 'Активность по произведениям'
+
 
 class Review(models.Model):
     text = models.TextField(
@@ -140,6 +316,13 @@ class Review(models.Model):
     class Meta:
         ordering = ('id',)
         db_table = 'review'
+        indexes = [
+            models.Index(fields=('title', 'id'), name='review_title_id_idx'),
+            models.Index(
+                fields=('title', 'pub_date', 'id'),
+                name='review_title_pub_date_idx'
+            ),
+        ]
         constraints = [
             models.UniqueConstraint(
                 fields=('author', 'title',),
@@ -153,6 +336,13 @@ class Review(models.Model):
     def __str__(self):
         return f' Автор: {self.author}. Текст:{self.text[:10]}'
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_score = instance.__dict__.get('score')
+        instance._loaded_title_id = instance.__dict__.get('title_id')
+        return instance
+
 
 class Comment(models.Model):
     title = models.ForeignKey(
@@ -180,5 +370,13 @@ class Comment(models.Model):
         related_name='comments'
     )
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=('review', 'pub_date', 'id'),
+                name='comment_review_pub_date_idx'
+            ),
+        ]
+
     def __str__(self):
         return f'{self.author}: {self.text}'
@@ -0,0 +1,87 @@
+import re
+from math import ceil
+
+from django.db.models import Count, Sum
+
+from .models import Title, TitleToken
+
+NON_WORD = re.compile(r'[\W_]+')
+
+# Доля триграмм запроса, которая должна найтись в произведении.
+SEARCH_THRESHOLD = 0.6
+
+
+def normalize(text):
+    return NON_WORD.sub(' ', (text or '').lower().replace('ё', 'е'))
+
+
+def trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def title_tokens(title):
+    weights = {}
+    for text, weight in (
+        (title.name, TitleToken.NAME_WEIGHT),
+        (title.description, TitleToken.DESCRIPTION_WEIGHT),
+    ):
+        for token in trigrams(f' {normalize(text).strip()} '):
+            weights.setdefault(token, set()).add(weight)
+    return [
+        TitleToken(title_id=title.pk, token=token, weight=weight)
+        for token, token_weights in weights.items()
+        for weight in token_weights
+    ]
+
+
+def index_titles(titles):
+    titles = list(titles)
+    TitleToken.objects.filter(
+        title__in=[title.pk for title in titles]
+    ).delete()
+    TitleToken.objects.bulk_create(
+        token for title in titles for token in title_tokens(title)
+    )
+
+
+def rebuild_index(titles=None, batch_size=500):
+    if titles is None:
+        TitleToken.objects.all().delete()
+        titles = Title.objects.all()
+    pks = list(titles.order_by('pk').values_list('pk', flat=True))
+    for start in range(0, len(pks), batch_size):
+        index_titles(Title.objects.filter(
+            pk__in=pks[start:start + batch_size]
+        ).only('pk', 'name', 'description'))
+
+
+def filter_name(queryset, value):
+    """Аналог name__icontains, сужающий выборку по индексу триграмм."""
+    tokens = trigrams(normalize(value))
+    if tokens:
+        matched = TitleToken.objects.filter(
+            token__in=tokens, weight=TitleToken.NAME_WEIGHT
+        ).values('title').annotate(
+            hits=Count('token')
+        ).filter(hits=len(tokens)).values('title')
+        queryset = queryset.filter(pk__in=matched)
+    return queryset.filter(name__icontains=value)
+
+
+def search(queryset, query):
+    """Ранжированный поиск по названию и описанию.
+
+    Выше оказываются произведения, в которых нашлось больше триграмм
+    запроса, при равенстве — совпадения в названии.
+    """
+    tokens = set()
+    for word in normalize(query).split():
+        tokens |= trigrams(f' {word} ')
+    if not tokens:
+        return queryset.none()
+    return queryset.filter(search_tokens__token__in=tokens).annotate(
+        search_hits=Count('search_tokens__token', distinct=True),
+        search_rank=Sum('search_tokens__weight')
+    ).filter(
+        search_hits__gte=ceil(len(tokens) * SEARCH_THRESHOLD)
+    ).order_by('-search_hits', '-search_rank', 'pk')
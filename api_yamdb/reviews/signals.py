@@ -0,0 +1,145 @@
+import threading
+
+from django.db.models.signals import (
+    post_delete, post_save, pre_delete, pre_save
+)
+from django.dispatch import receiver
+
+from users.models import CustomUser
+
+from .models import Comment, Review, Title
+from .search import index_titles
+from .stats import rebuild_stats, record_activity, record_score
+
+# Произведения, отзывы и комментарии которых удаляются каскадом вместе
+# с произведением или автором. Построчные счётчики для них не
+# обновляются: произведение удаляется целиком, а агрегаты произведений
+# удалённого автора пересчитываются один раз после удаления.
+cascade = threading.local()
+
+
+def get_cascade_titles():
+    if not hasattr(cascade, 'titles'):
+        cascade.titles = set()
+    return cascade.titles
+
+
+def in_cascade(title_id):
+    return title_id in get_cascade_titles()
+
+
+def get_author_titles(user):
+    """Произведения, агрегаты которых изменило удаление автора."""
+    return getattr(user, '_cascade_titles', set())
+
+
+@receiver(pre_delete, sender=Title)
+def start_title_cascade(sender, instance, **kwargs):
+    get_cascade_titles().add(instance.pk)
+
+
+@receiver(post_delete, sender=Title)
+def finish_title_cascade(sender, instance, **kwargs):
+    get_cascade_titles().discard(instance.pk)
+
+
+@receiver(pre_delete, sender=CustomUser)
+def start_author_cascade(sender, instance, **kwargs):
+    titles = set(Review.objects.filter(
+        author=instance
+    ).values_list('title_id', flat=True))
+    titles.update(Comment.objects.filter(
+        author=instance
+    ).values_list('review__title_id', flat=True))
+    instance._cascade_titles = titles
+    get_cascade_titles().update(titles)
+
+
+@receiver(post_delete, sender=CustomUser)
+def finish_author_cascade(sender, instance, **kwargs):
+    # Отзывы и комментарии удаляются раньше автора.
+    titles = get_author_titles(instance)
+    get_cascade_titles().difference_update(titles)
+    if titles:
+        titles = Title.objects.filter(pk__in=titles)
+        titles.recalculate_rating()
+        rebuild_stats(titles)
+
+
+@receiver(post_save, sender=Review)
+def update_rating_on_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    loaded_title_id = getattr(instance, '_loaded_title_id', None)
+    loaded_score = getattr(instance, '_loaded_score', None)
+    if created:
+        # Внешний ключ проверяется только при фиксации транзакции, а
+        # отсутствие произведения видно по числу обновлённых строк.
+        if not Title.objects.apply_review_delta(
+            instance.title_id, 1, instance.score
+        ):
+            raise Title.DoesNotExist(
+                f'Произведение {instance.title_id} не найдено.'
+            )
+        record_score(instance.title_id, instance.score, 1)
+        record_activity(instance.title_id, instance.pub_date, reviews=1)
+    elif loaded_title_id is None or loaded_score is None:
+        titles = Title.objects.filter(pk=instance.title_id)
+        titles.recalculate_rating()
+        rebuild_stats(titles)
+    elif loaded_title_id != instance.title_id:
+        Title.objects.apply_review_delta(loaded_title_id, -1, -loaded_score)
+        Title.objects.apply_review_delta(instance.title_id, 1, instance.score)
+        instance.comments.update(title_id=instance.title_id)
+        rebuild_stats(Title.objects.filter(
+            pk__in=(loaded_title_id, instance.title_id)
+        ))
+    elif loaded_score != instance.score:
+        Title.objects.apply_review_delta(
+            instance.title_id, 0, instance.score - loaded_score
+        )
+        record_score(instance.title_id, loaded_score, -1)
+        record_score(instance.title_id, instance.score, 1)
+    instance._loaded_score = instance.score
+    instance._loaded_title_id = instance.title_id
+
+
+@receiver(post_delete, sender=Review)
+def update_rating_on_delete(sender, instance, **kwargs):
+    if in_cascade(instance.title_id):
+        return
+    score = getattr(instance, '_loaded_score', None)
+    if score is None:
+        score = instance.score
+    Title.objects.apply_review_delta(instance.title_id, -1, -score)
+    record_score(instance.title_id, score, -1)
+    record_activity(instance.title_id, instance.pub_date, reviews=-1)
+
+
+@receiver(pre_save, sender=Comment)
+def set_comment_title(sender, instance, raw=False, **kwargs):
+    if not raw and instance.title_id is None:
+        instance.title_id = instance.review.title_id
+
+
+@receiver(post_save, sender=Comment)
+def update_activity_on_comment(sender, instance, created, raw=False,
+                               **kwargs):
+    if created and not raw:
+        record_activity(instance.title_id, instance.pub_date, comments=1)
+
+
+@receiver(post_delete, sender=Comment)
+def update_activity_on_comment_delete(sender, instance, **kwargs):
+    if instance.title_id is not None and not in_cascade(instance.title_id):
+        record_activity(instance.title_id, instance.pub_date, comments=-1)
+
+
+@receiver(post_save, sender=Title)
+def update_search_index(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    text = (instance.name, instance.description)
+    if created or getattr(instance, '_loaded_text', None) != text:
+        index_titles([instance])
+        instance._loaded_text = text
@@ -0,0 +1,148 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Coalesce, TruncDate
+from django.utils import timezone
+
+from .models import Comment, Review, Title, TitleActivity, TitleScore
+
+SCORES = range(1, 11)
+PERIODS = ('day', 'month')
+
+
+def increment(model, lookup, **deltas):
+    """Прибавляет deltas к счётчикам строки, создавая её при первой записи."""
+    updates = {field: F(field) + delta for field, delta in deltas.items()}
+    if model.objects.filter(**lookup).update(**updates):
+        return
+    if min(deltas.values()) < 0:
+        # Уменьшать нечего: строка удалена вместе с произведением.
+        return
+    try:
+        with transaction.atomic():
+            model.objects.create(**lookup, **deltas)
+    except IntegrityError:
+        # Строку успел создать параллельный запрос.
+        model.objects.filter(**lookup).update(**updates)
+
+
+def record_score(title_id, score, delta):
+    increment(TitleScore, {'title_id': title_id, 'score': score}, count=delta)
+
+
+def get_trending_start():
+    return timezone.localdate() - timedelta(
+        days=settings.LEADERBOARD_TRENDING_DAYS - 1
+    )
+
+
+def record_activity(title_id, pub_date, **deltas):
+    date = timezone.localdate(pub_date)
+    increment(
+        TitleActivity, {'title_id': title_id, 'date': date}, **deltas
+    )
+    if date >= get_trending_start():
+        delta = sum(deltas.values())
+        titles = Title.objects.filter(pk=title_id)
+        if delta < 0:
+            titles = titles.filter(trending__gte=-delta)
+        titles.update(trending=F('trending') + delta)
+
+
+def refresh_trending(titles=None):
+    """Пересчитывает активность произведений за окно популярности.
+
+    Дни, вышедшие из окна, при записи не вычитаются, поэтому
+    пересчёт нужен раз в сутки. Затрагиваются только произведения
+    с активностью в окне или ненулевым счётчиком.
+    """
+    since = get_trending_start()
+    activity = TitleActivity.objects.filter(date__gte=since)
+    totals = activity.filter(title=OuterRef('pk')).order_by().values(
+        'title'
+    ).annotate(total=Sum(F('reviews') + F('comments'))).values('total')
+    if titles is None:
+        titles = Title.objects.all()
+    return titles.filter(
+        Q(trending__gt=0) | Q(pk__in=activity.values('title'))
+    ).update(trending=Coalesce(Subquery(totals), 0))
+
+
+def fill_comment_titles():
+    """Проставляет произведение комментариям, сохранённым без него."""
+    return Comment.objects.filter(title__isnull=True).update(
+        title_id=Subquery(
+            Review.objects.filter(pk=OuterRef('review_id')).values('title_id')
+        )
+    )
+
+
+def rebuild_stats(titles=None):
+    """Пересчитывает гистограммы оценок и активность произведений."""
+    reviews = Review.objects.order_by()
+    comments = Comment.objects.order_by()
+    scores = TitleScore.objects.all()
+    activity = TitleActivity.objects.all()
+    if titles is not None:
+        reviews = reviews.filter(title__in=titles)
+        comments = comments.filter(title__in=titles)
+        scores = scores.filter(title__in=titles)
+        activity = activity.filter(title__in=titles)
+    days = {}
+    for kind, queryset in (('reviews', reviews), ('comments', comments)):
+        for row in queryset.annotate(date=TruncDate('pub_date')).values(
+            'title', 'date'
+        ).annotate(total=Count('pk')):
+            day = days.setdefault(
+                (row['title'], row['date']), {'reviews': 0, 'comments': 0}
+            )
+            day[kind] = row['total']
+    with transaction.atomic():
+        scores.delete()
+        activity.delete()
+        TitleScore.objects.bulk_create(
+            TitleScore(title_id=row['title'], score=row['score'],
+                       count=row['total'])
+            for row in reviews.values('title', 'score').annotate(
+                total=Count('pk')
+            )
+        )
+        TitleActivity.objects.bulk_create(
+            TitleActivity(title_id=title, date=date, **counts)
+            for (title, date), counts in days.items()
+        )
+        refresh_trending(titles)
+
+
+def get_title_stats(title, since=None, period='day'):
+    """Статистика произведения из предрассчитанных таблиц."""
+    counts = dict(
+        TitleScore.objects.filter(title=title).values_list('score', 'count')
+    )
+    activity = TitleActivity.objects.filter(title=title)
+    comments_count = activity.aggregate(total=Sum('comments'))['total']
+    if since is not None:
+        activity = activity.filter(date__gte=since)
+    periods = {}
+    for date, reviews, comments in activity.values_list(
+        'date', 'reviews', 'comments'
+    ):
+        if period == 'month':
+            date = date.replace(day=1)
+        totals = periods.setdefault(date, [0, 0])
+        totals[0] += reviews
+        totals[1] += comments
+    return {
+        'id': title.pk,
+        'reviews_count': title.reviews_count,
+        'rating': title.rating,
+        'comments_count': comments_count or 0,
+        'scores': {str(score): counts.get(score, 0) for score in SCORES},
+        'period': period,
+        'activity': [
+            {'date': date, 'reviews': reviews, 'comments': comments}
+            for date, (reviews, comments) in sorted(periods.items())
+        ],
+    }
@@ -1,7 +1,7 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
 
-from .models import CustomUser
+from .models import CustomUser, OutgoingEmail
 
 
 @admin.register(CustomUser)
@@ -17,3 +17,17 @@ class CustomUserAdmin(UserAdmin):
     search_fields = ('username',)
     list_filter = ('username',)
     empty_value_display = '-пусто-'
+
+
+@admin.register(OutgoingEmail)
+class OutgoingEmailAdmin(admin.ModelAdmin):
+    list_display = (
+        'pk',
+        'recipient',
+        'subject',
+        'created',
+        'attempts',
+        'sent')
+    search_fields = ('recipient',)
+    list_filter = ('sent',)
+    empty_value_display = '-пусто-'
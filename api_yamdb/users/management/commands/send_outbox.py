@@ -0,0 +1,50 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from users.outbox import deliver
+
+
+class Command(BaseCommand):
+    help = ('Отправляет письма из очереди OutgoingEmail пачками через одно '
+            'SMTP-соединение на пачку.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=100,
+            help='Писем в одной пачке.'
+        )
+        parser.add_argument(
+            '--max-attempts',
+            type=int,
+            default=settings.EMAIL_OUTBOX_MAX_ATTEMPTS,
+            help='Попыток отправки одного письма.'
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=settings.EMAIL_OUTBOX_INTERVAL,
+            help='Пауза между проверками пустой очереди, секунды.'
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Разобрать готовые к отправке письма и завершиться.'
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            sent, failed = deliver(
+                options['batch_size'], options['max_attempts']
+            )
+            if sent or failed:
+                self.stdout.write(
+                    f'Отправлено писем: {sent}, ошибок: {failed}.'
+                )
+            if sent + failed < options['batch_size']:
+                if options['once']:
+                    return
+                time.sleep(options['interval'])
@@ -1,6 +1,10 @@
-from django.db.models import CharField, TextField, EmailField
+from django.db.models import (
+    CharField, DateTimeField, EmailField, Index, Model,
+    PositiveSmallIntegerField, TextField
+)
 from django.contrib.auth.models import AbstractUser
 from django.contrib.auth.validators import UnicodeUsernameValidator
+from django.utils import timezone
 
 
 class UsernameCharacterValidator(UnicodeUsernameValidator):
@@ -48,3 +52,38 @@ class CustomUser(AbstractUser):
     @property
     def is_admin(self):
         return self.role == self.ADMIN or self.is_superuser or self.is_staff
+
+
+class OutgoingEmail(Model):
+    """Письмо в очереди на отправку командой send_outbox."""
+
+    subject = CharField(max_length=255, verbose_name='Тема')
+    body = TextField(verbose_name='Текст')
+    from_email = CharField(
+        max_length=254,
+        blank=True,
+        verbose_name='Отправитель'
+    )
+    recipient = EmailField(max_length=254, verbose_name='Получатель')
+    created = DateTimeField(auto_now_add=True, verbose_name='Создано')
+    send_after = DateTimeField(
+        default=timezone.now,
+        verbose_name='Отправить не раньше'
+    )
+    attempts = PositiveSmallIntegerField(
+        default=0,
+        verbose_name='Попыток отправки'
+    )
+    sent = DateTimeField(null=True, blank=True, verbose_name='Отправлено')
+    last_error = TextField(blank=True, verbose_name='Последняя ошибка')
+
+    class Meta:
+        ordering = ('send_after', 'id')
+        verbose_name = 'Исходящее письмо'
+        verbose_name_plural = 'Исходящие письма'
+        indexes = (
+            Index(fields=('sent', 'send_after'), name='outbox_pending_idx'),
+        )
+
+    def __str__(self):
+        return f'{self.recipient}: {self.subject}'
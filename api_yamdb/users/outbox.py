@@ -0,0 +1,91 @@
+from datetime import timedelta
+from smtplib import SMTPException
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import OutgoingEmail
+
+# ValueError — например, BadHeaderError из-за перевода строки в теме.
+MAIL_ERRORS = (SMTPException, OSError, ValueError)
+
+
+def enqueue(subject, message, recipient, from_email=None):
+    return OutgoingEmail.objects.create(
+        subject=subject,
+        body=message,
+        recipient=recipient,
+        from_email=from_email or ''
+    )
+
+
+def get_backoff(attempts):
+    return timedelta(seconds=min(
+        settings.EMAIL_OUTBOX_BACKOFF * 2 ** (attempts - 1),
+        settings.EMAIL_OUTBOX_MAX_BACKOFF
+    ))
+
+
+def get_pending(batch_size, max_attempts):
+    pending = OutgoingEmail.objects.filter(
+        sent__isnull=True,
+        send_after__lte=timezone.now(),
+        attempts__lt=max_attempts
+    )
+    if connection.features.has_select_for_update_skip_locked:
+        # Несколько воркеров разбирают очередь, не дожидаясь друг друга.
+        pending = pending.select_for_update(skip_locked=True)
+    return list(pending[:batch_size])
+
+
+def send(emails):
+    """Отправляет письма через одно соединение, возвращает ошибки по id."""
+    mail_connection = get_connection()
+    try:
+        mail_connection.open()
+    except MAIL_ERRORS as error:
+        return {email.id: repr(error) for email in emails}
+    errors = {}
+    try:
+        for email in emails:
+            try:
+                EmailMessage(
+                    subject=email.subject,
+                    body=email.body,
+                    from_email=email.from_email or None,
+                    to=(email.recipient,),
+                    connection=mail_connection
+                ).send()
+            except MAIL_ERRORS as error:
+                errors[email.id] = repr(error)
+    finally:
+        mail_connection.close()
+    return errors
+
+
+def deliver(batch_size=100, max_attempts=None):
+    """Отправляет одну пачку писем; возвращает число отправленных и ошибок.
+
+    Неотправленные письма откладываются с экспоненциально растущей
+    паузой, после max_attempts попыток остаются в очереди с ошибкой.
+    """
+    max_attempts = max_attempts or settings.EMAIL_OUTBOX_MAX_ATTEMPTS
+    with transaction.atomic():
+        emails = get_pending(batch_size, max_attempts)
+        if not emails:
+            return 0, 0
+        errors = send(emails)
+        now = timezone.now()
+        for email in emails:
+            email.attempts += 1
+            if email.id in errors:
+                email.last_error = errors[email.id]
+                email.send_after = now + get_backoff(email.attempts)
+            else:
+                email.sent = now
+        OutgoingEmail.objects.bulk_update(
+            emails, ('attempts', 'last_error', 'send_after', 'sent')
+        )
+    return len(emails) - len(errors), len(errors)
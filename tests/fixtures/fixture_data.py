@@ -0,0 +1,89 @@
+import pytest
+
+
+@pytest.fixture
+def user(django_user_model):
+    return django_user_model.objects.create_user(
+        username='TestUser', email='testuser@yamdb.fake', password='1234567'
+    )
+
+
+@pytest.fixture
+def another_user(django_user_model):
+    return django_user_model.objects.create_user(
+        username='TestUserAnother',
+        email='testuseranother@yamdb.fake',
+        password='1234567'
+    )
+
+
+@pytest.fixture
+def admin(django_user_model):
+    return django_user_model.objects.create_user(
+        username='TestAdmin',
+        email='testadmin@yamdb.fake',
+        password='1234567',
+        role=django_user_model.ADMIN
+    )
+
+
+@pytest.fixture
+def category():
+    from reviews.models import Category
+    return Category.objects.create(name='Фильм', slug='movie')
+
+
+@pytest.fixture
+def genre():
+    from reviews.models import Genre
+    return Genre.objects.create(name='Драма', slug='drama')
+
+
+@pytest.fixture
+def title(category, genre):
+    from reviews.models import Title
+    # id задан явно: ограничение author_not_title_again запрещает
+    # совпадение id автора отзыва и произведения.
+    title = Title.objects.create(id=1000, name='Тестовое произведение',
+                                 year=2000, category=category)
+    title.genre.add(genre)
+    return title
+
+
+@pytest.fixture
+def titles(category, genre):
+    from reviews.models import Genre, Title
+    second_genre = Genre.objects.create(name='Комедия', slug='comedy')
+    titles = Title.objects.bulk_create(
+        Title(id=1000 + number, name=f'Произведение {number}',
+              year=2000 + number,
+              category=category)
+        for number in range(1, 6)
+    )
+    for title in titles:
+        title.genre.add(genre, second_genre)
+    return titles
+
+
+@pytest.fixture
+def reviews(title, django_user_model):
+    from reviews.models import Review
+    return [
+        Review.objects.create(
+            title=title,
+            author=django_user_model.objects.create_user(
+                username=f'reviewer{number}',
+                email=f'reviewer{number}@yamdb.fake'
+            ),
+            text=f'Отзыв {number}',
+            score=number % 10 + 1
+        )
+        for number in range(7)
+    ]
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    from django.core.cache import caches
+    for cache in caches.all():
+        cache.clear()
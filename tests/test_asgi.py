@@ -0,0 +1,50 @@
+import asyncio
+import json
+
+import pytest
+from asgiref.testing import ApplicationCommunicator
+
+from api_yamdb.asgi import application
+
+
+def request(path):
+    async def run():
+        communicator = ApplicationCommunicator(application, {
+            'type': 'http',
+            'http_version': '1.1',
+            'method': 'GET',
+            'path': path,
+            'query_string': b'',
+            'headers': [(b'host', b'localhost')],
+        })
+        await communicator.send_input({'type': 'http.request'})
+        start = await communicator.receive_output(timeout=5)
+        body = b''
+        while True:
+            message = await communicator.receive_output(timeout=5)
+            body += message.get('body', b'')
+            if not message.get('more_body'):
+                break
+        return start, body
+    return asyncio.get_event_loop().run_until_complete(run())
+
+
+@pytest.mark.django_db(transaction=True)
+class TestAsgi:
+
+    def test_list_is_served(self):
+        start, body = request('/api/v1/categories/')
+        assert start['status'] == 200, (
+            'Проверьте, что ASGI-приложение отдаёт список категорий'
+        )
+        assert json.loads(body)['results'] == []
+
+    def test_lifespan(self):
+        async def run():
+            communicator = ApplicationCommunicator(
+                application, {'type': 'lifespan'}
+            )
+            await communicator.send_input({'type': 'lifespan.startup'})
+            return await communicator.receive_output(timeout=5)
+        message = asyncio.get_event_loop().run_until_complete(run())
+        assert message['type'] == 'lifespan.startup.complete'
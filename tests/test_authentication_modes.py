@@ -0,0 +1,110 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.views import APIView
+from rest_framework_simplejwt.tokens import AccessToken
+
+from api.authentication import (
+    CachedJWTAuthentication, StatelessJWTAuthentication, get_access_token,
+    user_cache
+)
+from reviews.models import Review
+
+
+@pytest.fixture(autouse=True)
+def clear_user_cache():
+    user_cache.clear()
+    yield
+    user_cache.clear()
+
+
+def use_authentication(monkeypatch, authentication_class):
+    monkeypatch.setattr(
+        APIView, 'authentication_classes', [authentication_class]
+    )
+
+
+def request(client, method, url, user, **kwargs):
+    token = get_access_token(user)
+    with CaptureQueriesContext(connection) as context:
+        response = getattr(client, method)(
+            url, HTTP_AUTHORIZATION=f'Bearer {token}',
+            content_type='application/json', **kwargs
+        )
+    user_queries = [
+        query['sql'] for query in context.captured_queries
+        if query['sql'].startswith('SELECT')
+        and 'FROM "users_customuser"' in query['sql']
+    ]
+    return response, user_queries
+
+
+@pytest.mark.django_db
+class TestAuthenticationModes:
+
+    def test_token_carries_role(self, admin):
+        token = AccessToken(str(get_access_token(admin)))
+        assert token['role'] == admin.ADMIN
+        assert token['username'] == admin.username
+        assert not token['is_superuser']
+
+    def test_stateless(self, client, monkeypatch, user, admin, title):
+        use_authentication(monkeypatch, StatelessJWTAuthentication)
+        response, queries = request(
+            client, 'post', f'/api/v1/titles/{title.pk}/reviews/', user,
+            data={'text': 'Отзыв', 'score': 7}
+        )
+        assert response.status_code == 201, response.json()
+        assert not queries, (
+            'Проверьте, что в режиме stateless пользователь не читается '
+            'из базы'
+        )
+        assert Review.objects.get().author == user
+        response, queries = request(
+            client, 'post', '/api/v1/categories/', admin,
+            data={'name': 'Сериалы', 'slug': 'series'}
+        )
+        assert response.status_code == 201 and not queries
+        response, _ = request(client, 'get', '/api/v1/users/me/', user)
+        assert response.json()['email'] == user.email, (
+            'Проверьте, что users/me/ отдаёт полные данные из базы'
+        )
+
+    def test_stateless_role_change(self, client, monkeypatch, user, admin,
+                                   another_user, title):
+        use_authentication(monkeypatch, StatelessJWTAuthentication)
+        review = Review.objects.create(
+            title=title, author=another_user, text='Отзыв', score=5
+        )
+        url = f'/api/v1/titles/{title.pk}/reviews/{review.pk}/'
+        token = get_access_token(user)
+        headers = {'HTTP_AUTHORIZATION': f'Bearer {token}'}
+        assert client.delete(url, **headers).status_code == 403
+        response, _ = request(
+            client, 'patch', f'/api/v1/users/{user.username}/', admin,
+            data={'role': user.MODERATOR}
+        )
+        assert response.status_code == 200
+        assert client.delete(url, **headers).status_code == 204, (
+            'Проверьте, что смена роли действует на уже выданные токены'
+        )
+
+    def test_cached(self, client, monkeypatch, user, admin):
+        use_authentication(monkeypatch, CachedJWTAuthentication)
+        counts = [
+            len(request(client, 'get', '/api/v1/titles/', user)[1])
+            for _ in range(3)
+        ]
+        assert counts == [1, 0, 0], (
+            'Проверьте, что пользователь кэшируется в памяти процесса'
+        )
+        response, _ = request(client, 'get', '/api/v1/users/', user)
+        assert response.status_code == 403
+        request(
+            client, 'patch', f'/api/v1/users/{user.username}/', admin,
+            data={'role': user.ADMIN}
+        )
+        response, _ = request(client, 'get', '/api/v1/users/', user)
+        assert response.status_code == 200, (
+            'Проверьте, что смена роли сбрасывает пользователя в кэше'
+        )
@@ -0,0 +1,77 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from api.pagination import OptionalCursorPagination, PubDateCursorPagination
+from reviews.models import Comment, Review
+
+
+def count_queries(client, method, url, **kwargs):
+    with CaptureQueriesContext(connection) as context:
+        response = getattr(client, method)(url, **kwargs)
+    assert response.status_code == 200, response.content
+    return [query['sql'] for query in context.captured_queries]
+
+
+def author_queries(queries):
+    return [
+        sql for sql in queries
+        if sql.startswith('SELECT') and 'FROM "users_customuser"' in sql
+    ]
+
+
+@pytest.mark.django_db
+class TestAuthorQueries:
+
+    def test_review_list(self, client, title, reviews, monkeypatch):
+        url = f'/api/v1/titles/{title.pk}/reviews/'
+        counts = []
+        for page_size in (1, 5):
+            monkeypatch.setattr(
+                OptionalCursorPagination, 'page_size', page_size
+            )
+            monkeypatch.setattr(
+                PubDateCursorPagination, 'page_size', page_size
+            )
+            for pagination in ('', '?pagination=cursor'):
+                queries = count_queries(client, 'get', f'{url}{pagination}')
+                assert not author_queries(queries), (
+                    'Проверьте, что авторы отзывов загружаются вместе '
+                    'с отзывами'
+                )
+                counts.append((pagination, len(queries)))
+        assert counts[0] == counts[2] and counts[1] == counts[3], (
+            'Проверьте, что число запросов не зависит от размера страницы'
+        )
+
+    def test_comment_list(self, client, title, reviews):
+        review = reviews[0]
+        url = f'/api/v1/titles/{title.pk}/reviews/{review.pk}/comments/'
+        counts = []
+        for number, other in enumerate(reviews[:5]):
+            Comment.objects.create(
+                review=review, author=other.author, text=f'Комментарий {number}'
+            )
+            queries = count_queries(client, 'get', url)
+            assert not author_queries(queries)
+            counts.append(len(queries))
+        assert len(set(counts)) == 1, (
+            'Проверьте, что число запросов не зависит от числа комментариев'
+        )
+
+    def test_detail_and_permission(self, client, title, user):
+        review = Review.objects.create(
+            title=title, author=user, text='Отзыв', score=5
+        )
+        url = f'/api/v1/titles/{title.pk}/reviews/{review.pk}/'
+        assert not author_queries(count_queries(client, 'get', url))
+        token = RefreshToken.for_user(user).access_token
+        queries = count_queries(
+            client, 'patch', url, data={'text': 'Новый текст'},
+            content_type='application/json',
+            HTTP_AUTHORIZATION=f'Bearer {token}'
+        )
+        assert len(author_queries(queries)) == 1, (
+            'Проверьте, что проверка авторства не загружает автора повторно'
+        )
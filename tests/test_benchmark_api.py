@@ -0,0 +1,117 @@
+import json
+import os
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from api import cache
+from api.benchmarks import ENDPOINTS, compare, percentile, private_cache
+from reviews.generator import CatalogGenerator
+from reviews.models import Comment, Review, Title
+from users.models import CustomUser
+
+
+@pytest.mark.django_db
+class TestBenchmarkApi:
+
+    def test_percentile(self):
+        values = list(range(1, 101))
+        assert percentile(values, 0.5) == 50
+        assert percentile(values, 0.95) == 95
+        assert percentile(values, 0.99) == 99
+        assert percentile([], 0.5) is None
+
+    def test_generator_respects_constraints(self):
+        counts = CatalogGenerator(seed=3).generate(
+            users=20, titles=10, reviews=100, comments=50
+        )
+        assert counts == {
+            'users': 20, 'titles': 10, 'reviews': 100, 'comments': 50
+        }
+        pairs = list(Review.objects.values_list('author_id', 'title_id'))
+        assert len(pairs) == len(set(pairs))
+        assert all(author != title for author, title in pairs), (
+            'Проверьте, что генератор соблюдает author_not_title_again'
+        )
+        title = Title.objects.filter(reviews_count__gt=0).first()
+        assert title.rating is not None, (
+            'Проверьте, что генератор пересчитывает рейтинги'
+        )
+        assert Comment.objects.filter(review__isnull=False).count() == 50
+
+    def test_generator_is_deterministic(self):
+        def snapshot():
+            CatalogGenerator(seed=5).generate(
+                users=10, titles=5, reviews=20, comments=10
+            )
+            data = (
+                list(Review.objects.order_by('pk').values_list(
+                    'pk', 'author_id', 'title_id', 'score', 'pub_date'
+                )),
+                list(Comment.objects.order_by('pk').values_list(
+                    'pk', 'review_id', 'pub_date'
+                )),
+            )
+            Title.objects.all().delete()
+            CustomUser.objects.all().delete()
+            return data
+
+        assert snapshot() == snapshot(), (
+            'Проверьте, что одинаковое зерно даёт одинаковые данные, '
+            'включая даты публикации'
+        )
+
+    def test_private_cache(self, settings):
+        version = cache.get_version('titles')
+        with private_cache():
+            location = settings.CACHES[settings.API_CACHE_ALIAS]['LOCATION']
+            cache.invalidate('titles')
+            cache.get_cache().set('trending:marker', True)
+            assert cache.get_version('titles') != version
+        assert cache.get_version('titles') == version, (
+            'Проверьте, что замер не сбрасывает кэш рабочих серверов'
+        )
+        assert cache.get_cache().get('trending:marker') is None
+        assert not os.path.exists(location), (
+            'Проверьте, что временный кэш удаляется после замера'
+        )
+
+    def test_report_and_baseline(self, tmp_path, admin):
+        CatalogGenerator(seed=1).generate(
+            users=20, titles=10, reviews=50, comments=50
+        )
+        users = CustomUser.objects.count()
+        output = tmp_path / 'report.json'
+        call_command(
+            'benchmark_api', existing=True, requests=2, warmup=0,
+            username=admin.username, output=str(output), stdout=StringIO()
+        )
+        assert CustomUser.objects.count() == users, (
+            'Проверьте, что замер на текущей базе не создаёт пользователей'
+        )
+        report = json.loads(output.read_text(encoding='utf-8'))
+        assert set(report['endpoints']) == set(ENDPOINTS), (
+            'Проверьте, что замеряются все эндпоинты'
+        )
+        for result in report['endpoints'].values():
+            assert result['status'] == 200
+            assert {'p50_ms', 'p95_ms', 'p99_ms', 'queries', 'rps'} <= set(
+                result
+            )
+
+        baseline = json.loads(output.read_text(encoding='utf-8'))
+        endpoint = baseline['endpoints']['titles/']
+        endpoint['queries'] -= 1
+        assert compare(report, baseline, tolerance=0.2), (
+            'Проверьте, что рост числа запросов считается регрессией'
+        )
+        baseline_path = tmp_path / 'baseline.json'
+        baseline_path.write_text(json.dumps(baseline), encoding='utf-8')
+        with pytest.raises(CommandError):
+            call_command(
+                'benchmark_api', existing=True, requests=2, warmup=0,
+                baseline=str(baseline_path),
+                stdout=StringIO()
+            )
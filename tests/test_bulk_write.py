@@ -0,0 +1,162 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from reviews.models import Category, Genre, Title
+
+
+@pytest.fixture
+def admin_client(client, admin):
+    token = RefreshToken.for_user(admin).access_token
+    client.defaults['HTTP_AUTHORIZATION'] = f'Bearer {token}'
+    return client
+
+
+def make_titles(count, genres=('drama',), category='films'):
+    return [
+        {
+            'name': f'Пакетное произведение {number}',
+            'year': 2000 + number % 20,
+            'description': 'Описание',
+            'genre': list(genres),
+            'category': category,
+        }
+        for number in range(count)
+    ]
+
+
+@pytest.mark.django_db
+class TestBulkWrite:
+
+    def post(self, client, url, data):
+        return client.post(url, data, content_type='application/json')
+
+    def patch(self, client, url, data):
+        return client.patch(url, data, content_type='application/json')
+
+    def test_create_titles(self, admin_client, category, genre):
+        Genre.objects.create(name='Комедия', slug='comedy')
+        response = self.post(
+            admin_client, '/api/v1/titles/bulk/',
+            make_titles(3, genres=(genre.slug, 'comedy', genre.slug),
+                        category=category.slug)
+        )
+        assert response.status_code == 201, response.json()
+        data = response.json()
+        assert [item['name'] for item in data] == [
+            f'Пакетное произведение {number}' for number in range(3)
+        ]
+        title = Title.objects.get(pk=data[1]['id'])
+        assert title.category == category
+        assert set(title.genre.values_list('slug', flat=True)) == {
+            genre.slug, 'comedy'
+        }, 'Проверьте, что связи с жанрами создаются пакетно'
+        assert sorted(data[0]['genre']) == sorted([genre.slug, 'comedy'])
+        response = admin_client.get('/api/v1/titles/?search=Пакетное')
+        assert response.json()['count'] == 3, (
+            'Проверьте, что созданные пакетом произведения попадают в поиск'
+        )
+
+    def test_query_count_does_not_grow(self, admin_client, category, genre):
+        counts = []
+        for size in (2, 5):
+            with CaptureQueriesContext(connection) as context:
+                response = self.post(
+                    admin_client, '/api/v1/titles/bulk/',
+                    make_titles(size, genres=(genre.slug,),
+                                category=category.slug)
+                )
+            assert response.status_code == 201
+            counts.append(len(context.captured_queries))
+        assert counts[0] == counts[1], (
+            'Проверьте, что число запросов не зависит от размера пачки'
+        )
+
+    def test_per_item_errors(self, admin_client, category, genre):
+        items = make_titles(3, genres=(genre.slug,), category=category.slug)
+        items[1]['category'] = 'unknown'
+        del items[2]['name']
+        response = self.post(admin_client, '/api/v1/titles/bulk/', items)
+        assert response.status_code == 400
+        errors = response.json()
+        assert errors[0] == {}, 'Проверьте, что ошибки выдаются по позициям'
+        assert 'category' in errors[1]
+        assert 'name' in errors[2]
+        assert not Title.objects.exists(), (
+            'Проверьте, что при ошибке пачка не записывается частично'
+        )
+
+    def test_update_titles(self, admin_client, titles, genre):
+        response = self.patch(admin_client, '/api/v1/titles/bulk/', [
+            {'id': titles[0].pk, 'name': 'Новое название'},
+            {'id': titles[1].pk, 'genre': ['comedy']},
+        ])
+        assert response.status_code == 200, response.json()
+        titles[0].refresh_from_db()
+        assert titles[0].name == 'Новое название'
+        assert list(titles[0].genre.values_list('slug', flat=True)) != []
+        assert list(titles[1].genre.values_list('slug', flat=True)) == [
+            'comedy'
+        ], 'Проверьте, что PATCH заменяет жанры произведения'
+        assert Title.objects.get(pk=titles[1].pk).name == titles[1].name
+        response = admin_client.get('/api/v1/titles/?search=Новое название')
+        assert response.json()['count'] == 1
+
+    def test_update_errors(self, admin_client, titles):
+        response = self.patch(admin_client, '/api/v1/titles/bulk/', [
+            {'id': 404, 'name': 'Нет такого'},
+            {'id': titles[0].pk, 'name': 'Первое'},
+            {'id': titles[0].pk, 'name': 'Повтор'},
+            {'name': 'Без id'},
+        ])
+        assert response.status_code == 400
+        errors = response.json()
+        assert 'id' in errors[0] and errors[1] == {}
+        assert 'id' in errors[2] and 'id' in errors[3]
+        titles[0].refresh_from_db()
+        assert titles[0].name != 'Первое'
+
+    def test_create_genres_and_categories(self, admin_client, genre):
+        response = self.post(admin_client, '/api/v1/genres/bulk/', [
+            {'name': 'Вестерн', 'slug': 'western'},
+            {'name': 'Драма', 'slug': genre.slug},
+            {'name': 'Вестерн', 'slug': 'western'},
+        ])
+        assert response.status_code == 400
+        errors = response.json()
+        assert errors[0] == {}
+        assert 'slug' in errors[1] and 'slug' in errors[2], (
+            'Проверьте проверку уникальности slug в базе и внутри пачки'
+        )
+        response = self.post(admin_client, '/api/v1/categories/bulk/', [
+            {'name': 'Сериалы', 'slug': 'series'},
+            {'name': 'Игры', 'slug': 'games'},
+        ])
+        assert response.status_code == 201
+        assert set(Category.objects.values_list('slug', flat=True)) == {
+            'series', 'games'
+        }
+        response = self.patch(admin_client, '/api/v1/genres/bulk/', [])
+        assert response.status_code == 405
+
+    def test_bulk_requires_admin(self, client, user):
+        url = '/api/v1/titles/bulk/'
+        assert self.post(client, url, []).status_code == 401
+        token = RefreshToken.for_user(user).access_token
+        response = client.post(
+            url, [], content_type='application/json',
+            HTTP_AUTHORIZATION=f'Bearer {token}'
+        )
+        assert response.status_code == 403
+
+    def test_bulk_input_validation(self, admin_client, settings):
+        url = '/api/v1/titles/bulk/'
+        assert self.post(admin_client, url, {}).status_code == 400
+        settings.API_BULK_LIMIT = 2
+        response = self.post(admin_client, url, make_titles(3))
+        assert response.status_code == 400, (
+            'Проверьте ограничение размера пачки'
+        )
+        response = self.post(admin_client, url, [])
+        assert (response.status_code, response.json()) == (201, [])
@@ -0,0 +1,81 @@
+import pytest
+
+from reviews.models import Review
+
+
+@pytest.mark.django_db
+class TestConditionalGet:
+
+    def test_not_modified(self, client, titles, django_assert_num_queries):
+        url = f'/api/v1/titles/{titles[0].id}/'
+        response = client.get(url)
+        etag = response.get('ETag')
+        assert etag, 'Проверьте, что ответ API содержит заголовок ETag'
+        with django_assert_num_queries(0):
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304, (
+            'Проверьте, что при совпадении If-None-Match возвращается 304'
+        )
+        assert response['ETag'] == etag
+        assert not response.content
+
+        titles[0].genre.clear()
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200, (
+            'Проверьте, что ETag меняется после изменения произведения'
+        )
+        assert response['ETag'] != etag
+
+    def test_review_etag_is_scoped_to_title(self, client, titles, user):
+        first_url = f'/api/v1/titles/{titles[0].id}/reviews/'
+        second_url = f'/api/v1/titles/{titles[1].id}/reviews/'
+        first_etag = client.get(first_url)['ETag']
+        second_etag = client.get(second_url)['ETag']
+
+        Review.objects.create(title=titles[0], author=user, score=5)
+        assert client.get(
+            first_url, HTTP_IF_NONE_MATCH=first_etag
+        ).status_code == 200
+        assert client.get(
+            second_url, HTTP_IF_NONE_MATCH=second_etag
+        ).status_code == 304, (
+            'Проверьте, что отзыв к одному произведению не сбрасывает ETag '
+            'отзывов другого'
+        )
+
+    def test_wildcard_requires_existing_object(self, client, titles):
+        response = client.get('/api/v1/titles/999999/', HTTP_IF_NONE_MATCH='*')
+        assert response.status_code == 404, (
+            'Проверьте, что If-None-Match: * для несуществующего объекта '
+            'возвращает 404'
+        )
+        response = client.get(
+            f'/api/v1/titles/{titles[0].id}/', HTTP_IF_NONE_MATCH='*'
+        )
+        assert response.status_code == 304
+
+    def test_author_change_resets_review_etag(self, client, title, user):
+        review = Review.objects.create(title=title, author=user, score=5)
+        urls = (
+            f'/api/v1/titles/{title.id}/reviews/?expand=author',
+            f'/api/v1/titles/{title.id}/reviews/{review.id}/comments/',
+        )
+        etags = [client.get(url)['ETag'] for url in urls]
+        user.bio = 'Новая биография'
+        user.save()
+        for url, etag in zip(urls, etags):
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+            assert response.status_code == 200, (
+                'Проверьте, что изменение автора сбрасывает ETag отзывов '
+                'и комментариев'
+            )
+
+    def test_title_delete_resets_thread_etags(self, client, title, user):
+        review = Review.objects.create(title=title, author=user, score=5)
+        url = f'/api/v1/titles/{title.id}/reviews/{review.id}/comments/'
+        etag = client.get(url)['ETag']
+        title.delete()
+        assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 404, (
+            'Проверьте, что удаление произведения сбрасывает ETag '
+            'комментариев к его отзывам'
+        )
@@ -0,0 +1,59 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.mark.django_db
+class TestCursorPagination:
+
+    def collect(self, client, url):
+        ids, pages = [], 0
+        while url:
+            response = client.get(url)
+            assert response.status_code == 200, (
+                f'Проверьте, что GET-запрос к `{url}` возвращает статус 200'
+            )
+            data = response.json()
+            assert 'count' not in data, (
+                'Проверьте, что курсорный режим не считает COUNT(*)'
+            )
+            ids.extend(item['id'] for item in data['results'])
+            url = data['next']
+            pages += 1
+        return ids, pages
+
+    def test_cursor_walks_all_reviews(self, client, title, reviews):
+        url = f'/api/v1/titles/{title.id}/reviews/?pagination=cursor'
+        ids, pages = self.collect(client, url)
+        assert ids == [review.id for review in reviews]
+        assert pages == 2
+
+        ids, _ = self.collect(client, url + '&ordering=-pub_date')
+        assert ids == [review.id for review in reversed(reviews)], (
+            'Проверьте, что курсорная пагинация учитывает ordering'
+        )
+
+    def test_previous_link(self, client, title, reviews):
+        url = f'/api/v1/titles/{title.id}/reviews/?pagination=cursor'
+        second_page = client.get(client.get(url).json()['next']).json()
+        first_page = client.get(second_page['previous']).json()
+        assert [item['id'] for item in first_page['results']] == [
+            review.id for review in reviews[:5]
+        ]
+
+    def test_deep_page_has_no_count_query(self, client, title, reviews):
+        url = f'/api/v1/titles/{title.id}/reviews/?pagination=cursor'
+        next_url = client.get(url).json()['next']
+        with CaptureQueriesContext(connection) as context:
+            client.get(next_url)
+        assert not any(
+            'COUNT(' in query['sql'] for query in context.captured_queries
+        )
+
+    def test_invalid_cursor(self, client, title, reviews):
+        url = f'/api/v1/titles/{title.id}/reviews/?cursor=broken'
+        assert client.get(url).status_code == 404
+
+    def test_page_number_mode_is_default(self, client, title, reviews):
+        data = client.get(f'/api/v1/titles/{title.id}/reviews/').json()
+        assert data['count'] == len(reviews)
@@ -0,0 +1,92 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+from django.conf import settings
+from django.db import connections
+
+from api.metrics import connection_stats
+
+
+@pytest.mark.django_db
+class TestDbConnections:
+
+    def test_unusable_connection_is_replaced(self, client, settings,
+                                             monkeypatch):
+        settings.DB_CONN_HEALTH_CHECK_INTERVAL = 0
+        connections['default'].ensure_connection()
+        connection_stats.clear()
+        monkeypatch.setattr(
+            type(connections['default']), 'is_usable', lambda self: False
+        )
+        closed = []
+        monkeypatch.setattr(
+            type(connections['default']), 'close', lambda self: closed.append(self)
+        )
+        client.get('/api/v1/categories/')
+        stats = connection_stats.export()
+        assert stats['reused'] >= 1
+        assert stats['unusable'] >= 1, (
+            'Проверьте, что переиспользуемое соединение проверяется '
+            'перед запросом'
+        )
+        assert closed, 'Проверьте, что негодное соединение закрывается'
+
+    def test_health_checks_are_off_by_default(self, client, monkeypatch):
+        assert settings.DB_CONN_HEALTH_CHECK_INTERVAL is None
+        connections['default'].ensure_connection()
+        connection_stats.clear()
+        monkeypatch.setattr(
+            type(connections['default']), 'is_usable', lambda self: False
+        )
+        client.get('/api/v1/categories/')
+        stats = connection_stats.export()
+        assert stats['checked'] == stats['unusable'] == 0, (
+            'Проверьте, что по умолчанию соединение не проверяется '
+            'на каждом запросе'
+        )
+
+    def test_only_idle_connections_are_checked(self, client, settings):
+        settings.DB_CONN_HEALTH_CHECK_INTERVAL = 60
+        client.get('/api/v1/categories/')
+        connection_stats.clear()
+        client.get('/api/v1/categories/')
+        assert connection_stats.export()['checked'] == 0, (
+            'Проверьте, что недавно использованное соединение '
+            'не проверяется'
+        )
+        connections['default'].last_used -= 60
+        client.get('/api/v1/categories/')
+        stats = connection_stats.export()
+        assert stats['checked'] == 1
+        assert stats['unusable'] == 0
+
+
+def test_persistent_connections_are_reused(tmp_path):
+    env = {
+        **os.environ,
+        'DB_ENGINE': 'django.db.backends.sqlite3',
+        'DB_NAME': str(tmp_path / 'db.sqlite3'),
+    }
+    manage = [sys.executable, 'manage.py']
+    subprocess.run(
+        manage + ['migrate', '-v', '0'],
+        cwd=settings.BASE_DIR, env=env, check=True
+    )
+    report = tmp_path / 'report.json'
+    subprocess.run(
+        manage + [
+            'benchmark_connections', '--requests', '20',
+            '--output', str(report)
+        ],
+        cwd=settings.BASE_DIR, env=env, check=True, stdout=subprocess.DEVNULL
+    )
+    result = json.loads(report.read_text())
+    assert result['0']['connections'] == 20
+    assert result['60']['connections'] == 1, (
+        'Проверьте, что при CONN_MAX_AGE соединение не открывается '
+        'на каждый запрос'
+    )
+    assert result['60']['reused'] == 19
@@ -0,0 +1,74 @@
+from smtplib import SMTPException
+
+import pytest
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
+from django.utils import timezone
+
+from users import outbox
+from users.models import OutgoingEmail
+
+
+@pytest.mark.django_db
+class TestEmailOutbox:
+
+    def test_sign_up_enqueues(self, client):
+        response = client.post('/api/v1/auth/signup/', {
+            'username': 'NewUser', 'email': 'newuser@yamdb.fake'
+        })
+        assert response.status_code == 200
+        assert mail.outbox == [], (
+            'Проверьте, что регистрация не отправляет письмо синхронно'
+        )
+        email = OutgoingEmail.objects.get()
+        assert email.recipient == 'newuser@yamdb.fake'
+        assert email.sent is None
+        call_command('send_outbox', once=True)
+        assert len(mail.outbox) == 1
+        assert mail.outbox[0].to == ['newuser@yamdb.fake']
+        email.refresh_from_db()
+        assert email.sent is not None and email.attempts == 1
+
+    def test_one_connection_per_batch(self, monkeypatch):
+        for number in range(5):
+            outbox.enqueue('Тема', 'Текст', f'user{number}@yamdb.fake')
+        connections = []
+
+        def get_connection():
+            connections.append(EmailBackend())
+            return connections[-1]
+
+        monkeypatch.setattr(outbox, 'get_connection', get_connection)
+        assert outbox.deliver(batch_size=3) == (3, 0)
+        assert outbox.deliver(batch_size=3) == (2, 0)
+        assert len(connections) == 2, (
+            'Проверьте, что пачка отправляется через одно соединение'
+        )
+        assert outbox.deliver(batch_size=3) == (0, 0)
+        assert len(mail.outbox) == 5
+
+    def test_retry_with_backoff(self, monkeypatch, settings):
+        settings.EMAIL_OUTBOX_MAX_ATTEMPTS = 2
+        email = outbox.enqueue('Тема', 'Текст', 'user@yamdb.fake')
+
+        def send_messages(self, messages):
+            raise SMTPException('Сервер недоступен')
+
+        monkeypatch.setattr(EmailBackend, 'send_messages', send_messages)
+        assert outbox.deliver() == (0, 1)
+        email.refresh_from_db()
+        assert email.attempts == 1 and email.sent is None
+        assert 'Сервер недоступен' in email.last_error
+        assert email.send_after > timezone.now(), (
+            'Проверьте, что повторная отправка откладывается'
+        )
+        assert outbox.deliver() == (0, 0)
+        OutgoingEmail.objects.update(send_after=timezone.now())
+        assert outbox.deliver() == (0, 1)
+        OutgoingEmail.objects.update(send_after=timezone.now())
+        assert outbox.deliver() == (0, 0), (
+            'Проверьте, что число попыток ограничено'
+        )
+        email.refresh_from_db()
+        assert email.attempts == 2
@@ -0,0 +1,26 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from reviews.models import Comment, Review
+
+
+@pytest.mark.django_db
+class TestExplainEndpoints:
+
+    def test_all_endpoints_are_explained(self, admin, title, reviews):
+        Comment.objects.create(
+            review=Review.objects.filter(title=title).first(),
+            author=admin, text='Комментарий'
+        )
+        out = StringIO()
+        call_command('explain_endpoints', username=admin.username, stdout=out)
+        output = out.getvalue()
+        assert f'/api/v1/titles/{title.pk}/reviews/' in output
+        assert '/api/v1/users/' in output
+        assert 'не проверяется' not in output, (
+            'Проверьте, что команда обходит все эндпоинты роутера'
+        )
+        assert ' — 200,' in output
+        assert ' — 500,' not in output
@@ -0,0 +1,72 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from reviews.models import Comment, Review, Title
+from users.models import CustomUser
+
+
+def snapshot():
+    return (
+        list(Title.objects.order_by('pk').values_list(
+            'name', 'year', 'reviews_count'
+        )),
+        list(Review.objects.order_by('pk').values_list(
+            'title_id', 'author_id', 'score', 'text'
+        )),
+        list(Comment.objects.order_by('pk').values_list(
+            'review_id', 'title_id', 'author_id'
+        )),
+    )
+
+
+@pytest.mark.django_db
+class TestGenerateData:
+    options = {
+        'users': 30, 'titles': 40, 'reviews': 300, 'comments': 100,
+        'seed': 7, 'batch_size': 50, 'stdout': StringIO(),
+    }
+
+    def test_generated_data_is_deterministic(self):
+        call_command('generate_data', **self.options)
+        first = snapshot()
+        for model in (Comment, Review, Title, CustomUser):
+            model.objects.all().delete()
+        call_command('generate_data', **self.options)
+        assert snapshot() == first, (
+            'Проверьте, что одинаковое зерно даёт одинаковые данные'
+        )
+
+    def test_reviews_are_skewed_and_valid(self):
+        call_command('generate_data', skew=1.2, **self.options)
+        counts = sorted(
+            Title.objects.values_list('reviews_count', flat=True),
+            reverse=True
+        )
+        assert sum(counts) == 300
+        assert counts[0] >= 5 * counts[len(counts) // 2], (
+            'Проверьте, что отзывы распределены неравномерно'
+        )
+        assert counts[0] <= 29, (
+            'Проверьте, что у произведения не больше отзывов, чем авторов'
+        )
+        pairs = list(Review.objects.values_list('author_id', 'title_id'))
+        assert len(pairs) == len(set(pairs))
+        assert all(author != title for author, title in pairs)
+        assert set(Review.objects.values_list('score', flat=True)) <= set(
+            range(1, 11)
+        )
+        assert not Comment.objects.exclude(
+            title_id__in=Review.objects.filter(
+                pk__in=Comment.objects.values('review_id')
+            ).values('title_id')
+        ).exists()
+
+    def test_too_few_users(self):
+        with pytest.raises(CommandError):
+            call_command(
+                'generate_data', users=3, titles=2, reviews=10,
+                comments=0, stdout=StringIO()
+            )
@@ -0,0 +1,94 @@
+import pytest
+from django.core.management import call_command
+
+from reviews.models import Comment, Review, Title
+
+CSV_FILES = {
+    'users.csv': (
+        'id,username,email,role,bio,first_name,last_name\n'
+        '100,bingobongo,bingobongo@yamdb.fake,user,,,\n'
+        '101,capt_obvious,capt_obvious@yamdb.fake,admin,,,\n'
+    ),
+    'category.csv': 'id,name,slug\n1,Фильм,movie\n',
+    'genre.csv': 'id,name,slug\n1,Драма,drama\n2,Комедия,comedy\n',
+    'titles.csv': (
+        'id,name,year,category\n'
+        '1,Побег из Шоушенка,1994,1\n'
+        '2,Крёстный отец,1972,9\n'
+    ),
+    'genre_title.csv': 'id,title_id,genre_id\n1,1,1\n2,1,2\n',
+    'review.csv': (
+        'id,title_id,text,author,score,pub_date\n'
+        '1,1,Отлично,100,10,2019-09-24T21:08:21.567Z\n'
+        '2,1,Неплохо,101,7,2019-09-24T21:08:21.567Z\n'
+        '3,1,Ещё раз,101,1,2019-09-24T21:08:21.567Z\n'
+    ),
+    'comments.csv': (
+        'id,review_id,text,author,pub_date\n'
+        '1,1,Согласен,101,2019-09-25T21:08:21.567Z\n'
+        '2,3,Мимо,100,2019-09-25T21:08:21.567Z\n'
+    ),
+}
+
+
+@pytest.fixture
+def csv_dir(tmp_path):
+    for name, content in CSV_FILES.items():
+        (tmp_path / name).write_text(content, encoding='utf-8')
+    return tmp_path
+
+
+@pytest.mark.django_db
+class TestImportCsv:
+
+    def test_import(self, csv_dir):
+        call_command('import_csv', path=str(csv_dir), batch_size=1)
+        title = Title.objects.get()
+        assert title.genre.count() == 2
+        assert Review.objects.count() == 2, (
+            'Проверьте, что повторный отзыв автора к произведению пропускается'
+        )
+        assert Comment.objects.count() == 1
+        assert Review.objects.get(pk=1).pub_date.year == 2019, (
+            'Проверьте, что дата публикации берётся из CSV'
+        )
+        assert (title.reviews_count, title.rating) == (2, 8.5), (
+            'Проверьте, что после загрузки пересчитывается рейтинг'
+        )
+
+        call_command('import_csv', path=str(csv_dir))
+        assert Review.objects.count() == 2, (
+            'Проверьте, что повторная загрузка не создаёт дубликатов'
+        )
+
+    def test_dry_run(self, csv_dir):
+        call_command('import_csv', path=str(csv_dir), dry_run=True)
+        assert not Title.objects.exists(), (
+            'Проверьте, что в режиме --dry-run ничего не записывается'
+        )
+
+
+@pytest.mark.django_db
+class TestExportCatalog:
+
+    def test_csv_round_trip(self, csv_dir, tmp_path_factory):
+        call_command('import_csv', path=str(csv_dir))
+        output = tmp_path_factory.mktemp('export')
+        call_command('export_catalog', format='csv', output=str(output))
+        Title.objects.all().delete()
+        call_command('import_csv', path=str(output))
+        assert Review.objects.count() == 2
+        assert Comment.objects.count() == 1
+        assert Title.objects.get().genre.count() == 2
+
+    def test_incremental_jsonl(self, csv_dir, tmp_path_factory):
+        call_command('import_csv', path=str(csv_dir))
+        output = tmp_path_factory.mktemp('export')
+        call_command('export_catalog', 'review', 'comments',
+                     output=str(output), since='2019-09-25T00:00:00+00:00')
+        assert (output / 'review.jsonl').read_text() == '', (
+            'Проверьте, что --since отбрасывает более старые отзывы'
+        )
+        lines = (output / 'comments.jsonl').read_text().splitlines()
+        assert len(lines) == 1
+        assert not (output / 'titles.jsonl').exists()
@@ -0,0 +1,77 @@
+import datetime
+import json
+from decimal import Decimal
+from io import BytesIO
+
+import pytest
+from django.core.management import call_command
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+
+from api.renderers import FastJSONParser, FastJSONRenderer
+
+PAYLOAD = {
+    'name': 'Строка\u2028с разделителем',
+    'rating': Decimal('7.50'),
+    'pub_date': datetime.datetime(
+        2021, 5, 1, 12, 30, 15, 123456, tzinfo=datetime.timezone.utc
+    ),
+    'time': datetime.time(12, 30, 15, 123456),
+    'year': datetime.date(2021, 5, 1),
+    'genre': [{'slug': 'drama'}],
+    'empty': None,
+}
+
+
+class TestFastJSON:
+
+    def test_render_matches_stdlib(self):
+        content = FastJSONRenderer().render(PAYLOAD)
+        assert json.loads(content) == json.loads(
+            JSONRenderer().render(PAYLOAD)
+        ), 'Проверьте, что ответ совпадает с JSONRenderer по содержимому'
+        assert json.loads(content)['pub_date'] == '2021-05-01T12:30:15.123456Z', (
+            'Проверьте, что формат дат не зависит от рендерера'
+        )
+        assert '\u2028'.encode() not in content, (
+            'Проверьте, что разделители строк экранируются'
+        )
+        assert FastJSONRenderer().render(None) == b''
+
+    def test_indent_fallback(self):
+        content = FastJSONRenderer().render(
+            {'id': 1}, 'application/json; indent=2'
+        )
+        assert content == b'{\n  "id": 1\n}'
+
+    def test_parse(self):
+        content = JSONRenderer().render({'name': 'Драма', 'year': 2021})
+        assert FastJSONParser().parse(BytesIO(content)) == {
+            'name': 'Драма', 'year': 2021
+        }
+        with pytest.raises(ParseError):
+            FastJSONParser().parse(BytesIO(b'{"name": '))
+
+    @pytest.mark.django_db
+    def test_api_uses_fast_json(self, client, title):
+        response = client.get(f'/api/v1/titles/{title.pk}/')
+        assert response.status_code == 200
+        assert isinstance(response.accepted_renderer, FastJSONRenderer)
+        response = client.post(
+            '/api/v1/auth/signup/', '{"username": ',
+            content_type='application/json'
+        )
+        assert response.status_code == 400, (
+            'Проверьте, что некорректный JSON возвращает 400'
+        )
+
+    @pytest.mark.django_db
+    def test_benchmark_command(self, tmp_path):
+        output = tmp_path / 'json.json'
+        call_command(
+            'benchmark_json', titles=3, reviews=6, repeat=1,
+            output=str(output)
+        )
+        report = json.loads(output.read_text(encoding='utf-8'))
+        assert {'titles', 'reviews', 'backend'} <= set(report)
+        assert report['titles']['size_kb'] > 0
@@ -0,0 +1,93 @@
+import logging
+import re
+import time
+
+import pytest
+from rest_framework import serializers
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from api.metrics import registry
+
+
+@pytest.fixture
+def admin_client(client, admin):
+    token = RefreshToken.for_user(admin).access_token
+    client.defaults['HTTP_AUTHORIZATION'] = f'Bearer {token}'
+    return client
+
+
+@pytest.mark.django_db
+class TestRequestMetrics:
+
+    def setup_method(self):
+        registry.clear()
+
+    def test_server_timing_header(self, client, titles):
+        response = client.get('/api/v1/titles/')
+        timing = response['Server-Timing']
+        for metric in ('db;dur=', 'serialize;dur=', 'render;dur=', 'app;dur=',
+                       'total;dur='):
+            assert metric in timing, (
+                f'Проверьте, что заголовок Server-Timing содержит {metric}'
+            )
+        assert 'queries"' in timing
+
+    def test_serialization_is_timed(self, admin_client, titles,
+                                    monkeypatch):
+        to_representation = serializers.ModelSerializer.to_representation
+
+        def slow(self, instance):
+            time.sleep(0.005)
+            return to_representation(self, instance)
+
+        monkeypatch.setattr(
+            serializers.ModelSerializer, 'to_representation', slow
+        )
+        response = admin_client.get('/api/v1/titles/')
+        serialize = float(re.search(
+            r'serialize;dur=([\d.]+)', response['Server-Timing']
+        ).group(1))
+        assert serialize >= 5 * len(titles), (
+            'Проверьте, что время сериализации в представлении '
+            'попадает в serialize'
+        )
+        routes = admin_client.get('/api/v1/_metrics/').json()['routes']
+        assert routes['GET title-list']['serialize']['avg_ms'] >= 5
+
+    def test_metrics_are_grouped_by_route(self, admin_client, titles):
+        for _ in range(3):
+            admin_client.get('/api/v1/titles/')
+        admin_client.get(f'/api/v1/titles/{titles[0].pk}/')
+        response = admin_client.get('/api/v1/_metrics/')
+        assert response.status_code == 200
+        routes = response.json()['routes']
+        assert routes['GET title-list']['count'] == 3, (
+            'Проверьте, что метрики копятся по маршрутам'
+        )
+        assert routes['GET title-detail']['count'] == 1
+        assert routes['GET title-list']['queries_max'] >= 1
+        assert routes['GET title-list']['total']['p95_ms'] is not None
+        assert 'cache' in response.json()
+
+        assert admin_client.delete('/api/v1/_metrics/').status_code == 204
+        routes = admin_client.get('/api/v1/_metrics/').json()['routes']
+        assert 'GET title-list' not in routes
+
+    def test_metrics_are_admin_only(self, client, user):
+        assert client.get('/api/v1/_metrics/').status_code == 401
+        token = RefreshToken.for_user(user).access_token
+        response = client.get(
+            '/api/v1/_metrics/', HTTP_AUTHORIZATION=f'Bearer {token}'
+        )
+        assert response.status_code == 403, (
+            'Проверьте, что метрики доступны только администратору'
+        )
+
+    def test_slow_query_log(self, client, titles, settings, caplog):
+        settings.API_SLOW_QUERY_MS = 0.000001
+        with caplog.at_level(logging.WARNING, logger='api.sql'):
+            client.get('/api/v1/titles/')
+        assert any(
+            'reviews_title' in record.getMessage()
+            for record in caplog.records
+        ), 'Проверьте, что медленные запросы пишутся в лог'
@@ -0,0 +1,58 @@
+import pytest
+from django.conf import settings
+from django.core.cache.backends.filebased import FileBasedCache
+
+from api import cache
+from reviews.models import Genre, Review
+
+
+@pytest.mark.django_db
+class TestResponseCache:
+
+    def test_list_is_cached(self, client, titles, django_assert_num_queries):
+        assert client.get('/api/v1/titles/')['X-Cache'] == 'MISS'
+        with django_assert_num_queries(0):
+            response = client.get('/api/v1/titles/')
+        assert response['X-Cache'] == 'HIT', (
+            'Проверьте, что повторный запрос списка произведений берётся из кэша'
+        )
+        assert client.get('/api/v1/titles/?year=2001')['X-Cache'] == 'MISS'
+        assert client.get(
+            '/api/v1/titles/?category=movie&genre=drama'
+        )['X-Cache'] == 'MISS'
+        assert client.get(
+            '/api/v1/titles/?genre=drama&category=movie'
+        )['X-Cache'] == 'HIT', (
+            'Проверьте, что порядок параметров фильтра не влияет на ключ кэша'
+        )
+
+    def test_write_invalidates_list(self, client, titles, user):
+        client.get('/api/v1/titles/')
+        client.get('/api/v1/genres/')
+        Genre.objects.create(name='Ужасы', slug='horror')
+        assert client.get('/api/v1/genres/')['X-Cache'] == 'MISS'
+        assert client.get('/api/v1/titles/')['X-Cache'] == 'MISS'
+
+        Review.objects.create(title=titles[0], author=user, score=10)
+        response = client.get('/api/v1/titles/')
+        assert response['X-Cache'] == 'MISS', (
+            'Проверьте, что новый отзыв сбрасывает кэш списка произведений'
+        )
+        rating = {item['id']: item['rating'] for item in response.json()['results']}
+        assert rating[titles[0].id] == 10
+
+        titles[1].genre.clear()
+        assert client.get('/api/v1/titles/')['X-Cache'] == 'MISS'
+
+    def test_invalidation_is_shared_between_processes(self, client, titles,
+                                                      monkeypatch):
+        assert client.get('/api/v1/titles/')['X-Cache'] == 'MISS'
+        # Другой воркер или import_csv работают со своим объектом кэша.
+        config = settings.CACHES[settings.API_CACHE_ALIAS]
+        other = FileBasedCache(config['LOCATION'], config)
+        monkeypatch.setattr(cache, 'get_cache', lambda: other)
+        cache.invalidate('titles')
+        monkeypatch.undo()
+        assert client.get('/api/v1/titles/')['X-Cache'] == 'MISS', (
+            'Проверьте, что сброс кэша в другом процессе виден всем воркерам'
+        )
@@ -0,0 +1,53 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.mark.django_db
+class TestReviewQueries:
+
+    def test_review_list_skips_title_lookup(self, client, title, reviews):
+        url = f'/api/v1/titles/{title.id}/reviews/'
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url)
+        assert response.status_code == 200
+        assert not any(
+            'FROM "reviews_title"' in query['sql']
+            for query in context.captured_queries
+        ), 'Проверьте, что список отзывов не загружает произведение отдельно'
+
+    def test_missing_parent_returns_404(self, client, title, reviews):
+        review = reviews[0]
+        assert client.get('/api/v1/titles/1/reviews/').status_code == 404, (
+            'Проверьте, что отзывы несуществующего произведения возвращают 404'
+        )
+        assert client.get(
+            f'/api/v1/titles/1/reviews/{review.id}/comments/'
+        ).status_code == 404, (
+            'Проверьте, что комментарии к отзыву чужого произведения '
+            'возвращают 404'
+        )
+        assert client.get(
+            f'/api/v1/titles/{title.id}/reviews/{review.id}/comments/'
+        ).status_code == 200
+
+    def test_review_create_skips_title_lookup(self, title, user):
+        from rest_framework.test import APIClient
+        client = APIClient()
+        client.force_authenticate(user)
+        url = f'/api/v1/titles/{title.id}/reviews/'
+        with CaptureQueriesContext(connection) as context:
+            response = client.post(url, {'text': 'Отзыв', 'score': 7})
+        assert response.status_code == 201
+        title_queries = [
+            query for query in context.captured_queries
+            if query['sql'].startswith('SELECT')
+            and 'FROM "reviews_title"' in query['sql']
+        ]
+        assert not title_queries, (
+            'Проверьте, что при создании отзыва произведение не загружается '
+            'отдельно'
+        )
+        assert client.post(
+            '/api/v1/titles/1/reviews/', {'text': 'Отзыв', 'score': 7}
+        ).status_code == 404
@@ -0,0 +1,74 @@
+import json
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from reviews.generator import CatalogGenerator
+from reviews.models import Review
+
+
+@pytest.fixture
+def user_client(client, user):
+    token = RefreshToken.for_user(user).access_token
+    client.defaults['HTTP_AUTHORIZATION'] = f'Bearer {token}'
+    return client
+
+
+@pytest.mark.django_db
+class TestReviewWrites:
+
+    def post(self, client, title):
+        with CaptureQueriesContext(connection) as context:
+            response = client.post(
+                f'/api/v1/titles/{title.pk}/reviews/',
+                {'text': 'Отзыв', 'score': 8},
+                content_type='application/json'
+            )
+        return response, [query['sql'] for query in context.captured_queries]
+
+    def test_single_insert(self, user_client, title):
+        response, queries = self.post(user_client, title)
+        assert response.status_code == 201
+        assert not any(
+            sql.startswith('SELECT') and 'FROM "reviews_review"' in sql
+            for sql in queries
+        ), 'Проверьте, что перед вставкой отзыва нет проверочного запроса'
+        title.refresh_from_db()
+        assert (title.reviews_count, title.rating) == (1, 8)
+
+    def test_duplicate_returns_400(self, user_client, title, user):
+        Review.objects.create(title=title, author=user, text='Был', score=3)
+        response, _ = self.post(user_client, title)
+        assert response.status_code == 400, (
+            'Проверьте, что повторный отзыв возвращает 400'
+        )
+        assert response.json() == {'non_field_errors': [
+            'Вы уже оставили свой отзыв к данному произведению'
+        ]}
+        title.refresh_from_db()
+        assert title.reviews_count == 1, (
+            'Проверьте, что отклонённый отзыв не меняет рейтинг'
+        )
+
+
+@pytest.mark.django_db(transaction=True)
+class TestReviewWritesBenchmark:
+
+    def test_report(self, tmp_path):
+        CatalogGenerator(seed=1).generate(
+            users=5, titles=5, reviews=0, comments=0
+        )
+        output = tmp_path / 'reviews.json'
+        call_command(
+            'benchmark_reviews', existing=True, reviews=6, concurrency=1,
+            output=str(output), stdout=StringIO()
+        )
+        report = json.loads(output.read_text(encoding='utf-8'))
+        assert (report['created'], report['rejected'], report['errors']) == (
+            6, 6, 0
+        ), 'Проверьте, что повторные отзывы отклоняются без ошибок сервера'
+        assert Review.objects.count() == 6
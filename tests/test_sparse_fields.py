@@ -0,0 +1,76 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Review
+
+
+@pytest.mark.django_db
+class TestSparseFields:
+
+    def get(self, client, url):
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url)
+        return response, [query['sql'] for query in context.captured_queries]
+
+    def test_title_fields(self, client, titles):
+        response, queries = self.get(client, '/api/v1/titles/?fields=id,name')
+        assert response.status_code == 200
+        results = response.json()['results']
+        assert all(set(title) == {'id', 'name'} for title in results), (
+            'Проверьте, что ?fields= оставляет только запрошенные поля'
+        )
+        assert not any('reviews_genre' in sql for sql in queries), (
+            'Проверьте, что жанры не подгружаются, если их не запросили'
+        )
+        assert not any('reviews_category' in sql for sql in queries)
+        assert not any('"description"' in sql for sql in queries), (
+            'Проверьте, что ненужные колонки не выбираются из базы'
+        )
+
+    def test_nested_fields_are_not_pruned(self, client, titles, genre):
+        response = client.get(f'/api/v1/titles/{titles[0].pk}/?fields=genre')
+        assert response.status_code == 200
+        genres = response.json()['genre']
+        assert {'name', 'slug'} <= set(genres[0])
+
+    def test_default_response_is_unchanged(self, client, titles):
+        title = client.get('/api/v1/titles/').json()['results'][0]
+        assert set(title) == {
+            'id', 'name', 'year', 'description', 'genre', 'category', 'rating'
+        }
+
+    def test_unknown_fields(self, client, title):
+        response = client.get('/api/v1/titles/?fields=id,secret')
+        assert response.status_code == 400
+        assert 'fields' in response.json()
+        response = client.get('/api/v1/titles/?expand=category')
+        assert response.status_code == 400
+
+    def test_expand_author(self, client, title, reviews):
+        url = f'/api/v1/titles/{title.pk}/reviews/'
+        response, queries = self.get(client, f'{url}?expand=author')
+        assert response.status_code == 200
+        results = response.json()['results']
+        assert results[0]['author'] == {
+            'username': reviews[0].author.username,
+            'first_name': '', 'last_name': '', 'bio': '',
+        }, 'Проверьте, что ?expand=author разворачивает автора'
+        assert not any(
+            sql.startswith('SELECT') and 'FROM "users_customuser"' in sql
+            for sql in queries
+        ), 'Проверьте, что авторы загружаются одним запросом с отзывами'
+        response = client.get(f'{url}?fields=id,score&pagination=cursor')
+        assert set(response.json()['results'][0]) == {'id', 'score'}
+        assert response.json()['next'] is not None
+
+    def test_sparse_top(self, client, titles, user):
+        for title in titles:
+            Review.objects.create(title=title, author=user, score=5)
+        response, queries = self.get(
+            client, '/api/v1/titles/top/?fields=id,name'
+        )
+        assert len(queries) == 1, (
+            'Проверьте, что страница рейтинга с ?fields= — один запрос'
+        )
+        assert len(response.json()['results']) == len(titles)
@@ -0,0 +1,71 @@
+import sqlite3
+
+import pytest
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from api import throttling
+
+
+@pytest.fixture
+def rates(settings, tmp_path):
+    settings.API_THROTTLE_DB = str(tmp_path / 'throttle.sqlite3')
+
+    def set_rates(**rates):
+        settings.REST_FRAMEWORK = {
+            **settings.REST_FRAMEWORK,
+            'DEFAULT_THROTTLE_RATES': {'anon': None, 'user': None, **rates},
+        }
+    return set_rates
+
+
+def statuses(client, url, count, **kwargs):
+    return [client.get(url, **kwargs).status_code for _ in range(count)]
+
+
+@pytest.mark.django_db
+class TestThrottling:
+
+    def test_anon(self, client, rates, title):
+        rates(anon='3/min')
+        assert statuses(client, '/api/v1/titles/', 4) == [200] * 3 + [429]
+        response = client.get('/api/v1/genres/')
+        assert response.status_code == 429
+        assert 0 < int(response['Retry-After']) <= 20, (
+            'Проверьте, что Retry-After — время до следующего запроса'
+        )
+
+    def test_user_and_scope(self, client, rates, user, title):
+        rates(anon='1/min', user='4/min', reviews='2/min')
+        token = RefreshToken.for_user(user).access_token
+        auth = {'HTTP_AUTHORIZATION': f'Bearer {token}'}
+        url = f'/api/v1/titles/{title.pk}/reviews/'
+        assert statuses(client, url, 3, **auth) == [200, 200, 429], (
+            'Проверьте квоту на маршрут'
+        )
+        assert statuses(client, '/api/v1/titles/', 2, **auth) == [200, 429]
+        assert statuses(client, '/api/v1/titles/', 2) == [200, 429], (
+            'Проверьте, что квоты анонимов и пользователей раздельны'
+        )
+
+    def test_unthrottled_by_default(self, client, title):
+        assert statuses(client, '/api/v1/titles/', 10) == [200] * 10
+
+    def test_shared_between_workers(self, settings, tmp_path, monkeypatch):
+        path = str(tmp_path / 'shared.sqlite3')
+        first, second = throttling.GCRAStore(path), throttling.GCRAStore(path)
+        now = 1000.0
+        monkeypatch.setattr(throttling.time, 'time', lambda: now)
+        assert first.acquire('key', 10, 20) == 0
+        assert second.acquire('key', 10, 20) == 0
+        assert second.acquire('key', 10, 20) == 10, (
+            'Проверьте, что воркеры делят одно состояние ограничителя'
+        )
+        assert first.acquire('key', 10, 20) == 10
+        now += 10
+        assert first.acquire('key', 10, 20) == 0, (
+            'Проверьте, что квота восстанавливается со временем'
+        )
+        with sqlite3.connect(path) as connection:
+            assert connection.execute(
+                'SELECT COUNT(*) FROM throttle'
+            ).fetchone() == (1,), 'Проверьте, что на ключ хранится одна запись'
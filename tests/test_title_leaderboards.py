@@ -0,0 +1,119 @@
+import pytest
+from django.utils import timezone
+
+from api.pagination import TopCursorPagination
+from reviews.models import Comment, Review, Title, TitleActivity
+
+
+@pytest.mark.django_db
+class TestTitleLeaderboards:
+
+    def get_ids(self, client, url):
+        response = client.get(url)
+        assert response.status_code == 200, (
+            f'Проверьте, что {url} доступен без авторизации'
+        )
+        return [title['id'] for title in response.json()['results']]
+
+    def review(self, title, author, score, **kwargs):
+        return Review.objects.create(
+            title=title, author=author, text='Отзыв', score=score, **kwargs
+        )
+
+    def test_weighted_rating(self, titles, user, another_user, settings):
+        settings.LEADERBOARD_MIN_REVIEWS = 2
+        settings.LEADERBOARD_PRIOR_SCORE = 5
+        review = self.review(titles[0], user, 10)
+        self.review(titles[0], another_user, 6)
+        titles[0].refresh_from_db()
+        assert titles[0].weighted_rating == pytest.approx((16 + 10) / 4), (
+            'Проверьте, что взвешенный рейтинг сглаживается к априорной оценке'
+        )
+        review.delete()
+        Review.objects.all().delete()
+        titles[0].refresh_from_db()
+        assert titles[0].weighted_rating is None
+
+    def test_top_prefers_many_votes(self, client, titles, user, another_user,
+                                    admin):
+        # Одна «десятка» весит меньше трёх девяток.
+        self.review(titles[0], user, 10)
+        for author in (user, another_user, admin):
+            self.review(titles[1], author, 9)
+        self.review(titles[2], user, 3)
+        ids = self.get_ids(client, '/api/v1/titles/top/')
+        assert ids == [titles[1].pk, titles[0].pk, titles[2].pk], (
+            'Проверьте порядок титулов в рейтинге лучших'
+        )
+        for url in ('/api/v1/titles/top/', '/api/v1/titles/trending/'):
+            result = client.get(url).json()['results'][0]
+            assert {'weighted_rating', 'trending'} <= set(result), (
+                f'Проверьте, что {url} отдаёт weighted_rating и trending'
+            )
+        titles[1].refresh_from_db()
+        top = client.get('/api/v1/titles/top/').json()['results'][0]
+        assert top['weighted_rating'] == pytest.approx(
+            titles[1].weighted_rating
+        )
+
+    def test_top_pagination(self, client, titles, user, monkeypatch):
+        monkeypatch.setattr(TopCursorPagination, 'page_size', 2)
+        for title in titles:
+            self.review(title, user, 5)
+        ids = []
+        url = '/api/v1/titles/top/'
+        while url:
+            data = client.get(url).json()
+            assert 'count' not in data, (
+                'Проверьте, что рейтинг отдаётся курсорными страницами без COUNT'
+            )
+            ids += [title['id'] for title in data['results']]
+            url = data['next']
+        assert sorted(ids) == sorted(title.pk for title in titles), (
+            'Проверьте, что курсор рейтинга не теряет и не повторяет записи'
+        )
+        assert len(set(ids)) == len(ids)
+        response = client.get('/api/v1/titles/top/?cursor=broken')
+        assert response.status_code == 404
+
+    def test_top_filters(self, client, titles, category, user):
+        Title.objects.filter(pk=titles[0].pk).update(category=None)
+        for title in titles:
+            self.review(title, user, 7)
+        ids = self.get_ids(
+            client, f'/api/v1/titles/top/?category={category.slug}'
+        )
+        assert titles[0].pk not in ids
+        titles[1].genre.clear()
+        ids = self.get_ids(client, '/api/v1/titles/top/?genre=comedy')
+        assert titles[1].pk not in ids and titles[2].pk in ids
+
+    def test_trending(self, client, titles, user, another_user):
+        review = self.review(titles[0], user, 5)
+        self.review(titles[1], user, 5)
+        self.review(titles[1], another_user, 5)
+        url = '/api/v1/titles/trending/'
+        etag = client.get(url)['ETag']
+        comment = Comment.objects.create(
+            review=review, author=another_user, text='Комментарий'
+        )
+        assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200, (
+            'Проверьте, что комментарий сбрасывает ETag trending'
+        )
+        assert self.get_ids(client, url) == [titles[1].pk, titles[0].pk], (
+            'Проверьте, что trending считает отзывы и комментарии'
+        )
+        comment.delete()
+        review.delete()
+        assert self.get_ids(client, url) == [titles[1].pk]
+
+    def test_trending_refresh(self, client, titles, user):
+        self.review(titles[0], user, 5)
+        old = self.review(titles[1], user, 5)
+        TitleActivity.objects.filter(title=titles[1]).update(
+            date=timezone.localdate() - timezone.timedelta(days=30)
+        )
+        Title.objects.filter(pk=old.title_id).update(trending=5)
+        assert self.get_ids(client, '/api/v1/titles/trending/') == [
+            titles[0].pk
+        ], 'Проверьте, что trending пересчитывается при первом запросе за день'
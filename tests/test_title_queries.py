@@ -0,0 +1,30 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.mark.django_db
+class TestTitleQueries:
+
+    def get_query_count(self, client, url):
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url)
+        assert response.status_code == 200, (
+            f'Проверьте, что GET-запрос к `{url}` возвращает статус 200'
+        )
+        return len(context.captured_queries)
+
+    def test_title_list_query_count(self, client, titles):
+        single = self.get_query_count(client, '/api/v1/titles/?year=2001')
+        full_page = self.get_query_count(client, '/api/v1/titles/')
+        assert single == full_page <= 3, (
+            'Проверьте, что список произведений загружает категории и жанры '
+            'фиксированным числом запросов независимо от размера страницы'
+        )
+
+    def test_title_detail_query_count(self, client, titles):
+        count = self.get_query_count(client, f'/api/v1/titles/{titles[0].id}/')
+        assert count <= 2, (
+            'Проверьте, что произведение загружается вместе с категорией '
+            'и жанрами фиксированным числом запросов'
+        )
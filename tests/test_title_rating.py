@@ -0,0 +1,123 @@
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Comment, Review, Title, TitleScore
+
+
+@pytest.mark.django_db
+class TestTitleRating:
+
+    def test_rating_follows_review_writes(self, title, user, another_user):
+        review = Review.objects.create(title=title, author=user, score=4)
+        Review.objects.create(title=title, author=another_user, score=9)
+        title.refresh_from_db()
+        assert (title.reviews_count, title.score_sum) == (2, 13), (
+            'Проверьте, что при создании отзыва обновляются агрегаты произведения'
+        )
+        assert title.rating == 6.5
+
+        review.score = 10
+        review.save()
+        title.refresh_from_db()
+        assert (title.reviews_count, title.score_sum, title.rating) == (2, 19, 9.5), (
+            'Проверьте, что при изменении оценки обновляется рейтинг произведения'
+        )
+
+        Review.objects.get(pk=review.pk).delete()
+        title.refresh_from_db()
+        assert (title.reviews_count, title.score_sum, title.rating) == (1, 9, 9.0)
+
+        Review.objects.all().delete()
+        title.refresh_from_db()
+        assert (title.reviews_count, title.score_sum, title.rating) == (0, 0, None), (
+            'Проверьте, что рейтинг произведения без отзывов пустой'
+        )
+
+    def test_rebuild_aggregates(self, title, user):
+        Review.objects.create(title=title, author=user, score=7)
+        Title.objects.update(reviews_count=0, score_sum=0, rating=None)
+        call_command('rebuild_aggregates', stdout=None)
+        title.refresh_from_db()
+        assert (title.reviews_count, title.score_sum, title.rating) == (1, 7, 7.0), (
+            'Проверьте, что команда rebuild_aggregates пересчитывает рейтинг'
+        )
+
+    def test_rebuild_aggregates_resets_cache(self, client, title, user):
+        Review.objects.create(title=title, author=user, score=7)
+        urls = ('/api/v1/titles/', f'/api/v1/titles/{title.pk}/stats/')
+        etags = [client.get(url)['ETag'] for url in urls]
+        Title.objects.update(reviews_count=0, score_sum=0, rating=None)
+        call_command('rebuild_aggregates', stdout=None)
+        for url, etag in zip(urls, etags):
+            assert client.get(
+                url, HTTP_IF_NONE_MATCH=etag
+            ).status_code == 200, (
+                'Проверьте, что rebuild_aggregates сбрасывает кэш ответов'
+            )
+
+    def create_thread(self, django_user_model, title, count, prefix):
+        authors = [
+            django_user_model.objects.create_user(
+                username=f'{prefix}{index}', email=f'{prefix}{index}@yamdb.fake'
+            )
+            for index in range(count)
+        ]
+        for author in authors:
+            review = Review.objects.create(title=title, author=author, score=5)
+            Comment.objects.create(review=review, author=author, text='Текст')
+        return authors
+
+    def test_title_cascade_delete_is_bulk(self, django_user_model, titles):
+        queries = []
+        for title, count in zip(titles, (2, 10)):
+            self.create_thread(django_user_model, title, count, f'u{count}_')
+            with CaptureQueriesContext(connection) as context:
+                title.delete()
+            queries.append(len(context))
+        assert queries[0] == queries[1], (
+            'Проверьте, что число запросов при удалении произведения '
+            'не зависит от числа отзывов и комментариев'
+        )
+        assert not TitleScore.objects.exists()
+
+    def test_author_cascade_delete_is_bulk(self, django_user_model, titles,
+                                           another_user):
+        queries = []
+        for count in (1, 4):
+            author = django_user_model.objects.create_user(
+                username=f'author{count}', email=f'author{count}@yamdb.fake'
+            )
+            for title in titles[:count]:
+                review = Review.objects.create(
+                    title=title, author=author, score=9
+                )
+                Comment.objects.create(
+                    review=review, author=another_user, text='Текст'
+                )
+            with CaptureQueriesContext(connection) as context:
+                author.delete()
+            queries.append(len(context))
+        assert queries[0] == queries[1], (
+            'Проверьте, что число запросов при удалении автора '
+            'не зависит от числа его отзывов'
+        )
+
+    def test_author_cascade_delete_updates_titles(self, client, user,
+                                                  another_user, title):
+        Review.objects.create(title=title, author=user, score=2)
+        review = Review.objects.create(title=title, author=another_user,
+                                       score=8)
+        Comment.objects.create(review=review, author=user, text='Текст')
+        url = f'/api/v1/titles/{title.pk}/stats/'
+        etag = client.get(url)['ETag']
+        user.delete()
+        title.refresh_from_db()
+        assert (title.reviews_count, title.score_sum, title.rating) == (
+            1, 8, 8.0
+        ), 'Проверьте, что удаление автора пересчитывает рейтинг'
+        stats = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert stats.status_code == 200
+        assert stats.json()['scores']['2'] == 0
+        assert stats.json()['comments_count'] == 0
@@ -0,0 +1,49 @@
+import pytest
+
+from reviews.models import Title
+
+
+@pytest.fixture
+def catalog(category):
+    return [
+        Title.objects.create(
+            id=1000 + number, name=name, year=2000, description=description
+        )
+        for number, (name, description) in enumerate((
+            ('Побег из Шоушенка', 'Тюремная драма о надежде'),
+            ('Зелёная миля', 'Тюремный надзиратель и чудо'),
+            ('Крёстный отец', 'Семейная сага о мафии'),
+        ))
+    ]
+
+
+@pytest.mark.django_db
+class TestTitleSearch:
+
+    def get_names(self, client, query):
+        response = client.get(f'/api/v1/titles/?{query}')
+        assert response.status_code == 200
+        return [item['name'] for item in response.json()['results']]
+
+    def test_search_is_ranked(self, client, catalog):
+        assert self.get_names(client, 'search=шоушенк') == [
+            'Побег из Шоушенка'
+        ]
+        assert self.get_names(client, 'search=тюремная') == [
+            'Побег из Шоушенка', 'Зелёная миля'
+        ], 'Проверьте, что результаты поиска отсортированы по релевантности'
+        assert self.get_names(client, 'search=крестный') == [
+            'Крёстный отец'
+        ], 'Проверьте, что поиск не различает «е» и «ё»'
+
+    def test_name_filter_keeps_substring_semantics(self, client, catalog):
+        assert self.get_names(client, 'name=миля') == ['Зелёная миля']
+        assert self.get_names(client, 'name=из Ш') == ['Побег из Шоушенка']
+        assert self.get_names(client, 'name=ля мил') == []
+
+    def test_index_follows_title_updates(self, client, catalog):
+        title = catalog[0]
+        title.name = 'Мгла'
+        title.save()
+        assert self.get_names(client, 'search=шоушенк') == []
+        assert self.get_names(client, 'search=мгла') == ['Мгла']
@@ -0,0 +1,105 @@
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from reviews.models import Comment, Review, TitleActivity, TitleScore
+
+
+@pytest.mark.django_db
+class TestTitleStats:
+
+    def get_stats(self, client, title, query=''):
+        response = client.get(f'/api/v1/titles/{title.pk}/stats/{query}')
+        assert response.status_code == 200, (
+            'Проверьте, что статистика произведения доступна без авторизации'
+        )
+        return response.json()
+
+    def test_stats(self, client, title, reviews):
+        Comment.objects.create(
+            review=reviews[0], author=reviews[1].author, text='Комментарий'
+        )
+        stats = self.get_stats(client, title)
+        assert stats['reviews_count'] == 7
+        assert stats['rating'] == pytest.approx(
+            sum(review.score for review in reviews) / 7
+        )
+        assert stats['comments_count'] == 1
+        assert stats['scores'] == {
+            str(score): int(score <= 7) for score in range(1, 11)
+        }, 'Проверьте гистограмму оценок произведения'
+        today = str(timezone.localdate())
+        assert stats['activity'] == [
+            {'date': today, 'reviews': 7, 'comments': 1}
+        ], 'Проверьте, что активность группируется по дням'
+
+    def test_stats_follow_writes(self, client, title, reviews):
+        review = Review.objects.get(pk=reviews[0].pk)
+        review.score = 10
+        review.save()
+        Review.objects.get(pk=reviews[1].pk).delete()
+        comment = Comment.objects.create(
+            review=review, author=reviews[2].author, text='Комментарий'
+        )
+        assert comment.title_id == title.pk, (
+            'Проверьте, что комментарий наследует произведение отзыва'
+        )
+        comment.delete()
+        stats = self.get_stats(client, title)
+        assert stats['scores']['1'] == 0
+        assert stats['scores']['2'] == 0
+        assert stats['scores']['10'] == 1, (
+            'Проверьте, что гистограмма обновляется при изменении оценки'
+        )
+        assert stats['activity'][0]['reviews'] == 6
+        assert stats['comments_count'] == 0
+
+    def test_stats_do_not_scan_reviews(self, client, title, reviews,
+                                       django_assert_max_num_queries):
+        with django_assert_max_num_queries(4) as context:
+            self.get_stats(client, title)
+        assert not any(
+            '"review"' in query['sql'] for query in context.captured_queries
+        ), 'Проверьте, что статистика не читает таблицу отзывов'
+
+    def test_stats_by_month(self, client, title, reviews):
+        Review.objects.filter(pk=reviews[0].pk).update(
+            pub_date=timezone.now() - timezone.timedelta(days=400)
+        )
+        call_command('rebuild_aggregates', stdout=None)
+        stats = self.get_stats(client, title, '?period=month')
+        assert [row['reviews'] for row in stats['activity']] == [1, 6]
+        assert all(row['date'].endswith('-01') for row in stats['activity'])
+        since = timezone.localdate() - timezone.timedelta(days=30)
+        stats = self.get_stats(client, title, f'?since={since}')
+        assert [row['reviews'] for row in stats['activity']] == [6], (
+            'Проверьте фильтр since'
+        )
+        response = client.get(f'/api/v1/titles/{title.pk}/stats/?period=year')
+        assert response.status_code == 400
+
+    def test_rebuild_stats(self, title, reviews):
+        TitleScore.objects.all().delete()
+        TitleActivity.objects.all().delete()
+        call_command('rebuild_aggregates', stdout=None)
+        assert sum(
+            TitleScore.objects.values_list('count', flat=True)
+        ) == 7, 'Проверьте, что rebuild_aggregates пересчитывает статистику'
+        assert TitleActivity.objects.get().reviews == 7
+
+    def test_stats_etag(self, client, title, reviews):
+        url = f'/api/v1/titles/{title.pk}/stats/'
+        etag = client.get(url)['ETag']
+        assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+        Comment.objects.create(
+            review=reviews[0], author=reviews[1].author, text='Комментарий'
+        )
+        assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200, (
+            'Проверьте, что новый комментарий сбрасывает ETag статистики'
+        )
+
+    def test_stats_not_found(self, client):
+        assert client.get('/api/v1/titles/404/stats/').status_code == 404
+        assert client.get('/api/v1/titles/abc/stats/').status_code == 404, (
+            'Проверьте, что нечисловой id произведения даёт 404'
+        )